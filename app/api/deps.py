@@ -1,10 +1,16 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
+from contextlib import asynccontextmanager
+import time
 from fastapi import Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.core.email import EmailService
-from app.db.session import SessionLocal
+from app.db.metrics import session_metrics
+from app.db.session import AsyncSessionLocal, SessionLocal, session_router
 from app.models.user import User
 from app.core.auth import decode_token
+from app.core.principal_cache import principal_cache
+from app.services.storage import StorageBackend, get_storage_backend
 
 def get_db() -> Generator[Session, None, None]:
     """Get database session."""
@@ -14,19 +20,90 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+@asynccontextmanager
+async def _timed_session(db: AsyncSession) -> AsyncGenerator[AsyncSession, None]:
+    """Close a session on exit, recording how long it stayed open."""
+    started = time.perf_counter()
+    session_metrics.session_opened()
+    try:
+        async with db:
+            yield db
+    finally:
+        session_metrics.session_closed(time.perf_counter() - started)
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session on the primary."""
+    async with _timed_session(AsyncSessionLocal()) as db:
+        yield db
+
 def get_current_user(
     db: Session = Depends(get_db),
     token: str = Depends(decode_token)
 ) -> User:
-    """Get current authenticated user."""
+    """Get current authenticated user.
+
+    Users are served from the principal cache when possible, so the hot
+    path does not touch the database.
+    """
+    token_id = getattr(token, "jti", None) or ""
+    user = principal_cache.get(User, token.user_id, token_id)
+    if user is not None:
+        return user
+
     user = db.query(User).filter(User.id == token.user_id).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
+    principal_cache.set(token.user_id, token_id, user)
     return user
 
+def get_current_superuser(
+    current_user: User = Depends(get_current_user)
+) -> User:
+    """Get current authenticated user, requiring a superuser or admin."""
+    if not (getattr(current_user, "is_superuser", False) or getattr(current_user, "role", None) == "admin"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough privileges"
+        )
+    return current_user
+
+# Updating or deleting a user (e.g. disabling them) drops their cached principals
+principal_cache.invalidate_on_change(User)
+
+async def get_write_db(
+    current_user: User = Depends(get_current_user)
+) -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session on the primary for a user's writes.
+
+    Committed writes send the user's reads to the primary for a short
+    window, so they see their own changes.
+    """
+    async with _timed_session(session_router.write_session(current_user.id)) as db:
+        yield db
+
+async def get_read_db(
+    current_user: User = Depends(get_current_user)
+) -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session for read-only queries, on a replica when one is available."""
+    async with _timed_session(await session_router.read_session(current_user.id)) as db:
+        yield db
+
+async def get_anonymous_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session for read-only queries made without a user.
+
+    With no user there are no own writes to follow, so reads always go to a
+    replica when one is available and may trail the primary by replica lag.
+    """
+    async with _timed_session(await session_router.read_session()) as db:
+        yield db
+
 def get_email_service() -> EmailService:
     """Get email service instance."""
-    return EmailService()
\ No newline at end of file
+    return EmailService()
+
+def get_storage() -> StorageBackend:
+    """Get document storage backend."""
+    return get_storage_backend()
@@ -0,0 +1,86 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api import deps
+from app.models.user import User
+from app.services.case_access import user_can_access_case
+from app.schemas.award import (
+    SectionVersionContentResponse,
+    SectionVersionDiffResponse,
+    SectionVersionResponse
+)
+from models.award import Award, AwardSection
+from services.award_versioning import SectionVersionStore
+
+router = APIRouter()
+
+async def _check_section_access(db: AsyncSession, user: User, section_id: int) -> None:
+    """Raise 404 unless the section exists and the user takes part in its case.
+
+    Sections the user may not read are reported as not found, so their
+    existence is not revealed.
+    """
+    case_id = await db.scalar(
+        select(Award.case_id)
+        .join(AwardSection, AwardSection.award_id == Award.id)
+        .where(AwardSection.id == section_id)
+    )
+    if case_id is None or not await user_can_access_case(db, user, case_id):
+        raise HTTPException(
+            status_code=404,
+            detail=f"Award section {section_id} not found"
+        )
+
+@router.get("/award-sections/{section_id}/versions", response_model=List[SectionVersionResponse])
+async def list_section_versions(
+    section_id: int,
+    current_user: User = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_async_db)
+):
+    """List the version history of an award section."""
+    await _check_section_access(db, current_user, section_id)
+    store = SectionVersionStore(db)
+    return await store.list_versions(section_id)
+
+@router.get("/award-sections/{section_id}/versions/{version}", response_model=SectionVersionContentResponse)
+async def get_section_version(
+    section_id: int,
+    version: int,
+    current_user: User = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_async_db)
+):
+    """Reconstruct the content of an award section at a given version."""
+    await _check_section_access(db, current_user, section_id)
+    store = SectionVersionStore(db)
+
+    try:
+        content = await store.get_version_content(section_id, version)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return {"section_id": section_id, "version": version, "content": content}
+
+@router.get("/award-sections/{section_id}/diff", response_model=SectionVersionDiffResponse)
+async def diff_section_versions(
+    section_id: int,
+    from_version: int,
+    to_version: int,
+    current_user: User = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_async_db)
+):
+    """Get a unified diff between two versions of an award section."""
+    await _check_section_access(db, current_user, section_id)
+    store = SectionVersionStore(db)
+
+    try:
+        diff = await store.diff_versions(section_id, from_version, to_version)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return {
+        "section_id": section_id,
+        "from_version": from_version,
+        "to_version": to_version,
+        "diff": diff
+    }
@@ -1,11 +1,26 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlalchemy.orm import Session
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
 from app.models.user import User
-from app.schemas.document import DocumentRequest, DocumentResponse
-from app.services.document_request import DocumentRequestService
-from app.services.document_processor import DocumentProcessor
+from app.schemas.document import (
+    BulkDocumentRequest,
+    BulkDocumentRequestResponse,
+    DocumentRequest,
+    DocumentResponse,
+    PendingDocumentRequestPage
+)
+from app.services.document_request import (
+    DocumentAlreadySubmittedError,
+    DocumentRequestNotFoundError,
+    DocumentRequestService
+)
+from app.services.document_processor import (
+    DocumentProcessor,
+    FileTooLargeError,
+    UnsupportedFileTypeError
+)
+from app.services.multipart_upload import MultipartUpload, MultipartUploadError
 from app.core.email import EmailService
 
 router = APIRouter()
@@ -15,7 +30,7 @@ async def create_document_request(
     case_id: int,
     request: DocumentRequest,
     current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_write_db),
     email_service: EmailService = Depends(deps.get_email_service)
 ):
     """Create a new document request for a case."""
@@ -33,34 +48,92 @@ async def create_document_request(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/cases/{case_id}/document-requests", response_model=List[DocumentResponse])
+@router.post(
+    "/cases/{case_id}/document-requests/bulk",
+    response_model=BulkDocumentRequestResponse
+)
+async def create_document_requests(
+    case_id: int,
+    request: BulkDocumentRequest,
+    current_user: User = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_write_db),
+    email_service: EmailService = Depends(deps.get_email_service)
+):
+    """Create several document requests for a case, e.g. from a Redfern schedule."""
+    service = DocumentRequestService(db, email_service)
+    
+    try:
+        request_ids = await service.create_document_requests(
+            case_id=case_id,
+            requester_id=current_user.id,
+            descriptions=[item.description for item in request.requests]
+        )
+        return {
+            "request_ids": request_ids,
+            "message": f"{len(request_ids)} document requests created successfully"
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/cases/{case_id}/document-requests", response_model=PendingDocumentRequestPage)
 async def get_pending_requests(
     case_id: int,
+    cursor: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=500),
     current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     email_service: EmailService = Depends(deps.get_email_service)
 ):
-    """Get all pending document requests for a case."""
+    """Get a page of pending document requests for a case.
+
+    Pass the returned ``next_cursor`` as ``cursor`` to fetch the next page.
+    """
     service = DocumentRequestService(db, email_service)
-    return await service.get_pending_requests(case_id)
+    items, next_cursor = await service.get_pending_requests(case_id, cursor=cursor, limit=limit)
+    return {"items": items, "next_cursor": next_cursor}
+
+# The body is parsed by MultipartUpload rather than declared as an UploadFile
+# parameter, so describe it for the OpenAPI schema by hand
+SUBMIT_DOCUMENT_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"]
+                }
+            }
+        }
+    }
+}
 
-@router.post("/document-requests/{request_id}/submit")
+@router.post("/document-requests/{request_id}/submit", openapi_extra=SUBMIT_DOCUMENT_BODY)
 async def submit_document(
     request_id: str,
-    file: UploadFile = File(...),
+    request: Request,
     current_user: User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_write_db),
     email_service: EmailService = Depends(deps.get_email_service)
 ):
-    """Submit a document in response to a document request."""
+    """Submit a document in response to a document request.
+
+    The multipart body is read from the client only as it is processed, so
+    an upload that is too large or of the wrong type is stopped
+    mid-transfer, even without a truthful Content-Length header.
+
+    Submissions are idempotent: if the request was already fulfilled, the
+    upload is only hashed, never stored, and a retry of the recorded file
+    gets the recorded result. A different file is rejected with a conflict.
+    """
     doc_processor = DocumentProcessor()
     request_service = DocumentRequestService(db, email_service)
     
     try:
-        # First find the document request to get the case_id
-        existing_request = db.query(Document).filter(
-            Document.request_id == request_id
-        ).first()
+        existing_request = await request_service.get_request(request_id)
         
         if not existing_request:
             raise HTTPException(
@@ -68,16 +141,46 @@ async def submit_document(
                 detail=f"Document request {request_id} not found"
             )
         
-        # Process the uploaded document
+        file = await MultipartUpload.open(
+            request.headers.get("content-type", ""),
+            request.stream()
+        )
+        
+        if existing_request.storage_path:
+            file_hash = await doc_processor.hash_upload(file)
+            request_service.check_resubmission(existing_request, file_hash)
+            return {
+                "message": "Document submitted successfully",
+                "request_id": request_id,
+                "hash": file_hash
+            }
+        
+        # Stream, hash and store the upload with no lock or transaction held
         document = await doc_processor.process_document(
             file,
             existing_request.case_id,
             current_user.id
         )
         
-        # Update the document request
-        await request_service.process_document_submission(request_id, document)
+        # Lock the request only to record the submission
+        await request_service.record_submission(request_id, document)
         
-        return {"message": "Document submitted successfully"}
+        return {
+            "message": "Document submitted successfully",
+            "request_id": request_id,
+            "hash": document.metadata['hash']
+        }
+    except HTTPException:
+        raise
+    except DocumentAlreadySubmittedError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except DocumentRequestNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except MultipartUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UnsupportedFileTypeError as e:
+        raise HTTPException(status_code=415, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
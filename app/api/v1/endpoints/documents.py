@@ -0,0 +1,80 @@
+from urllib.parse import quote
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api import deps
+from app.models.document import Document
+from app.models.user import User
+from app.services.case_access import user_can_access_case
+from app.services.storage import RangeNotSatisfiableError, StorageBackend, parse_byte_range
+
+router = APIRouter()
+
+@router.get("/documents/{document_id}/download")
+async def download_document(
+    document_id: int,
+    request: Request,
+    current_user: User = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_async_db),
+    storage: StorageBackend = Depends(deps.get_storage)
+):
+    """Download a stored document.
+
+    Object storage serves the file directly through a presigned URL, which
+    honours range requests itself. Local storage streams the file from disk
+    and answers a single byte range with 206 Partial Content.
+    Documents of cases the caller does not take part in are reported as not
+    found, so their existence is not revealed.
+    """
+    document = await db.get(Document, document_id)
+    if (
+        not document
+        or not document.storage_path
+        or not await user_can_access_case(db, current_user, document.case_id)
+    ):
+        raise HTTPException(
+            status_code=404,
+            detail=f"Document {document_id} not found"
+        )
+
+    url = await storage.presigned_url(document.storage_path, filename=document.filename)
+    if url:
+        return RedirectResponse(url, status_code=307)
+
+    size = (await storage.stat(document.storage_path)).size
+    try:
+        byte_range = parse_byte_range(request.headers.get("range"), size)
+    except RangeNotSatisfiableError as e:
+        raise HTTPException(
+            status_code=416,
+            detail=str(e),
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+
+    if byte_range is None:
+        return FileResponse(
+            storage.local_path(document.storage_path),
+            media_type=document.file_type,
+            filename=document.filename,
+            headers={"Accept-Ranges": "bytes"}
+        )
+
+    start, end = byte_range
+    return StreamingResponse(
+        storage.read_range(document.storage_path, start, end),
+        status_code=206,
+        media_type=document.file_type,
+        headers={
+            "Accept-Ranges": "bytes",
+            "Content-Range": f"bytes {start}-{end - 1}/{size}",
+            "Content-Length": str(end - start),
+            "Content-Disposition": _content_disposition(document.filename)
+        }
+    )
+
+def _content_disposition(filename: str) -> str:
+    """Build an attachment Content-Disposition header, as FileResponse does."""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+from app.api import deps
+from app.db.metrics import session_metrics
+from app.db.session import async_engine
+from app.models.user import User
+
+router = APIRouter()
+
+@router.get("/metrics/db-sessions")
+async def get_db_session_metrics(
+    current_user: User = Depends(deps.get_current_user)
+):
+    """Get request-scoped database session lifetimes and connection pool usage."""
+    pool = async_engine.pool
+    return {
+        **session_metrics.snapshot(),
+        "pool": {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow()
+        }
+    }
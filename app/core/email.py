@@ -1,15 +1,18 @@
-from typing import Optional
+from typing import List, Optional, Tuple, Union
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from app.core.config import settings
+from app.models.email_outbox import EmailOutbox
 import aiosmtplib
 
 class EmailService:
     def __init__(self, smtp_settings: dict = settings.SMTP):
         self.smtp_settings = smtp_settings
 
-    async def send_document_request(self, case_email: str, request_id: str, description: str) -> None:
-        """Send document request email."""
+    def document_request_email(self, request_id: str, description: str) -> Tuple[str, str]:
+        """Build the subject and body of a document request email."""
         subject = f"Document Request - {request_id}"
         body = f"""A new document has been requested for your case.
 
@@ -18,24 +21,80 @@ Description: {description}
 
 Please reply to this email with the requested document attached.
 """
+        return subject, body
+
+    def queue_document_request(
+        self,
+        db: Union[Session, AsyncSession],
+        case_email: str,
+        request_id: str,
+        description: str
+    ) -> EmailOutbox:
+        """Queue a document request email in the caller's transaction."""
+        subject, body = self.document_request_email(request_id, description)
+        return self.queue_email(db, case_email, subject, body)
+
+    def queue_document_requests(
+        self,
+        db: Union[Session, AsyncSession],
+        case_email: str,
+        requests: List[Tuple[str, str]]
+    ) -> EmailOutbox:
+        """Queue one email listing several document requests in the caller's transaction."""
+        subject = f"Document Requests - {len(requests)} documents requested"
+        listing = "\n".join(
+            f"- Request ID: {request_id}\n  Description: {description}"
+            for request_id, description in requests
+        )
+        body = f"""{len(requests)} documents have been requested for your case.
+
+{listing}
+
+Please reply to this email with the requested documents attached, quoting each request ID.
+"""
+        return self.queue_email(db, case_email, subject, body)
+
+    def queue_email(
+        self,
+        db: Union[Session, AsyncSession],
+        to_email: str,
+        subject: str,
+        body: str
+    ) -> EmailOutbox:
+        """
+        Add an email to the outbox without committing.
 
+        The email is only delivered if the caller's transaction commits, and
+        delivery happens in the background outbox sender.
+        """
+        message = EmailOutbox(to_email=to_email, subject=subject, body=body)
+        db.add(message)
+        return message
+
+    async def send_document_request(self, case_email: str, request_id: str, description: str) -> None:
+        """Send document request email."""
+        subject, body = self.document_request_email(request_id, description)
         await self.send_email(case_email, subject, body)
 
-    async def send_email(self, to_email: str, subject: str, body: str) -> None:
-        """Send email using configured SMTP settings."""
+    def build_message(self, to_email: str, subject: str, body: str) -> MIMEMultipart:
+        """Build a plain-text message from the configured sender."""
         message = MIMEMultipart()
         message["From"] = self.smtp_settings["username"]
         message["To"] = to_email
         message["Subject"] = subject
         message.attach(MIMEText(body, "plain"))
+        return message
 
+    async def send_email(self, to_email: str, subject: str, body: str) -> None:
+        """Send email using configured SMTP settings."""
         async with aiosmtplib.SMTP(
             hostname=self.smtp_settings["host"],
             port=self.smtp_settings["port"],
             use_tls=self.smtp_settings["use_tls"]
         ) as smtp:
-            await smtp.login(
-                self.smtp_settings["username"],
-                self.smtp_settings["password"]
-            )
-            await smtp.send_message(message)
\ No newline at end of file
+            if self.smtp_settings.get("password"):
+                await smtp.login(
+                    self.smtp_settings["username"],
+                    self.smtp_settings["password"]
+                )
+            await smtp.send_message(self.build_message(to_email, subject, body))
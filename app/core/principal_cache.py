@@ -0,0 +1,153 @@
+from typing import Any, Dict, Optional, Sequence, Tuple
+from collections import OrderedDict
+from datetime import datetime
+import json
+import threading
+import time
+from sqlalchemy import DateTime, event, inspect
+from sqlalchemy.orm import Session, object_session
+from app.core.config import settings
+
+class PrincipalCache:
+    """Cache of authenticated users keyed on user ID and token ID.
+
+    Entries are snapshots of the ``fields`` columns authorization needs, so
+    a cached principal is a transient model instance detached from any
+    session, with every other column unset. Credentials such as the password
+    hash are never cached. Lookups try an
+    in-process LRU first, then Redis when ``redis_url`` is set. Invalidating
+    a user clears both tiers; other processes' LRU tiers keep a stale entry
+    for at most ``ttl`` seconds, so keep it short.
+    """
+
+    KEY_PREFIX = "principal"
+    PENDING_KEY = "principal_cache_invalidate"
+
+    def __init__(
+        self,
+        fields: Sequence[str] = settings.PRINCIPAL_CACHE_FIELDS,
+        ttl: float = settings.PRINCIPAL_CACHE_TTL,
+        max_size: int = settings.PRINCIPAL_CACHE_MAX_SIZE,
+        redis_url: Optional[str] = settings.PRINCIPAL_CACHE_REDIS_URL,
+        redis_ttl: int = settings.PRINCIPAL_CACHE_REDIS_TTL,
+        redis_client=None
+    ):
+        self.fields = tuple(fields)
+        self.ttl = ttl
+        self.max_size = max_size
+        self.redis_ttl = redis_ttl
+        self._entries: "OrderedDict[Tuple[int, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        if redis_client is None and redis_url:
+            import redis
+
+            redis_client = redis.Redis.from_url(redis_url)
+        self.redis = redis_client
+
+    def get(self, model, user_id: int, token_id: str):
+        """Get a cached principal, or None on a miss."""
+        key = (user_id, token_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, data = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    return model(**data)
+                del self._entries[key]
+
+        if self.redis is None:
+            return None
+        try:
+            raw = self.redis.get(self._redis_key(user_id, token_id))
+        except Exception:
+            # Redis is an optional tier; fall back to the database
+            return None
+        if raw is None:
+            return None
+        data = self._decode(model, raw)
+        self._store_local(key, data)
+        return model(**data)
+
+    def set(self, user_id: int, token_id: str, user) -> None:
+        """Cache a principal loaded from the database."""
+        data = {
+            attr.key: getattr(user, attr.key)
+            for attr in inspect(user).mapper.column_attrs
+            if attr.key in self.fields
+        }
+        self._store_local((user_id, token_id), data)
+        if self.redis is not None:
+            try:
+                self.redis.set(
+                    self._redis_key(user_id, token_id),
+                    json.dumps(data, default=lambda value: value.isoformat()),
+                    ex=self.redis_ttl
+                )
+            except Exception:
+                # The local tier still holds the entry
+                pass
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached principal for a user, e.g. when they are disabled."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+        if self.redis is not None:
+            try:
+                keys = list(self.redis.scan_iter(match=f"{self.KEY_PREFIX}:{user_id}:*"))
+                if keys:
+                    self.redis.delete(*keys)
+            except Exception:
+                # Like get and set, a Redis outage must not fail the caller;
+                # the Redis entries then expire after redis_ttl
+                pass
+
+    def invalidate_on_change(self, model) -> None:
+        """Invalidate a user's entries whenever their row is updated or deleted through the ORM.
+
+        Changed users are collected while the session flushes and
+        invalidated once the transaction commits, so a request that reads
+        the user in between cannot cache the row from before the commit.
+        """
+        def collect(mapper, connection, target):
+            session = object_session(target)
+            if session is not None:
+                session.info.setdefault(self.PENDING_KEY, set()).add(target.id)
+
+        def invalidate(session):
+            for user_id in session.info.pop(self.PENDING_KEY, ()):
+                self.invalidate_user(user_id)
+
+        def discard(session):
+            session.info.pop(self.PENDING_KEY, None)
+
+        event.listen(model, "after_update", collect)
+        event.listen(model, "after_delete", collect)
+        event.listen(Session, "after_commit", invalidate)
+        event.listen(Session, "after_rollback", discard)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _store_local(self, key: Tuple[int, str], data: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _decode(self, model, raw: bytes) -> Dict[str, Any]:
+        data = json.loads(raw)
+        # JSON has no datetime type; restore DateTime columns from ISO strings
+        for attr in inspect(model).column_attrs:
+            value = data.get(attr.key)
+            if isinstance(value, str) and isinstance(attr.columns[0].type, DateTime):
+                data[attr.key] = datetime.fromisoformat(value)
+        return data
+
+    def _redis_key(self, user_id: int, token_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{user_id}:{token_id}"
+
+principal_cache = PrincipalCache()
@@ -0,0 +1,76 @@
+from typing import Dict, List
+from bisect import bisect_left
+import threading
+
+# Upper bounds in seconds of the session lifetime histogram buckets
+LIFETIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class SessionLifetimeMetrics:
+    """Histogram of how long request-scoped database sessions stay open.
+
+    Long-lived sessions hold pooled connections, so this shows whether slow
+    requests, not query volume, are what exhausts the pool.
+    """
+
+    def __init__(self, buckets: tuple = LIFETIME_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts: List[int] = [0] * (len(self.buckets) + 1)
+            self._count = 0
+            self._total = 0.0
+            self._max = 0.0
+            self._open = 0
+
+    def session_opened(self) -> None:
+        with self._lock:
+            self._open += 1
+
+    def session_closed(self, lifetime: float) -> None:
+        with self._lock:
+            self._open -= 1
+            self._counts[bisect_left(self.buckets, lifetime)] += 1
+            self._count += 1
+            self._total += lifetime
+            self._max = max(self._max, lifetime)
+
+    def snapshot(self) -> Dict:
+        """Get current counts, cumulative buckets and approximate percentiles."""
+        with self._lock:
+            counts = list(self._counts)
+            count, total, maximum, open_sessions = self._count, self._total, self._max, self._open
+
+        cumulative = []
+        running = 0
+        for bound, bucket_count in zip(list(self.buckets) + [float("inf")], counts):
+            running += bucket_count
+            cumulative.append({"le": bound, "count": running})
+
+        def percentile(fraction: float) -> float:
+            # Upper bound of the bucket containing the percentile
+            target = fraction * count
+            for bucket in cumulative:
+                if bucket["count"] >= target:
+                    return min(bucket["le"], maximum)
+            return maximum
+
+        percentiles = {
+            f"p{int(fraction * 100)}_seconds": percentile(fraction) if count else 0.0
+            for fraction in (0.5, 0.95, 0.99)
+        }
+        # JSON has no infinity, so the overflow bucket uses Prometheus' "+Inf"
+        cumulative[-1]["le"] = "+Inf"
+
+        return {
+            "open_sessions": open_sessions,
+            "sessions": count,
+            "mean_seconds": total / count if count else 0.0,
+            "max_seconds": maximum,
+            **percentiles,
+            "buckets": cumulative
+        }
+
+session_metrics = SessionLifetimeMetrics()
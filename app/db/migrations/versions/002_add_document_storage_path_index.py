@@ -0,0 +1,26 @@
+"""add_document_storage_path_index
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Documents reference content-addressed blobs by storage path
+    op.create_index(
+        'ix_documents_storage_path',
+        'documents',
+        ['storage_path'],
+        unique=False
+    )
+
+def downgrade():
+    op.drop_index('ix_documents_storage_path', table_name='documents')
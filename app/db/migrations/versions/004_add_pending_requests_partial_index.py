@@ -0,0 +1,37 @@
+"""add_pending_requests_partial_index
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Only requested-but-unsubmitted rows are indexed, ordered by id within a
+    # case, matching the paginated pending-requests query exactly. Build it
+    # concurrently so the documents table stays writable.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_documents_pending_requests',
+            'documents',
+            ['case_id', 'id'],
+            unique=False,
+            postgresql_where=sa.text('request_id IS NOT NULL AND storage_path IS NULL'),
+            postgresql_concurrently=True
+        )
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_documents_pending_requests',
+            table_name='documents',
+            postgresql_concurrently=True
+        )
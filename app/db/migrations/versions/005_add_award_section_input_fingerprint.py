@@ -0,0 +1,26 @@
+"""add_award_section_input_fingerprint
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # SHA-256 of each section's rendering inputs. Existing sections have no
+    # fingerprint, so their next regeneration re-renders them once.
+    op.add_column(
+        'award_sections',
+        sa.Column('input_fingerprint', sa.String(length=64), nullable=True)
+    )
+
+def downgrade():
+    op.drop_column('award_sections', 'input_fingerprint')
@@ -0,0 +1,37 @@
+"""add_award_section_versions_table
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Version history of award sections: periodic full snapshots with JSON
+    # deltas in between. Existing sections get their first row on their next
+    # change, which records a snapshot because no previous version exists.
+    op.create_table(
+        'award_section_versions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('section_id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('is_snapshot', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('data', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('created_by_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['section_id'], ['award_sections.id'], ),
+        sa.ForeignKeyConstraint(['created_by_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('section_id', 'version')
+    )
+
+def downgrade():
+    op.drop_table('award_section_versions')
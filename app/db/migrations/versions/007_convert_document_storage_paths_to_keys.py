@@ -0,0 +1,40 @@
+"""convert_document_storage_paths_to_keys
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.core.config import settings
+
+# revision identifiers
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+def _root_prefix() -> str:
+    return settings.DOCUMENT_STORAGE_PATH.rstrip('/') + '/'
+
+def upgrade():
+    # Documents stored before the storage backends hold the absolute path of
+    # their file under DOCUMENT_STORAGE_PATH. Stripping the root leaves the
+    # backend key of the same file, so no file has to move; blob paths become
+    # blobs/ab/cd/<sha256> keys that garbage collection recognises as references.
+    prefix = _root_prefix()
+    op.execute(
+        sa.text(
+            "UPDATE documents SET storage_path = substr(storage_path, :start) "
+            "WHERE substr(storage_path, 1, :length) = :prefix"
+        ).bindparams(start=len(prefix) + 1, length=len(prefix), prefix=prefix)
+    )
+
+def downgrade():
+    op.execute(
+        sa.text(
+            "UPDATE documents SET storage_path = :prefix || storage_path "
+            "WHERE storage_path IS NOT NULL AND substr(storage_path, 1, 1) <> '/'"
+        ).bindparams(prefix=_root_prefix())
+    )
@@ -0,0 +1,146 @@
+from typing import Dict, Optional, Sequence
+from collections import OrderedDict
+import itertools
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.config import settings
+
+class SessionRouter:
+    """Routes read-only sessions to replicas and all other sessions to the primary.
+
+    Replicas are used round-robin. A replica that cannot be reached is
+    skipped for ``replica_retry_interval`` seconds, and reads fall back to
+    the primary when no replica is available.
+
+    Users who committed a write within ``read_your_writes_window`` seconds
+    read from the primary, so they see their own changes despite replica
+    lag. Writes are tracked in process and, when ``redis_url`` is set, in
+    Redis, so a write seen by one worker routes the user's reads to the
+    primary on every worker. If Redis cannot be reached, reads go to the
+    primary rather than risk a stale replica.
+    """
+
+    KEY_PREFIX = "recent_write"
+
+    def __init__(
+        self,
+        primary: async_sessionmaker,
+        replicas: Sequence[async_sessionmaker] = (),
+        read_your_writes_window: float = settings.DB_READ_YOUR_WRITES_WINDOW,
+        replica_retry_interval: float = settings.DB_REPLICA_RETRY_INTERVAL,
+        redis_url: Optional[str] = settings.DB_READ_YOUR_WRITES_REDIS_URL,
+        redis_client=None
+    ):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.read_your_writes_window = read_your_writes_window
+        self.replica_retry_interval = replica_retry_interval
+        self._next_replica = itertools.count()
+        self._unavailable_until: Dict[int, float] = {}
+        self._recent_writes: "OrderedDict[int, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        if redis_client is None and redis_url:
+            import redis
+
+            redis_client = redis.Redis.from_url(redis_url)
+        self.redis = redis_client
+
+    def write_session(self, user_id: Optional[int] = None) -> AsyncSession:
+        """Open a session on the primary.
+
+        When ``user_id`` is given, committing a transaction that flushed
+        changes opens that user's read-your-writes window.
+        """
+        session = self.primary()
+        if user_id is not None:
+            sync_session = session.sync_session
+
+            @event.listens_for(sync_session, "after_flush")
+            def mark_written(session, flush_context):
+                session.info["has_writes"] = True
+
+            @event.listens_for(sync_session, "do_orm_execute")
+            def mark_executed(orm_execute_state):
+                # Bulk DML and textual statements bypass the flush
+                if not orm_execute_state.is_select:
+                    orm_execute_state.session.info["has_writes"] = True
+
+            @event.listens_for(sync_session, "after_commit")
+            def record_commit(session):
+                if session.info.pop("has_writes", False):
+                    self.record_write(user_id)
+
+            @event.listens_for(sync_session, "after_rollback")
+            def discard_writes(session):
+                session.info.pop("has_writes", None)
+
+        return session
+
+    async def read_session(self, user_id: Optional[int] = None) -> AsyncSession:
+        """Open a session for read-only queries.
+
+        Args:
+            user_id: User the reads are for, if any
+
+        Returns:
+            A session on a reachable replica, or on the primary if there is
+            none or the user wrote recently
+        """
+        if user_id is not None and self.has_recent_write(user_id):
+            return self.primary()
+
+        start = next(self._next_replica)
+        for offset in range(len(self.replicas)):
+            index = (start + offset) % len(self.replicas)
+            if self._unavailable_until.get(index, 0.0) > time.monotonic():
+                continue
+            session = self.replicas[index]()
+            try:
+                # Check out a connection now so an unreachable replica is
+                # detected here rather than in the middle of the request
+                await session.connection()
+            except (DBAPIError, OSError):
+                await session.close()
+                self._unavailable_until[index] = time.monotonic() + self.replica_retry_interval
+                continue
+            return session
+        return self.primary()
+
+    def record_write(self, user_id: int) -> None:
+        """Send the user's reads to the primary for the read-your-writes window."""
+        now = time.monotonic()
+        with self._lock:
+            self._recent_writes[user_id] = now + self.read_your_writes_window
+            self._recent_writes.move_to_end(user_id)
+            # Entries are ordered by expiry, so expired ones are at the front
+            while self._recent_writes:
+                oldest_user, expires_at = next(iter(self._recent_writes.items()))
+                if expires_at > now:
+                    break
+                del self._recent_writes[oldest_user]
+        if self.redis is not None:
+            try:
+                self.redis.set(
+                    f"{self.KEY_PREFIX}:{user_id}",
+                    1,
+                    px=max(1, int(self.read_your_writes_window * 1000))
+                )
+            except Exception:
+                # Other workers fall back to the primary while Redis is unreachable
+                pass
+
+    def has_recent_write(self, user_id: int) -> bool:
+        with self._lock:
+            expires_at = self._recent_writes.get(user_id)
+        if expires_at is not None and expires_at > time.monotonic():
+            return True
+        if self.redis is None:
+            return False
+        try:
+            return bool(self.redis.exists(f"{self.KEY_PREFIX}:{user_id}"))
+        except Exception:
+            # The write may have happened on another worker; stay consistent
+            return True
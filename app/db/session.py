@@ -0,0 +1,39 @@
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.db.routing import SessionRouter
+
+engine = create_engine(settings.DATABASE_URL, pool_pre_ping=settings.DB_POOL_PRE_PING)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def create_async_db_engine(url: str = settings.ASYNC_DATABASE_URL) -> AsyncEngine:
+    """Create an async engine with the configured pool and statement cache."""
+    connect_args = {}
+    if url.startswith("postgresql+asyncpg"):
+        # Prepared statements are cached per connection, so repeated queries
+        # skip parsing and planning on the server
+        connect_args["prepared_statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+    return create_async_engine(
+        url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args
+    )
+
+async_engine = create_async_db_engine()
+
+# Objects stay usable after commit; async sessions cannot lazily refresh
+# expired attributes.
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+session_router = SessionRouter(
+    AsyncSessionLocal,
+    [
+        async_sessionmaker(create_async_db_engine(url), expire_on_commit=False)
+        for url in settings.ASYNC_DATABASE_REPLICA_URLS
+    ]
+)
@@ -1,34 +1,34 @@
-import magic
-from typing import List
-from fastapi import Request, HTTPException
+from fastapi import Request
+from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from app.core.config import settings
 
 class DocumentValidationMiddleware(BaseHTTPMiddleware):
+    """Reject document submissions that declare an oversized body.
+
+    This only checks the Content-Length header, which clients may omit or
+    misstate. The submit endpoint reads the body incrementally and
+    ``DocumentProcessor`` enforces the actual size and file type as the
+    upload arrives, so the body is never buffered here.
+    """
+
     async def dispatch(self, request: Request, call_next):
         if request.url.path.endswith("/submit") and request.method == "POST":
-            # Validate content length
+            # Validate declared content length
             content_length = request.headers.get("content-length")
-            if content_length and int(content_length) > settings.MAX_UPLOAD_SIZE:
-                raise HTTPException(
+            if content_length and not content_length.isdigit():
+                return JSONResponse(
+                    status_code=400,
+                    content={"detail": "Invalid Content-Length header"}
+                )
+            # The body also carries multipart boundaries and part headers, so
+            # allow the same overhead as MultipartUpload on top of the file
+            if content_length and int(content_length) > settings.MAX_UPLOAD_SIZE + settings.MULTIPART_OVERHEAD:
+                return JSONResponse(
                     status_code=413,
-                    detail=f"File size exceeds maximum limit of {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB"
+                    content={
+                        "detail": f"File size exceeds maximum limit of {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB"
+                    }
                 )
-            
-            # Get the form data and validate file type
-            form = await request.form()
-            if "file" in form:
-                file = form["file"]
-                content = await file.read()
-                mime_type = magic.from_buffer(content, mime=True)
-                
-                if mime_type not in settings.ALLOWED_MIME_TYPES:
-                    raise HTTPException(
-                        status_code=415,
-                        detail=f"File type {mime_type} not allowed. Allowed types: {settings.ALLOWED_MIME_TYPES}"
-                    )
-                
-                # Reset file position for subsequent reads
-                await file.seek(0)
         
-        return await call_next(request)
\ No newline at end of file
+        return await call_next(request)
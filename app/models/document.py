@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional, Dict, Any
-from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
@@ -12,7 +12,7 @@ class Document(Base):
     filename = Column(String, nullable=False)
     file_type = Column(String, nullable=False)
     file_size = Column(Integer, nullable=False)
-    storage_path = Column(String, nullable=False)
+    storage_path = Column(String, nullable=False, index=True)
     
     # Metadata fields
     metadata = Column(JSON, nullable=True)
@@ -37,6 +37,16 @@ class Document(Base):
     requester = relationship("User", foreign_keys=[requested_by])
     submitter = relationship("User", foreign_keys=[submitted_by])
 
+    __table_args__ = (
+        # Covers listing a case's pending requests: requested but not yet submitted
+        Index(
+            "ix_documents_pending_requests",
+            "case_id",
+            "id",
+            postgresql_where=text("request_id IS NOT NULL AND storage_path IS NULL")
+        ),
+    )
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.metadata = kwargs.get("metadata", {})
@@ -0,0 +1,24 @@
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+class SectionVersionResponse(BaseModel):
+    section_id: int
+    version: int
+    is_snapshot: bool
+    created_at: datetime
+    created_by_id: Optional[int]
+
+    class Config:
+        from_attributes = True
+
+class SectionVersionContentResponse(BaseModel):
+    section_id: int
+    version: int
+    content: str
+
+class SectionVersionDiffResponse(BaseModel):
+    section_id: int
+    from_version: int
+    to_version: int
+    diff: str
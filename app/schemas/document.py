@@ -1,10 +1,17 @@
-from typing import Optional, Dict, Any
+from typing import List, Optional, Dict, Any
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class DocumentRequest(BaseModel):
     description: str
 
+class BulkDocumentRequest(BaseModel):
+    requests: List[DocumentRequest] = Field(..., min_length=1, max_length=500)
+
+class BulkDocumentRequestResponse(BaseModel):
+    request_ids: List[str]
+    message: str
+
 class DocumentResponse(BaseModel):
     request_id: str
     case_id: int
@@ -16,4 +23,17 @@ class DocumentResponse(BaseModel):
     metadata: Optional[Dict[str, Any]]
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class PendingDocumentRequest(BaseModel):
+    id: int
+    request_id: str
+    requested_by: Optional[int]
+    requested_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+class PendingDocumentRequestPage(BaseModel):
+    items: List[PendingDocumentRequest]
+    next_cursor: Optional[int]
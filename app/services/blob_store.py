@@ -0,0 +1,155 @@
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+import argparse
+import asyncio
+import uuid
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.document import Document
+from app.services.storage import StorageBackend, get_storage_backend
+
+# Number of blob keys checked for references per query during garbage collection
+GC_BATCH_SIZE = 500
+
+BLOB_PREFIX = "blobs/"
+TEMP_PREFIX = "tmp/"
+
+class BlobStore:
+    """Content-addressed file storage keyed on the full SHA-256 of each file.
+
+    Blobs are stored under ``blobs/ab/cd/abcd...`` in the storage backend, so
+    identical files uploaded to different cases share a single blob. A blob's
+    references are the ``Document`` rows whose ``storage_path`` holds its key.
+    """
+
+    def __init__(self, backend: Optional[StorageBackend] = None):
+        self.backend = backend or get_storage_backend()
+
+    def key_for(self, file_hash: str) -> str:
+        """Get the storage key of the blob with the given hash."""
+        return f"{BLOB_PREFIX}{file_hash[:2]}/{file_hash[2:4]}/{file_hash}"
+
+    def new_temp_key(self) -> str:
+        """Get a fresh key for staging an upload before its hash is known."""
+        return f"{TEMP_PREFIX}{uuid.uuid4().hex}.upload"
+
+    async def commit(self, temp_key: str, file_hash: str) -> Tuple[str, bool]:
+        """
+        Move a staged upload into the store under its hash.
+
+        If a blob with the same hash already exists the staged upload is
+        discarded and the existing blob is reused.
+
+        Returns:
+            Tuple of (blob key, whether a new blob was stored)
+        """
+        key = self.key_for(file_hash)
+        if await self.backend.exists(key):
+            await self.backend.delete(temp_key)
+            # Refresh the blob so garbage collection treats it as recently used
+            await self.backend.touch(key)
+            return key, False
+
+        await self.backend.move(temp_key, key)
+        return key, True
+
+    async def discard(self, temp_key: str) -> None:
+        """Delete a staged upload if it exists."""
+        if await self.backend.exists(temp_key):
+            await self.backend.delete(temp_key)
+
+async def collect_garbage(
+    db: AsyncSession,
+    blob_store: BlobStore,
+    grace_period: timedelta = timedelta(hours=24),
+    dry_run: bool = False
+) -> List[str]:
+    """
+    Delete blobs that no Document references.
+
+    Blobs modified within the grace period are kept, so uploads whose
+    Document row has not been committed yet are never collected. An upload
+    that reuses an existing blob touches it, so each blob's modification
+    time and references are checked again right before it is deleted.
+
+    Returns:
+        Keys of the deleted (or, for a dry run, deletable) blobs
+    """
+    cutoff = datetime.now(timezone.utc) - grace_period
+    unreferenced = []
+    batch = []
+    async for stored in blob_store.backend.list_objects(BLOB_PREFIX):
+        if stored.last_modified < cutoff:
+            batch.append(stored.key)
+        if len(batch) == GC_BATCH_SIZE:
+            unreferenced.extend(await _collect_batch(db, blob_store, batch, cutoff, dry_run))
+            batch = []
+    if batch:
+        unreferenced.extend(await _collect_batch(db, blob_store, batch, cutoff, dry_run))
+
+    return unreferenced
+
+async def _collect_batch(
+    db: AsyncSession,
+    blob_store: BlobStore,
+    batch: List[str],
+    cutoff: datetime,
+    dry_run: bool
+) -> List[str]:
+    """Delete the unreferenced blobs among one batch of listed keys."""
+    referenced = set(await db.scalars(
+        select(Document.storage_path)
+        .where(Document.storage_path.in_(batch))
+        .distinct()
+    ))
+    unreferenced = []
+    for key in batch:
+        if key in referenced:
+            continue
+        if dry_run:
+            unreferenced.append(key)
+        elif await _delete_if_unused(db, blob_store, key, cutoff):
+            unreferenced.append(key)
+    return unreferenced
+
+async def _delete_if_unused(db: AsyncSession, blob_store: BlobStore, key: str, cutoff: datetime) -> bool:
+    """Delete a blob unless it was touched or referenced since it was listed."""
+    if not await blob_store.backend.exists(key):
+        return False
+    if (await blob_store.backend.stat(key)).last_modified >= cutoff:
+        return False
+    reference = await db.scalar(
+        select(Document.id).where(Document.storage_path == key).limit(1)
+    )
+    if reference is not None:
+        return False
+    await blob_store.backend.delete(key)
+    return True
+
+async def _run_garbage_collection(grace_hours: float, dry_run: bool) -> List[str]:
+    from app.db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        return await collect_garbage(
+            db,
+            BlobStore(),
+            grace_period=timedelta(hours=grace_hours),
+            dry_run=dry_run
+        )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Delete unreferenced document blobs.")
+    parser.add_argument("--grace-hours", type=float, default=24,
+                        help="Keep blobs modified within this many hours")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="List unreferenced blobs without deleting them")
+    args = parser.parse_args()
+
+    keys = asyncio.run(_run_garbage_collection(args.grace_hours, args.dry_run))
+
+    for key in keys:
+        print(key)
+    print(f"{'Found' if args.dry_run else 'Deleted'} {len(keys)} unreferenced blobs")
+
+if __name__ == "__main__":
+    main()
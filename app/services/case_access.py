@@ -0,0 +1,30 @@
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.document import Document
+
+async def user_can_access_case(db: AsyncSession, user, case_id: int) -> bool:
+    """
+    Check whether a user may read a case's documents.
+
+    Superusers may read every case. Other users take part in a case once
+    they have requested or submitted one of its documents.
+
+    Args:
+        db: Database session
+        user: Authenticated user
+        case_id: ID of the case
+
+    Returns:
+        True if the user may read the case's documents
+    """
+    if getattr(user, "is_superuser", False):
+        return True
+    participation = await db.scalar(
+        select(Document.id)
+        .where(
+            Document.case_id == case_id,
+            or_(Document.requested_by == user.id, Document.submitted_by == user.id)
+        )
+        .limit(1)
+    )
+    return participation is not None
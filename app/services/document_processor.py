@@ -4,31 +4,90 @@ import magic
 from fastapi import UploadFile
 from app.models.document import Document
 from app.core.config import settings
+from app.services.blob_store import BlobStore
+from app.services.storage import LocalStorageBackend, StorageBackend, get_storage_backend
+from app.services.text_extraction import TextExtractor
 import hashlib
-import os
+
+# Number of leading bytes inspected to detect a file's MIME type
+MIME_SNIFF_SIZE = 8 * 1024
+
+class DocumentValidationError(ValueError):
+    """Raised when an upload fails validation."""
+
+class FileTooLargeError(DocumentValidationError):
+    """Raised when an upload exceeds the maximum allowed size."""
+
+class UnsupportedFileTypeError(DocumentValidationError):
+    """Raised when an upload's detected MIME type is not allowed."""
 
 class DocumentProcessor:
-    def __init__(self, storage_path: str = settings.DOCUMENT_STORAGE_PATH):
-        self.storage_path = storage_path
+    def __init__(
+        self,
+        storage_path: Optional[str] = None,
+        chunk_size: int = settings.UPLOAD_CHUNK_SIZE,
+        max_upload_size: int = settings.MAX_UPLOAD_SIZE,
+        allowed_mime_types: List[str] = settings.ALLOWED_MIME_TYPES,
+        storage: Optional[StorageBackend] = None
+    ):
+        if storage is None:
+            storage = LocalStorageBackend(storage_path) if storage_path else get_storage_backend()
+        self.storage = storage
+        self.blob_store = BlobStore(storage)
+        self.text_extractor = TextExtractor(storage)
+        self.chunk_size = chunk_size
+        self.max_upload_size = max_upload_size
+        self.allowed_mime_types = allowed_mime_types
 
     async def process_document(self, file: UploadFile, case_id: int, user_id: int) -> Document:
-        """Process an uploaded document and create Document record."""
-        # Read file content
-        content = await file.read()
-        
-        # Get file metadata
-        file_type = magic.from_buffer(content, mime=True)
-        file_size = len(content)
-        file_hash = hashlib.sha256(content).hexdigest()
-        
-        # Generate storage path
-        storage_path = self._generate_storage_path(case_id, file_hash, file.filename)
-        
-        # Save file
-        os.makedirs(os.path.dirname(storage_path), exist_ok=True)
-        with open(storage_path, 'wb') as f:
-            f.write(content)
-        
+        """Process an uploaded document and create Document record.
+
+        The upload is streamed to a temporary object in fixed-size chunks
+        while its hash is computed, then moved into the content-addressed blob
+        store, so memory use does not grow with the file size. If an identical
+        file is already stored the upload reuses that blob. The file is
+        validated as it arrives: the MIME type is checked on the first chunk
+        and the size limit on every chunk, aborting the upload as soon as
+        either fails. ``file`` is read only through ``read`` and
+        ``filename``, so a ``MultipartUpload`` can stand in for an
+        ``UploadFile``; the abort then also stops the transfer from the client.
+
+        Raises:
+            UnsupportedFileTypeError: If the detected MIME type is not allowed
+            FileTooLargeError: If the upload exceeds the maximum size
+        """
+        hasher = hashlib.sha256()
+        file_type = None
+
+        async def validated_chunks():
+            nonlocal file_type
+            received = 0
+            while chunk := await file.read(self.chunk_size):
+                if file_type is None:
+                    # Sniff MIME type from the start of the first chunk only
+                    file_type = magic.from_buffer(chunk[:MIME_SNIFF_SIZE], mime=True)
+                    self._validate_file_type(file_type)
+                received += len(chunk)
+                self._validate_size(received)
+                hasher.update(chunk)
+                yield chunk
+
+        temp_key = self.blob_store.new_temp_key()
+        try:
+            file_size = await self.storage.write_stream(temp_key, validated_chunks())
+
+            if file_type is None:
+                file_type = magic.from_buffer(b"", mime=True)
+                self._validate_file_type(file_type)
+
+            file_hash = hasher.hexdigest()
+
+            # Move the completed upload into place, or reuse an identical blob
+            storage_path, _ = await self.blob_store.commit(temp_key, file_hash)
+        except BaseException:
+            await self.blob_store.discard(temp_key)
+            raise
+
         # Create document record
         document = Document(
             case_id=case_id,
@@ -46,37 +105,79 @@ class DocumentProcessor:
         
         return document
 
-    def _generate_storage_path(self, case_id: int, file_hash: str, filename: str) -> str:
-        """Generate unique storage path for document."""
-        ext = os.path.splitext(filename)[1]
-        return os.path.join(
-            self.storage_path,
-            str(case_id),
-            f"{file_hash[:8]}{ext}"
-        )
+    async def hash_upload(self, file: UploadFile) -> str:
+        """Compute the SHA-256 of an upload without storing it.
+
+        Used to recognise a retried submission. The size limit is enforced
+        as the upload is read, as in ``process_document``.
 
-    async def extract_metadata(self, document: Document) -> Dict[str, Any]:
-        """Extract metadata from document file."""
+        Raises:
+            FileTooLargeError: If the upload exceeds the maximum size
+        """
+        hasher = hashlib.sha256()
+        received = 0
+        while chunk := await file.read(self.chunk_size):
+            received += len(chunk)
+            self._validate_size(received)
+            hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def _validate_size(self, received: int) -> None:
+        """Reject uploads once they exceed the maximum size."""
+        if received > self.max_upload_size:
+            raise FileTooLargeError(
+                f"File size exceeds maximum limit of {self.max_upload_size / 1024 / 1024}MB"
+            )
+
+    def _validate_file_type(self, file_type: str) -> None:
+        """Reject uploads whose detected MIME type is not allowed."""
+        if file_type not in self.allowed_mime_types:
+            raise UnsupportedFileTypeError(
+                f"File type {file_type} not allowed. Allowed types: {self.allowed_mime_types}"
+            )
+
+    async def extract_metadata(self, document: Document, verify: bool = False) -> Dict[str, Any]:
+        """Extract metadata from document file.
+
+        Only the file's first few KB are read to detect its MIME type; the
+        size and modification time come from the storage backend. The hash
+        recorded at upload time is reused unless ``verify`` is set, in which
+        case the stored file is re-hashed without loading it into memory.
+        PDF and DOCX files also get a page count from text extraction.
+        """
         metadata = {}
         
         try:
-            # Read file content
-            with open(document.storage_path, 'rb') as f:
-                content = f.read()
+            stored = await self.storage.stat(document.storage_path)
+            # Clamp the range to the object: S3 rejects any range on an
+            # empty object, and read_range skips the read when it is empty
+            prefix = b"".join([
+                chunk async for chunk in self.storage.read_range(
+                    document.storage_path, 0, min(MIME_SNIFF_SIZE, stored.size)
+                )
+            ])
+
+            file_hash = (document.metadata or {}).get('hash')
+            if verify or not file_hash:
+                file_hash = await self.storage.sha256(document.storage_path)
             
             # Basic file metadata
             metadata.update({
-                'file_size': len(content),
-                'mime_type': magic.from_buffer(content, mime=True),
-                'hash': hashlib.sha256(content).hexdigest(),
-                'last_modified': datetime.fromtimestamp(
-                    os.path.getmtime(document.storage_path)
-                ).isoformat()
+                'file_size': stored.size,
+                'mime_type': magic.from_buffer(prefix, mime=True),
+                'hash': file_hash,
+                'last_modified': stored.last_modified.isoformat()
             })
             
-            # TODO: Add advanced metadata extraction based on file type
-            # This could include EXIF data for images, PDF metadata, etc.
+            # Extracting the text also caches it by hash for summarization
+            if self.text_extractor.supports(document):
+                try:
+                    extracted = await self.text_extractor.extract(document)
+                    metadata['page_count'] = extracted.page_count
+                except Exception as e:
+                    # A damaged PDF or DOCX still has its basic metadata
+                    metadata['text_extraction_error'] = str(e)
             
             return metadata
         except Exception as e:
-            raise ValueError(f"Failed to extract metadata: {str(e)}")
\ No newline at end of file
+            raise ValueError(f"Failed to extract metadata: {str(e)}")
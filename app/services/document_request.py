@@ -1,13 +1,21 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 import uuid
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.document import Document
 from app.models.case import Case
 from app.core.email import EmailService
 
+class DocumentAlreadySubmittedError(ValueError):
+    """Raised when a request already has a submission with different content."""
+
+class DocumentRequestNotFoundError(ValueError):
+    """Raised when a document request does not exist."""
+
 class DocumentRequestService:
-    def __init__(self, db: Session, email_service: EmailService):
+    def __init__(self, db: AsyncSession, email_service: EmailService):
         self.db = db
         self.email_service = email_service
 
@@ -17,7 +25,7 @@ class DocumentRequestService:
         request_id = str(uuid.uuid4())
         
         # Get case details
-        case = self.db.query(Case).filter(Case.id == case_id).first()
+        case = await self.db.get(Case, case_id)
         if not case:
             raise ValueError(f"Case {case_id} not found")
         
@@ -30,37 +38,194 @@ class DocumentRequestService:
         )
         self.db.add(document)
         
-        # Send email notification
-        await self.email_service.send_document_request(
+        # Queue the notification in the same transaction; the outbox sender delivers it
+        self.email_service.queue_document_request(
+            self.db,
             case_email=case.email,
             request_id=request_id,
             description=description
         )
         
-        self.db.commit()
+        await self.db.commit()
         return request_id
 
-    async def process_document_submission(self, request_id: str, document: Document) -> None:
-        """Process a document submitted in response to a request."""
-        # Update existing document record
-        existing_doc = self.db.query(Document).filter(
-            Document.request_id == request_id
-        ).first()
+    async def create_document_requests(
+        self,
+        case_id: int,
+        requester_id: int,
+        descriptions: List[str]
+    ) -> List[str]:
+        """
+        Create several document requests for a case at once.
+
+        The case is looked up once, all placeholders are written with a single
+        multi-row insert, and one email listing every request is queued.
+
+        Args:
+            case_id: ID of the case
+            requester_id: ID of the requesting user
+            descriptions: Description of each requested document
+
+        Returns:
+            Request IDs in the same order as the descriptions
+        """
+        if not descriptions:
+            raise ValueError("At least one document request is required")
+
+        case = await self.db.get(Case, case_id)
+        if not case:
+            raise ValueError(f"Case {case_id} not found")
+
+        requested_at = datetime.utcnow()
+        request_ids = [str(uuid.uuid4()) for _ in descriptions]
+        # A bulk insert skips Document.__init__, so its JSON defaults are set here
+        await self.db.execute(
+            insert(Document),
+            [
+                {
+                    "case_id": case_id,
+                    "request_id": request_id,
+                    "requested_by": requester_id,
+                    "requested_at": requested_at,
+                    "metadata": {},
+                    "compliance_status": {},
+                    "deepfake_detection_result": {}
+                }
+                for request_id in request_ids
+            ]
+        )
+
+        self.email_service.queue_document_requests(
+            self.db,
+            case_email=case.email,
+            requests=list(zip(request_ids, descriptions))
+        )
+
+        await self.db.commit()
+        return request_ids
+
+    async def get_request(self, request_id: str) -> Optional[Document]:
+        """
+        Load a document request, fulfilled or not.
+
+        The lookup takes no lock and ends its transaction, so no connection
+        is held while the upload is streamed and hashed.
+        """
+        request = await self.db.scalar(select(Document).where(Document.request_id == request_id))
+        await self.db.commit()
+        return request
+
+    def check_resubmission(self, request: Document, file_hash: str) -> None:
+        """
+        Check an upload against a request's existing submission.
+
+        Resubmitting the recorded file is a retry and succeeds without
+        changing anything.
+
+        Raises:
+            DocumentAlreadySubmittedError: If the upload differs from the recorded file
+        """
+        submitted_hash = (request.metadata or {}).get('hash')
+        if submitted_hash != file_hash:
+            raise DocumentAlreadySubmittedError(
+                f"A different document was already submitted for request {request.request_id} "
+                f"(sha256 {submitted_hash})"
+            )
+
+    async def record_submission(self, request_id: str, document: Document) -> bool:
+        """
+        Record a processed upload against its request.
+
+        The request row is locked only for this final check-and-update, which
+        serialises it with concurrent submissions for the same request.
+
+        Returns:
+            True if the submission was recorded, False if an identical file
+            was recorded concurrently
+
+        Raises:
+            DocumentRequestNotFoundError: If the request no longer exists
+            DocumentAlreadySubmittedError: If different content was submitted concurrently
+        """
+        existing_doc = await self.db.scalar(
+            select(Document)
+            .where(Document.request_id == request_id)
+            .with_for_update()
+        )
+        if existing_doc is None:
+            await self.db.commit()
+            raise DocumentRequestNotFoundError(f"Document request {request_id} not found")
+        return await self.process_document_submission(existing_doc, document)
+
+    async def process_document_submission(self, existing_doc: Document, document: Document) -> bool:
+        """
+        Record a document submitted in response to a request.
+
+        Submissions are idempotent on the request and the file's content
+        hash: resubmitting the same bytes leaves the request untouched.
+
+        Args:
+            existing_doc: Placeholder locked by record_submission
+            document: Processed upload
+
+        Returns:
+            True if the submission was recorded, False if it repeated the
+            request's existing submission
+
+        Raises:
+            DocumentAlreadySubmittedError: If different content was already submitted
+        """
+        if existing_doc.storage_path:
+            # Commit to release the row lock either way
+            await self.db.commit()
+            self.check_resubmission(existing_doc, document.metadata.get('hash'))
+            return False
+
+        existing_doc.filename = document.filename
+        existing_doc.file_type = document.file_type
+        existing_doc.file_size = document.file_size
+        existing_doc.storage_path = document.storage_path
+        existing_doc.metadata = document.metadata
+        existing_doc.submitted_by = document.submitted_by
+        existing_doc.submitted_at = datetime.utcnow()
         
-        if existing_doc:
-            existing_doc.filename = document.filename
-            existing_doc.file_type = document.file_type
-            existing_doc.file_size = document.file_size
-            existing_doc.storage_path = document.storage_path
-            existing_doc.metadata = document.metadata
-            existing_doc.submitted_at = datetime.utcnow()
-            
-            self.db.commit()
-
-    async def get_pending_requests(self, case_id: int) -> List[Document]:
-        """Get list of pending document requests for a case."""
-        return self.db.query(Document).filter(
+        await self.db.commit()
+        return True
+
+    async def get_pending_requests(
+        self,
+        case_id: int,
+        cursor: Optional[int] = None,
+        limit: int = 50
+    ) -> Tuple[List[Row], Optional[int]]:
+        """
+        Get a page of pending document requests for a case.
+
+        Only the columns needed for listing are loaded, ordered by ID so the
+        query is served by the ix_documents_pending_requests partial index.
+
+        Args:
+            case_id: ID of the case
+            cursor: ID of the last request on the previous page
+            limit: Maximum number of requests to return
+
+        Returns:
+            Tuple of (requests, cursor for the next page or None)
+        """
+        query = select(
+            Document.id,
+            Document.request_id,
+            Document.requested_by,
+            Document.requested_at
+        ).where(
             Document.case_id == case_id,
             Document.request_id.isnot(None),
             Document.storage_path.is_(None)
-        ).all()
\ No newline at end of file
+        )
+        if cursor is not None:
+            query = query.where(Document.id > cursor)
+
+        # Fetch one extra row to learn whether another page exists
+        rows = (await self.db.execute(query.order_by(Document.id).limit(limit + 1))).all()
+        next_cursor = rows[limit - 1].id if len(rows) > limit else None
+        return rows[:limit], next_cursor
@@ -0,0 +1,169 @@
+from typing import Callable, Optional
+from datetime import datetime, timedelta
+from email.message import Message
+import asyncio
+import time
+import aiosmtplib
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.email import EmailService
+from app.models.email_outbox import EmailOutbox
+
+class SMTPConnection:
+    """A long-lived SMTP connection shared across outbox batches.
+
+    The connection, TLS negotiation and login happen once and are reused
+    until the server drops the connection or it sits idle longer than
+    ``idle_timeout``, after which the next send reconnects.
+    """
+
+    def __init__(
+        self,
+        smtp_settings: dict = settings.SMTP,
+        idle_timeout: float = settings.SMTP_IDLE_TIMEOUT
+    ):
+        self.smtp_settings = smtp_settings
+        self.idle_timeout = idle_timeout
+        self._smtp: Optional[aiosmtplib.SMTP] = None
+        self._last_used = 0.0
+
+    @property
+    def is_idle(self) -> bool:
+        return time.monotonic() - self._last_used > self.idle_timeout
+
+    async def send(self, message: Message) -> None:
+        """Send a message, reconnecting once if the server dropped the connection."""
+        smtp = await self._connection()
+        try:
+            await smtp.send_message(message)
+        except aiosmtplib.SMTPServerDisconnected:
+            await self.close()
+            smtp = await self._connection()
+            await smtp.send_message(message)
+        self._last_used = time.monotonic()
+
+    async def close(self) -> None:
+        """Close the connection if one is open."""
+        smtp, self._smtp = self._smtp, None
+        if smtp is None or not smtp.is_connected:
+            return
+        try:
+            await smtp.quit()
+        except aiosmtplib.SMTPException:
+            smtp.close()
+
+    async def _connection(self) -> aiosmtplib.SMTP:
+        if self._smtp is not None and (not self._smtp.is_connected or self.is_idle):
+            await self.close()
+        if self._smtp is None:
+            smtp = aiosmtplib.SMTP(
+                hostname=self.smtp_settings["host"],
+                port=self.smtp_settings["port"],
+                use_tls=self.smtp_settings["use_tls"]
+            )
+            await smtp.connect()
+            if self.smtp_settings.get("password"):
+                await smtp.login(
+                    self.smtp_settings["username"],
+                    self.smtp_settings["password"]
+                )
+            self._smtp = smtp
+            self._last_used = time.monotonic()
+        return self._smtp
+
+class OutboxSender:
+    """Delivers queued emails from the outbox in batches.
+
+    Each batch claims due messages with ``SELECT ... FOR UPDATE SKIP LOCKED``
+    so several senders can run side by side. Failed messages are retried with
+    exponential backoff and marked failed after ``max_attempts``.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        connection: Optional[SMTPConnection] = None,
+        email_service: Optional[EmailService] = None,
+        batch_size: int = settings.EMAIL_OUTBOX_BATCH_SIZE,
+        max_attempts: int = settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        retry_backoff: float = settings.EMAIL_OUTBOX_RETRY_BACKOFF,
+        poll_interval: float = settings.EMAIL_OUTBOX_POLL_INTERVAL
+    ):
+        if session_factory is None:
+            from app.db.session import AsyncSessionLocal
+
+            session_factory = AsyncSessionLocal
+        self.session_factory = session_factory
+        self.email_service = email_service or EmailService()
+        self.connection = connection or SMTPConnection(self.email_service.smtp_settings)
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.poll_interval = poll_interval
+
+    async def send_pending(self) -> int:
+        """
+        Send one batch of due messages.
+
+        Returns:
+            Number of messages attempted
+        """
+        now = datetime.utcnow()
+        async with self.session_factory() as db:
+            messages = (await db.scalars(
+                select(EmailOutbox)
+                .where(
+                    EmailOutbox.status == EmailOutbox.PENDING,
+                    EmailOutbox.next_attempt_at <= now
+                )
+                .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )).all()
+
+            for message in messages:
+                message.attempts += 1
+                try:
+                    await self.connection.send(self.email_service.build_message(
+                        message.to_email, message.subject, message.body
+                    ))
+                except (aiosmtplib.SMTPException, OSError) as e:
+                    self._record_failure(message, e, now)
+                else:
+                    message.status = EmailOutbox.SENT
+                    message.sent_at = datetime.utcnow()
+                    message.last_error = None
+
+            await db.commit()
+        return len(messages)
+
+    def _record_failure(self, message: EmailOutbox, error: Exception, now: datetime) -> None:
+        message.last_error = str(error)
+        if message.attempts >= self.max_attempts:
+            message.status = EmailOutbox.FAILED
+        else:
+            delay = self.retry_backoff * 2 ** (message.attempts - 1)
+            message.next_attempt_at = now + timedelta(seconds=delay)
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Send batches until ``stop`` is set, polling while the outbox is empty."""
+        stop = stop or asyncio.Event()
+        try:
+            while not stop.is_set():
+                if await self.send_pending() == self.batch_size:
+                    continue
+                if self.connection.is_idle:
+                    await self.connection.close()
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self.connection.close()
+
+def main() -> None:
+    asyncio.run(OutboxSender().run())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+from typing import Callable, Optional, Tuple
+from dataclasses import asdict, dataclass, field
+import argparse
+import asyncio
+import json
+import time
+from sqlalchemy import case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.document import Document
+from app.services.storage import StorageBackend, get_storage_backend
+
+# Number of documents verified and updated per transaction
+VERIFICATION_BATCH_SIZE = 500
+
+# Storage key holding the position of an interrupted run
+CHECKPOINT_KEY = "jobs/integrity_verification.json"
+
+@dataclass
+class VerificationProgress:
+    """Progress of an integrity verification run."""
+
+    last_id: int = 0
+    processed: int = 0
+    verified: int = 0
+    mismatched: int = 0
+    missing: int = 0
+    failed: int = 0
+    total: Optional[int] = None
+    started_at: float = field(default_factory=time.time)
+
+    @property
+    def percent_complete(self) -> Optional[float]:
+        if not self.total:
+            return None
+        return min(100.0, 100.0 * self.processed / self.total)
+
+    @property
+    def documents_per_second(self) -> float:
+        elapsed = time.time() - self.started_at
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+class IntegrityVerifier:
+    """Re-hashes stored documents and records whether they match their upload hash.
+
+    Documents are walked in primary key order with keyset pagination, so a
+    run costs one indexed range query per batch regardless of archive size.
+    Each batch is hashed concurrently, written back with a single UPDATE and
+    committed, and the run's position is checkpointed in storage so an
+    interrupted run resumes where it stopped.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        storage: Optional[StorageBackend] = None,
+        batch_size: int = VERIFICATION_BATCH_SIZE,
+        max_workers: int = 4,
+        max_documents_per_second: Optional[float] = None,
+        checkpoint_key: str = CHECKPOINT_KEY
+    ):
+        self.db = db
+        self.storage = storage or get_storage_backend()
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.max_documents_per_second = max_documents_per_second
+        self.checkpoint_key = checkpoint_key
+
+    async def run(
+        self,
+        resume: bool = True,
+        on_progress: Optional[Callable[[VerificationProgress], None]] = None
+    ) -> VerificationProgress:
+        """
+        Verify every stored document.
+
+        Args:
+            resume: Continue from the last checkpoint if one exists
+            on_progress: Called with the run's progress after each batch
+
+        Returns:
+            Final progress of the run
+        """
+        progress = await self._load_checkpoint() if resume else None
+        if progress is None:
+            progress = VerificationProgress()
+        # Pending request placeholders have no stored file yet
+        progress.total = await self.db.scalar(
+            select(func.count(Document.id)).where(Document.storage_path.isnot(None))
+        )
+        # Hashing runs in worker threads; the semaphore bounds how many at once
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        while True:
+            batch_started = time.monotonic()
+            # Declarative classes reserve ``metadata``, so select the column from the table
+            rows = (await self.db.execute(
+                select(Document.id, Document.storage_path, Document.__table__.c.metadata)
+                .where(Document.id > progress.last_id, Document.storage_path.isnot(None))
+                .order_by(Document.id)
+                .limit(self.batch_size)
+            )).all()
+            if not rows:
+                break
+
+            # A document that cannot be checked is recorded as failed rather
+            # than aborting the run
+            results = await asyncio.gather(*(
+                self._verify(semaphore, storage_path, metadata)
+                for _, storage_path, metadata in rows
+            ), return_exceptions=True)
+            failed = sum(1 for result in results if isinstance(result, Exception))
+            results = [(False, False) if isinstance(result, Exception) else result for result in results]
+            verified_ids = [row[0] for row, (matched, _) in zip(rows, results) if matched]
+
+            await self.db.execute(
+                update(Document)
+                .where(Document.id.in_([row[0] for row in rows]))
+                .values(integrity_verified=case(
+                    (Document.id.in_(verified_ids), True),
+                    else_=False
+                ))
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.commit()
+
+            progress.last_id = rows[-1][0]
+            progress.processed += len(rows)
+            progress.verified += len(verified_ids)
+            progress.missing += sum(1 for _, missing in results if missing)
+            progress.failed += failed
+            progress.mismatched += sum(1 for matched, missing in results if not matched and not missing) - failed
+            await self._save_checkpoint(progress)
+            if on_progress:
+                on_progress(progress)
+
+            await self._throttle(len(rows), time.monotonic() - batch_started)
+
+        await self._clear_checkpoint()
+        return progress
+
+    async def _verify(
+        self,
+        semaphore: asyncio.Semaphore,
+        storage_path: str,
+        metadata: Optional[dict]
+    ) -> Tuple[bool, bool]:
+        """Return (hash matches, blob missing) for one document."""
+        expected = (metadata or {}).get('hash')
+        async with semaphore:
+            if not await self.storage.exists(storage_path):
+                return False, True
+            if not expected:
+                return False, False
+            return await self.storage.sha256(storage_path) == expected, False
+
+    async def _throttle(self, count: int, elapsed: float) -> None:
+        if not self.max_documents_per_second:
+            return
+        remaining = count / self.max_documents_per_second - elapsed
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+
+    async def _load_checkpoint(self) -> Optional[VerificationProgress]:
+        if not await self.storage.exists(self.checkpoint_key):
+            return None
+        data = b"".join([chunk async for chunk in self.storage.read_range(self.checkpoint_key)])
+        return VerificationProgress(**json.loads(data))
+
+    async def _save_checkpoint(self, progress: VerificationProgress) -> None:
+        async def chunks():
+            yield json.dumps(asdict(progress)).encode()
+
+        await self.storage.write_stream(self.checkpoint_key, chunks())
+
+    async def _clear_checkpoint(self) -> None:
+        if await self.storage.exists(self.checkpoint_key):
+            await self.storage.delete(self.checkpoint_key)
+
+def _print_progress(progress: VerificationProgress) -> None:
+    percent = progress.percent_complete
+    print(
+        f"{progress.processed}/{progress.total} documents"
+        f"{f' ({percent:.1f}%)' if percent is not None else ''}, "
+        f"{progress.verified} verified, {progress.mismatched} mismatched, "
+        f"{progress.missing} missing, {progress.failed} failed, "
+        f"{progress.documents_per_second:.1f} docs/s"
+    )
+
+async def _run_verification(
+    batch_size: int,
+    max_workers: int,
+    max_documents_per_second: Optional[float],
+    resume: bool
+) -> VerificationProgress:
+    from app.db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        verifier = IntegrityVerifier(
+            db,
+            batch_size=batch_size,
+            max_workers=max_workers,
+            max_documents_per_second=max_documents_per_second
+        )
+        return await verifier.run(resume=resume, on_progress=_print_progress)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-hash stored documents and record integrity.")
+    parser.add_argument("--batch-size", type=int, default=VERIFICATION_BATCH_SIZE,
+                        help="Documents verified per transaction")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="Maximum documents hashed concurrently")
+    parser.add_argument("--max-rate", type=float, default=None,
+                        help="Maximum documents verified per second")
+    parser.add_argument("--restart", action="store_true",
+                        help="Ignore any checkpoint and verify from the first document")
+    args = parser.parse_args()
+
+    progress = asyncio.run(_run_verification(
+        args.batch_size, args.workers, args.max_rate, resume=not args.restart
+    ))
+
+    print(
+        f"Verified {progress.verified} of {progress.processed} documents "
+        f"({progress.mismatched} mismatched, {progress.missing} missing)"
+    )
+
+if __name__ == "__main__":
+    main()
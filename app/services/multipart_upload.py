@@ -0,0 +1,147 @@
+from typing import AsyncIterator, Dict, Optional
+from multipart.multipart import MultipartParser, parse_options_header
+from app.core.config import settings
+from app.services.document_processor import FileTooLargeError
+
+class MultipartUploadError(ValueError):
+    """Raised when a request body is not a valid multipart upload."""
+
+class MultipartUpload:
+    """A file field read straight from a multipart/form-data request body.
+
+    Unlike ``UploadFile``, the body is not received and spooled before the
+    endpoint runs: each ``read`` pulls only as much of the body from the
+    client as it needs, so a consumer that rejects an upload stops it
+    mid-transfer, and the file passes through the application once.
+    Parts other than the file field are discarded as they arrive.
+    """
+
+    def __init__(
+        self,
+        content_type: str,
+        body: AsyncIterator[bytes],
+        field_name: str = "file",
+        max_body_size: int = settings.MAX_UPLOAD_SIZE + settings.MULTIPART_OVERHEAD
+    ):
+        media_type, params = parse_options_header(content_type)
+        boundary = params.get(b"boundary")
+        if media_type != b"multipart/form-data" or not boundary:
+            raise MultipartUploadError("Expected a multipart/form-data request with a boundary")
+
+        self.filename: Optional[str] = None
+        self.field_name = field_name
+        self.max_body_size = max_body_size
+        self._body = body
+        self._received = 0
+        self._body_done = False
+        self._pending = bytearray()
+        self._in_file = False
+        self._file_done = False
+        self._header_field = bytearray()
+        self._header_value = bytearray()
+        self._headers: Dict[bytes, bytes] = {}
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end
+        })
+
+    @classmethod
+    async def open(
+        cls,
+        content_type: str,
+        body: AsyncIterator[bytes],
+        field_name: str = "file",
+        **kwargs
+    ) -> "MultipartUpload":
+        """
+        Start reading an upload and position it at the file field's content.
+
+        Args:
+            content_type: The request's Content-Type header
+            body: The request body, e.g. ``request.stream()``
+            field_name: Name of the form field holding the file
+
+        Raises:
+            MultipartUploadError: If the body is not multipart or has no such file field
+        """
+        upload = cls(content_type, body, field_name, **kwargs)
+        while upload.filename is None:
+            if not await upload._feed():
+                raise MultipartUploadError(f"No file was uploaded in field '{field_name}'")
+        return upload
+
+    async def read(self, size: int = -1) -> bytes:
+        """Read up to ``size`` bytes of the file, or the rest of it; empty at the end."""
+        while not self._file_done and (size < 0 or len(self._pending) < size):
+            if not await self._feed():
+                break
+        if size < 0 or size >= len(self._pending):
+            data = bytes(self._pending)
+            self._pending.clear()
+        else:
+            data = bytes(self._pending[:size])
+            del self._pending[:size]
+        return data
+
+    async def _feed(self) -> bool:
+        """Parse the next chunk of the body; False once the body is exhausted."""
+        if self._body_done:
+            return False
+        try:
+            chunk = await self._body.__anext__()
+        except StopAsyncIteration:
+            self._body_done = True
+            self._parser.finalize()
+            if self._in_file:
+                raise MultipartUploadError("Upload ended before the file was complete")
+            return False
+
+        self._received += len(chunk)
+        if self._received > self.max_body_size:
+            raise FileTooLargeError(
+                f"File size exceeds maximum limit of {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB"
+            )
+        try:
+            self._parser.write(chunk)
+        except Exception as e:
+            raise MultipartUploadError(f"Malformed multipart body: {e}")
+        return True
+
+    # Parser callbacks
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[bytes(self._header_field).lower()] = bytes(self._header_value)
+        self._header_field.clear()
+        self._header_value.clear()
+
+    def _on_headers_finished(self) -> None:
+        if self.filename is not None:
+            return
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("latin-1")
+        filename = options.get(b"filename")
+        if name == self.field_name and filename is not None:
+            self.filename = filename.decode("utf-8", errors="replace")
+            self._in_file = True
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file:
+            self._pending += data[start:end]
+
+    def _on_part_end(self) -> None:
+        if self._in_file:
+            self._in_file = False
+            self._file_done = True
@@ -0,0 +1,403 @@
+from typing import AsyncIterable, AsyncIterator, List, Optional, Tuple
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import asyncio
+import hashlib
+import mmap
+import os
+import aiofiles
+import aiofiles.os
+from app.core.config import settings
+
+class RangeNotSatisfiableError(ValueError):
+    """Raised when a requested byte range lies outside an object."""
+
+def parse_byte_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse an HTTP ``Range`` header for an object of ``size`` bytes.
+
+    Only single byte ranges are served. A missing or malformed header, or one
+    asking for several ranges, yields None and the whole object is served,
+    as RFC 9110 allows.
+
+    Returns:
+        Tuple of (start, end) with ``end`` exclusive, or None
+
+    Raises:
+        RangeNotSatisfiableError: If the range starts beyond the object
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, separator, last = spec.strip().partition("-")
+    if not separator or not (first or last) or not all(part.isdigit() for part in (first, last) if part):
+        return None
+
+    if not first:
+        # Suffix range: the last N bytes
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise RangeNotSatisfiableError(f"Range {header} not satisfiable for {size} bytes")
+        return max(0, size - suffix), size
+
+    start = int(first)
+    end = int(last) + 1 if last else size
+    if last and end <= start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiableError(f"Range {header} not satisfiable for {size} bytes")
+    return start, min(end, size)
+
+@dataclass
+class StoredObject:
+    key: str
+    size: int
+    last_modified: datetime
+
+class StorageBackend(ABC):
+    """Object storage addressed by slash-separated keys."""
+
+    @abstractmethod
+    async def write_stream(self, key: str, chunks: AsyncIterable[bytes]) -> int:
+        """Write an object from a stream of chunks and return its size."""
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        """Check whether an object exists."""
+
+    @abstractmethod
+    async def stat(self, key: str) -> StoredObject:
+        """Get an object's size and modification time."""
+
+    @abstractmethod
+    def read_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = settings.UPLOAD_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Stream bytes ``start`` to ``end`` (exclusive) of an object."""
+
+    @abstractmethod
+    async def move(self, source_key: str, target_key: str) -> None:
+        """Move an object to a new key, replacing any existing object."""
+
+    @abstractmethod
+    async def touch(self, key: str) -> None:
+        """Refresh an object's modification time."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Delete an object."""
+
+    @abstractmethod
+    def list_objects(self, prefix: str) -> AsyncIterator[StoredObject]:
+        """Iterate over the objects whose key starts with ``prefix``.
+
+        Objects are listed a page or directory at a time, so the listing
+        is never held in memory as a whole.
+        """
+
+    async def sha256(self, key: str) -> str:
+        """Compute the SHA-256 hex digest of an object by streaming it."""
+        hasher = hashlib.sha256()
+        async for chunk in self.read_range(key):
+            hasher.update(chunk)
+        return hasher.hexdigest()
+
+    async def presigned_url(
+        self,
+        key: str,
+        expires_in: int = settings.PRESIGNED_URL_EXPIRY,
+        filename: Optional[str] = None
+    ) -> Optional[str]:
+        """Get a time-limited download URL, if the backend supports one."""
+        return None
+
+    def local_path(self, key: str) -> Optional[str]:
+        """Get the local filesystem path of an object, if it has one."""
+        return None
+
+class LocalStorageBackend(StorageBackend):
+    """Stores objects as files under a root directory."""
+
+    def __init__(self, root: str = settings.DOCUMENT_STORAGE_PATH):
+        self.root = root
+
+    def local_path(self, key: str) -> str:
+        if os.path.isabs(key):
+            # Documents stored before storage keys were introduced hold the
+            # absolute path of their file, which still lives under the root
+            root = os.path.abspath(self.root)
+            path = os.path.abspath(key)
+            if os.path.commonpath([root, path]) != root:
+                raise ValueError(f"Path {key} is outside the storage root {self.root}")
+            return path
+        return os.path.join(self.root, *key.split("/"))
+
+    async def write_stream(self, key: str, chunks: AsyncIterable[bytes]) -> int:
+        path = self.local_path(key)
+        await aiofiles.os.makedirs(os.path.dirname(path), exist_ok=True)
+        size = 0
+        try:
+            async with aiofiles.open(path, 'wb') as f:
+                async for chunk in chunks:
+                    await f.write(chunk)
+                    size += len(chunk)
+        except BaseException:
+            if os.path.exists(path):
+                await aiofiles.os.remove(path)
+            raise
+        return size
+
+    async def exists(self, key: str) -> bool:
+        return await aiofiles.os.path.exists(self.local_path(key))
+
+    async def stat(self, key: str) -> StoredObject:
+        result = await aiofiles.os.stat(self.local_path(key))
+        return StoredObject(
+            key=key,
+            size=result.st_size,
+            last_modified=datetime.fromtimestamp(result.st_mtime, tz=timezone.utc)
+        )
+
+    async def read_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = settings.UPLOAD_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        async with aiofiles.open(self.local_path(key), 'rb') as f:
+            await f.seek(start)
+            remaining = None if end is None else end - start
+            while remaining is None or remaining > 0:
+                chunk = await f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    async def sha256(self, key: str) -> str:
+        # Hash a memory map of the file in a worker thread: pages are read on
+        # demand by the kernel and no file content is copied into Python
+        return await asyncio.to_thread(self._sha256_file, self.local_path(key))
+
+    def _sha256_file(self, path: str) -> str:
+        hasher = hashlib.sha256()
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    hasher.update(mapped)
+        return hasher.hexdigest()
+
+    async def move(self, source_key: str, target_key: str) -> None:
+        target_path = self.local_path(target_key)
+        await aiofiles.os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        await aiofiles.os.replace(self.local_path(source_key), target_path)
+
+    async def touch(self, key: str) -> None:
+        await asyncio.to_thread(os.utime, self.local_path(key))
+
+    async def delete(self, key: str) -> None:
+        await aiofiles.os.remove(self.local_path(key))
+
+    async def list_objects(self, prefix: str) -> AsyncIterator[StoredObject]:
+        directories = os.walk(self.local_path(prefix))
+        while (directory := await asyncio.to_thread(next, directories, None)) is not None:
+            dirpath, _, filenames = directory
+            for stored in await asyncio.to_thread(self._stat_files, dirpath, filenames):
+                yield stored
+
+    def _stat_files(self, dirpath: str, filenames: List[str]) -> List[StoredObject]:
+        objects = []
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            try:
+                result = os.stat(path)
+            except FileNotFoundError:
+                # Deleted or moved since the directory was read
+                continue
+            objects.append(StoredObject(
+                key=os.path.relpath(path, self.root).replace(os.sep, "/"),
+                size=result.st_size,
+                last_modified=datetime.fromtimestamp(result.st_mtime, tz=timezone.utc)
+            ))
+        return objects
+
+class S3StorageBackend(StorageBackend):
+    """Stores objects in an S3-compatible bucket (AWS S3, MinIO, ...)."""
+
+    # S3 requires every multipart part except the last to be at least 5MB
+    MIN_PART_SIZE = 5 * 1024 * 1024
+
+    def __init__(
+        self,
+        bucket: str = settings.S3_BUCKET,
+        client=None,
+        part_size: int = settings.S3_MULTIPART_PART_SIZE
+    ):
+        if client is None:
+            import boto3
+
+            client = boto3.client(
+                "s3",
+                endpoint_url=settings.S3_ENDPOINT_URL,
+                region_name=settings.S3_REGION,
+                aws_access_key_id=settings.S3_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.S3_SECRET_ACCESS_KEY
+            )
+        self.bucket = bucket
+        self.client = client
+        self.part_size = max(part_size, self.MIN_PART_SIZE)
+
+    async def write_stream(self, key: str, chunks: AsyncIterable[bytes]) -> int:
+        upload = await asyncio.to_thread(
+            self.client.create_multipart_upload, Bucket=self.bucket, Key=key
+        )
+        upload_id = upload["UploadId"]
+        parts = []
+        buffer = bytearray()
+        size = 0
+
+        async def upload_part(data: bytes) -> None:
+            part_number = len(parts) + 1
+            response = await asyncio.to_thread(
+                self.client.upload_part,
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=data
+            )
+            parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                size += len(chunk)
+                if len(buffer) >= self.part_size:
+                    await upload_part(bytes(buffer))
+                    buffer.clear()
+            if buffer or not parts:
+                await upload_part(bytes(buffer))
+
+            await asyncio.to_thread(
+                self.client.complete_multipart_upload,
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts}
+            )
+        except BaseException:
+            await asyncio.to_thread(
+                self.client.abort_multipart_upload,
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id
+            )
+            raise
+        return size
+
+    async def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            await asyncio.to_thread(self.client.head_object, Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    async def stat(self, key: str) -> StoredObject:
+        response = await asyncio.to_thread(self.client.head_object, Bucket=self.bucket, Key=key)
+        return StoredObject(
+            key=key,
+            size=response["ContentLength"],
+            last_modified=response["LastModified"]
+        )
+
+    async def read_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = settings.UPLOAD_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        if end is not None and end <= start:
+            return
+        params = {"Bucket": self.bucket, "Key": key}
+        # A Range header is invalid for empty objects, so only send one when needed
+        if start or end is not None:
+            params["Range"] = f"bytes={start}-{'' if end is None else end - 1}"
+        response = await asyncio.to_thread(self.client.get_object, **params)
+        body = response["Body"]
+        try:
+            while chunk := await asyncio.to_thread(body.read, chunk_size):
+                yield chunk
+        finally:
+            body.close()
+
+    async def move(self, source_key: str, target_key: str) -> None:
+        await asyncio.to_thread(
+            self.client.copy_object,
+            Bucket=self.bucket,
+            Key=target_key,
+            CopySource={"Bucket": self.bucket, "Key": source_key}
+        )
+        await self.delete(source_key)
+
+    async def touch(self, key: str) -> None:
+        # Copying an object onto itself requires replacing its metadata
+        await asyncio.to_thread(
+            self.client.copy_object,
+            Bucket=self.bucket,
+            Key=key,
+            CopySource={"Bucket": self.bucket, "Key": key},
+            MetadataDirective="REPLACE"
+        )
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=key)
+
+    async def list_objects(self, prefix: str) -> AsyncIterator[StoredObject]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        pages = iter(paginator.paginate(Bucket=self.bucket, Prefix=prefix))
+        # Each page is a separate request, fetched only once the previous one is consumed
+        while (page := await asyncio.to_thread(next, pages, None)) is not None:
+            for item in page.get("Contents", []):
+                yield StoredObject(
+                    key=item["Key"],
+                    size=item["Size"],
+                    last_modified=item["LastModified"]
+                )
+
+    async def presigned_url(
+        self,
+        key: str,
+        expires_in: int = settings.PRESIGNED_URL_EXPIRY,
+        filename: Optional[str] = None
+    ) -> str:
+        params = {"Bucket": self.bucket, "Key": key}
+        if filename:
+            params["ResponseContentDisposition"] = f'attachment; filename="{filename}"'
+        return await asyncio.to_thread(
+            self.client.generate_presigned_url,
+            "get_object",
+            Params=params,
+            ExpiresIn=expires_in
+        )
+
+def get_storage_backend() -> StorageBackend:
+    """Create the storage backend selected by ``settings.STORAGE_BACKEND``."""
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorageBackend(settings.DOCUMENT_STORAGE_PATH)
+    if settings.STORAGE_BACKEND == "s3":
+        return S3StorageBackend(settings.S3_BUCKET)
+    raise ValueError(f"Unknown storage backend: {settings.STORAGE_BACKEND}")
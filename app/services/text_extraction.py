@@ -0,0 +1,209 @@
+from typing import Iterator, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from bisect import bisect_right
+import asyncio
+import json
+import os
+import tempfile
+import zipfile
+from xml.etree.ElementTree import iterparse
+import aiofiles
+from app.models.document import Document
+from app.core.config import settings
+from app.services.storage import StorageBackend, get_storage_backend
+
+PDF_MIME_TYPE = "application/pdf"
+DOCX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+SUPPORTED_MIME_TYPES = (PDF_MIME_TYPE, DOCX_MIME_TYPE)
+
+# Extracted text is cached in storage under this prefix, keyed on content hash
+TEXT_CACHE_PREFIX = "text/"
+
+WORDPROCESSING_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+@dataclass
+class ExtractedText:
+    """Plain text of a document with the character offset where each page starts."""
+
+    text: str
+    page_offsets: List[int]
+
+    @property
+    def page_count(self) -> int:
+        return len(self.page_offsets)
+
+    def page_for_offset(self, offset: int) -> int:
+        """Get the 1-based page number containing a character offset."""
+        return max(bisect_right(self.page_offsets, offset), 1)
+
+    def page_text(self, page_number: int) -> str:
+        """Get the text of a 1-based page."""
+        start = self.page_offsets[page_number - 1]
+        end = self.page_offsets[page_number] if page_number < self.page_count else len(self.text)
+        return self.text[start:end]
+
+def iter_pdf_pages(path: str) -> Iterator[str]:
+    """Lazily yield the text of each page of a PDF."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    for page in reader.pages:
+        yield page.extract_text() or ""
+
+def iter_docx_pages(path: str) -> Iterator[str]:
+    """
+    Lazily yield the text of each page of a DOCX file.
+
+    DOCX files have no fixed pagination, so pages are split at explicit page
+    breaks and at the page breaks Word recorded when the file was last saved.
+    """
+    with zipfile.ZipFile(path) as archive, archive.open("word/document.xml") as xml:
+        paragraphs = []
+        runs = []
+        # Word follows an explicit page break with a lastRenderedPageBreak at
+        # the start of the next page; that second marker must not start
+        # another, empty page
+        after_explicit_break = False
+        for event, element in iterparse(xml, events=("start", "end")):
+            tag = element.tag
+            if event == "start":
+                is_explicit_break = (
+                    tag == f"{WORDPROCESSING_NS}br"
+                    and element.get(f"{WORDPROCESSING_NS}type") == "page"
+                )
+                is_rendered_break = tag == f"{WORDPROCESSING_NS}lastRenderedPageBreak"
+                if is_rendered_break and after_explicit_break:
+                    continue
+                if (is_explicit_break or is_rendered_break) and (paragraphs or runs):
+                    paragraphs.append("".join(runs))
+                    yield "\n".join(paragraphs)
+                    paragraphs, runs = [], []
+                    after_explicit_break = is_explicit_break
+                continue
+
+            if tag == f"{WORDPROCESSING_NS}t":
+                runs.append(element.text or "")
+                if element.text:
+                    after_explicit_break = False
+            elif tag == f"{WORDPROCESSING_NS}tab":
+                runs.append("\t")
+                after_explicit_break = False
+            elif tag == f"{WORDPROCESSING_NS}p":
+                paragraphs.append("".join(runs))
+                runs = []
+                # Free parsed paragraphs so memory stays flat for large files
+                element.clear()
+
+        if paragraphs or runs:
+            paragraphs.append("".join(runs))
+            yield "\n".join(paragraphs)
+
+def iter_pages(path: str, mime_type: str) -> Iterator[str]:
+    """Lazily yield the text of each page of a supported document."""
+    if mime_type == PDF_MIME_TYPE:
+        return iter_pdf_pages(path)
+    if mime_type == DOCX_MIME_TYPE:
+        return iter_docx_pages(path)
+    raise ValueError(f"Text extraction not supported for {mime_type}")
+
+def extract_text_from_file(path: str, mime_type: str) -> ExtractedText:
+    """Extract a document's text and page-offset index from a local file."""
+    parts = []
+    page_offsets = []
+    offset = 0
+    for page_text in iter_pages(path, mime_type):
+        page_offsets.append(offset)
+        parts.append(page_text)
+        offset += len(page_text) + 1
+    return ExtractedText(text="\n".join(parts), page_offsets=page_offsets)
+
+class TextExtractor:
+    """Extracts text from stored PDF and DOCX documents.
+
+    Results are cached in storage by content hash, so identical files are
+    only ever extracted once. Files larger than ``process_pool_threshold``
+    are parsed in a process pool to keep CPU-heavy PDF parsing off the
+    event loop's interpreter.
+    """
+
+    _process_pool: Optional[ProcessPoolExecutor] = None
+
+    def __init__(
+        self,
+        storage: Optional[StorageBackend] = None,
+        process_pool_threshold: int = settings.TEXT_EXTRACTION_PROCESS_POOL_THRESHOLD,
+        max_workers: int = settings.TEXT_EXTRACTION_WORKERS
+    ):
+        self.storage = storage or get_storage_backend()
+        self.process_pool_threshold = process_pool_threshold
+        self.max_workers = max_workers
+
+    @classmethod
+    def _get_process_pool(cls, max_workers: int) -> ProcessPoolExecutor:
+        if cls._process_pool is None:
+            cls._process_pool = ProcessPoolExecutor(max_workers=max_workers)
+        return cls._process_pool
+
+    def supports(self, document: Document) -> bool:
+        """Check whether text can be extracted from a document."""
+        return document.file_type in SUPPORTED_MIME_TYPES
+
+    async def extract(self, document: Document) -> ExtractedText:
+        """
+        Extract a stored document's text and page-offset index.
+
+        Args:
+            document: Stored PDF or DOCX document
+
+        Returns:
+            Extracted text with page offsets
+        """
+        if not self.supports(document):
+            raise ValueError(f"Text extraction not supported for {document.file_type}")
+
+        file_hash = (document.metadata or {}).get('hash') or await self.storage.sha256(document.storage_path)
+        cache_key = f"{TEXT_CACHE_PREFIX}{file_hash}.json"
+
+        if await self.storage.exists(cache_key):
+            cached = b"".join([chunk async for chunk in self.storage.read_range(cache_key)])
+            return ExtractedText(**json.loads(cached))
+
+        async with self._local_file(document.storage_path) as (path, size):
+            if size > self.process_pool_threshold:
+                loop = asyncio.get_running_loop()
+                extracted = await loop.run_in_executor(
+                    self._get_process_pool(self.max_workers),
+                    extract_text_from_file,
+                    path,
+                    document.file_type
+                )
+            else:
+                extracted = await asyncio.to_thread(extract_text_from_file, path, document.file_type)
+
+        async def cache_chunks():
+            yield json.dumps(asdict(extracted)).encode()
+
+        await self.storage.write_stream(cache_key, cache_chunks())
+        return extracted
+
+    @asynccontextmanager
+    async def _local_file(self, key: str):
+        """Yield a local path and size for a stored object, downloading it if needed."""
+        local_path = self.storage.local_path(key)
+        if local_path:
+            yield local_path, os.path.getsize(local_path)
+            return
+
+        fd, temp_path = tempfile.mkstemp(suffix=".download")
+        os.close(fd)
+        try:
+            size = 0
+            async with aiofiles.open(temp_path, 'wb') as f:
+                async for chunk in self.storage.read_range(key):
+                    await f.write(chunk)
+                    size += len(chunk)
+            yield temp_path, size
+        finally:
+            os.remove(temp_path)
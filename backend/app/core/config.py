@@ -42,6 +42,12 @@ class Settings(BaseSettings):
 
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
 
+    def get_database_url(self) -> str:
+        return self.SQLALCHEMY_DATABASE_URI or (
+            f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+            f"@{self.POSTGRES_SERVER}/{self.POSTGRES_DB}"
+        )
+
     def get_mongodb_url(self) -> str:
         return f"{self.MONGODB_URL}/{self.MONGODB_DB}"
 
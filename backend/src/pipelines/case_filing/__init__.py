@@ -1,4 +1,5 @@
-from .models import Case
-from .services import CaseFilingService
+from .models import Case, CaseNumberCounter
+from .services import CaseFilingService, CaseNumberAllocator
+from .importer import CaseImportService
 
-__all__ = ['Case', 'CaseFilingService']
\ No newline at end of file
+__all__ = ['Case', 'CaseNumberCounter', 'CaseFilingService', 'CaseNumberAllocator', 'CaseImportService']
\ No newline at end of file
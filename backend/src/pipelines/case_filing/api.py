@@ -0,0 +1,62 @@
+import io
+from typing import Generator, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from .importer import CaseImportService
+
+router = APIRouter()
+
+_session_factory: Optional[sessionmaker] = None
+
+def get_db() -> Generator[Session, None, None]:
+    """Get database session."""
+    global _session_factory
+    if _session_factory is None:
+        from backend.app.core.config import settings
+
+        _session_factory = sessionmaker(bind=create_engine(settings.get_database_url()))
+    with _session_factory() as session:
+        yield session
+
+def get_current_superuser():
+    """Get the authenticated superuser allowed to import cases.
+
+    The application including this router overrides this dependency with
+    its own authentication, e.g. ``app.api.deps.get_current_superuser``.
+    Until it does, every import request is refused.
+    """
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Not authenticated"
+    )
+
+@router.post("/cases/import")
+def import_cases(
+    file: UploadFile = File(...),
+    file_format: Optional[str] = Query(None, alias="format", pattern="^(csv|jsonl)$"),
+    session: Session = Depends(get_db),
+    current_user=Depends(get_current_superuser)
+):
+    """Import cases from an uploaded CSV or JSONL file.
+
+    Only superusers and admins may import. The upload is read line by
+    line, so large files are imported in constant memory. Rows that fail
+    are reported with their line number.
+    """
+    if file_format is None:
+        file_format = "jsonl" if (file.filename or "").endswith(".jsonl") else "csv"
+
+    stream = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    try:
+        result = CaseImportService(session).import_file(stream, file_format)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Import file must be UTF-8 encoded")
+    finally:
+        stream.detach()
+
+    return {
+        "imported": result.imported,
+        "failed": result.failed,
+        "errors": [{"line": error.line, "message": error.message} for error in result.errors]
+    }
@@ -0,0 +1,174 @@
+"""Bulk import of legacy cases from CSV or JSONL.
+
+Usage (from the repository root):
+    python -m backend.src.pipelines.case_filing.importer cases.csv --database-url postgresql://...
+"""
+
+import argparse
+import csv
+import datetime
+import itertools
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from sqlalchemy import create_engine, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+from .models import Case
+from .services import CaseFilingService, CaseNumberAllocator
+
+CASE_STATUSES = ('DRAFT', 'ACTIVE', 'CLOSED')
+
+# Rows inserted and committed per transaction
+IMPORT_BATCH_SIZE = 500
+
+# Per-row errors kept in the result; further errors are only counted
+MAX_REPORTED_ERRORS = 1000
+
+@dataclass
+class CaseImportError:
+    line: int
+    message: str
+
+@dataclass
+class CaseImportResult:
+    imported: int = 0
+    failed: int = 0
+    errors: List[CaseImportError] = field(default_factory=list)
+
+    def add_error(self, line: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(CaseImportError(line, message))
+
+def iter_records(stream: TextIO, file_format: str) -> Iterator[Tuple[int, Any]]:
+    """Yield (line number, record) pairs from a CSV or JSONL stream.
+
+    Records that cannot be parsed are yielded as the exception raised.
+    """
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+    elif file_format == 'jsonl':
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, ValueError(f'Invalid JSON: {e.msg}')
+    else:
+        raise ValueError(f'Unsupported import format: {file_format}')
+
+def parse_case(record: Any) -> Dict[str, Any]:
+    """Validate an import record and convert it to Case column values."""
+    if isinstance(record, Exception):
+        raise record
+    if not isinstance(record, dict):
+        raise ValueError('Record must be an object')
+
+    status = record.get('status') or 'DRAFT'
+    if not isinstance(status, str):
+        raise ValueError(f'Invalid status: {status!r}')
+    status = status.upper()
+    if status not in CASE_STATUSES:
+        raise ValueError(f'Invalid status: {status}')
+
+    now = datetime.datetime.now()
+    created_at = record.get('created_at')
+    if created_at:
+        if not isinstance(created_at, str):
+            raise ValueError(f'Invalid created_at: {created_at!r}')
+        try:
+            created_at = datetime.datetime.fromisoformat(created_at)
+        except (TypeError, ValueError):
+            raise ValueError(f'Invalid created_at: {created_at}')
+
+    return {
+        'status': status,
+        'created_at': created_at or now,
+        'updated_at': now
+    }
+
+class CaseImportService:
+    """Imports cases in batched transactions without loading the whole input.
+
+    Case numbers and emails for each batch come from a single block
+    allocation. Invalid rows are reported and skipped; a row rejected by the
+    database only fails itself, not the rest of its batch.
+    """
+
+    def __init__(
+        self,
+        session,
+        allocator: Optional[CaseNumberAllocator] = None,
+        batch_size: int = IMPORT_BATCH_SIZE
+    ):
+        self.session = session
+        self.filing_service = CaseFilingService(session, allocator)
+        self.batch_size = batch_size
+
+    def import_file(self, stream: TextIO, file_format: str) -> CaseImportResult:
+        return self.import_records(iter_records(stream, file_format))
+
+    def import_records(self, records: Iterable[Tuple[int, Any]]) -> CaseImportResult:
+        result = CaseImportResult()
+        records = iter(records)
+        while batch := list(itertools.islice(records, self.batch_size)):
+            rows = []
+            for line, record in batch:
+                try:
+                    rows.append((line, parse_case(record)))
+                except ValueError as e:
+                    result.add_error(line, str(e))
+            if rows:
+                self._insert_batch(rows, result)
+        return result
+
+    def _insert_batch(self, rows: List[Tuple[int, Dict[str, Any]]], result: CaseImportResult) -> None:
+        case_numbers = self.filing_service.generate_case_numbers(len(rows))
+        for (_, values), case_number in zip(rows, case_numbers):
+            values['case_number'] = case_number
+            values['email'] = self.filing_service.create_case_email(case_number)
+
+        try:
+            self.session.execute(insert(Case), [values for _, values in rows])
+            self.session.commit()
+            result.imported += len(rows)
+            return
+        except IntegrityError:
+            self.session.rollback()
+
+        # Retry row by row in savepoints to isolate the rows the database rejects
+        for line, values in rows:
+            try:
+                with self.session.begin_nested():
+                    self.session.execute(insert(Case), [values])
+                result.imported += 1
+            except IntegrityError as e:
+                result.add_error(line, str(e.orig))
+        self.session.commit()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Import legacy cases from CSV or JSONL.')
+    parser.add_argument('path', help='File of cases to import')
+    parser.add_argument('--format', choices=['csv', 'jsonl'],
+                        help='Input format (default: from the file extension)')
+    parser.add_argument('--database-url', required=True, help='Database to import into')
+    parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE,
+                        help='Cases inserted per transaction')
+    args = parser.parse_args()
+
+    file_format = args.format or ('jsonl' if args.path.endswith('.jsonl') else 'csv')
+    Session = sessionmaker(bind=create_engine(args.database_url))
+
+    with Session() as session, open(args.path, newline='', encoding='utf-8') as stream:
+        result = CaseImportService(session, batch_size=args.batch_size).import_file(stream, file_format)
+
+    for error in result.errors:
+        print(f'line {error.line}: {error.message}')
+    print(f'Imported {result.imported} cases, {result.failed} failed')
+
+if __name__ == '__main__':
+    main()
@@ -11,4 +11,11 @@ class Case(Base):
     email = Column(String, unique=True, nullable=False)
     status = Column(Enum('DRAFT', 'ACTIVE', 'CLOSED', name='case_status'))
     created_at = Column(DateTime, nullable=False)
-    updated_at = Column(DateTime, nullable=False)
\ No newline at end of file
+    updated_at = Column(DateTime, nullable=False)
+
+class CaseNumberCounter(Base):
+    __tablename__ = 'case_number_counters'
+    
+    # Next unreserved case number for each filing year
+    year = Column(Integer, primary_key=True, autoincrement=False)
+    next_value = Column(Integer, nullable=False)
@@ -1,16 +1,113 @@
 import datetime
-from typing import Optional
-from .models import Case
+import threading
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import Integer, cast, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+from .models import Case, CaseNumberCounter
+
+CASE_NUMBER_PREFIX = 'LX'
+
+class CaseNumberAllocator:
+    """Allocates unique per-year case numbers from a counter row.
+
+    Numbers are reserved in blocks with a single atomic
+    ``UPDATE ... RETURNING`` in a short transaction of its own, so the
+    counter row is locked only for the reservation, not for the filing.
+    Each process hands out numbers from its block in memory until it is used
+    up. Numbers left in a block when a process exits are skipped, so case
+    numbers are unique and increasing per process but may have gaps.
+
+    A year's counter starts after the highest case number already issued
+    for that year, so numbers from before the counter existed are not reused.
+    """
+
+    def __init__(self, session_factory: sessionmaker, block_size: int = 50):
+        self.session_factory = session_factory
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        # year -> (next number to hand out, end of reserved block exclusive)
+        self._blocks: Dict[int, Tuple[int, int]] = {}
+
+    def allocate(self, year: int) -> int:
+        return self.allocate_many(year, 1)[0]
+
+    def allocate_many(self, year: int, count: int) -> List[int]:
+        """Allocate ``count`` case numbers for a year, reserving blocks as needed."""
+        numbers = []
+        with self._lock:
+            while len(numbers) < count:
+                start, end = self._blocks.get(year, (0, 0))
+                if start >= end:
+                    start, end = self._reserve(year, max(self.block_size, count - len(numbers)))
+                taken = min(end - start, count - len(numbers))
+                numbers.extend(range(start, start + taken))
+                self._blocks[year] = (start + taken, end)
+        return numbers
+
+    def _reserve(self, year: int, size: int) -> Tuple[int, int]:
+        while True:
+            with self.session_factory() as session:
+                next_value = session.execute(
+                    update(CaseNumberCounter)
+                    .where(CaseNumberCounter.year == year)
+                    .values(next_value=CaseNumberCounter.next_value + size)
+                    .returning(CaseNumberCounter.next_value)
+                ).scalar()
+                if next_value is not None:
+                    session.commit()
+                    return next_value - size, next_value
+
+                # First reservation for the year: create the counter row
+                start = self._highest_issued(session, year) + 1
+                try:
+                    session.execute(
+                        insert(CaseNumberCounter).values(year=year, next_value=start + size)
+                    )
+                    session.commit()
+                    return start, start + size
+                except IntegrityError:
+                    # Another process created it first; reserve from its row
+                    session.rollback()
+
+    def _highest_issued(self, session: Session, year: int) -> int:
+        """Get the highest case number already issued for a year, or 0."""
+        prefix = f'{CASE_NUMBER_PREFIX}-{year}-'
+        highest = session.execute(
+            select(func.max(cast(func.substr(Case.case_number, len(prefix) + 1), Integer)))
+            .where(Case.case_number.like(f'{prefix}%'))
+        ).scalar()
+        return highest or 0
+
+_allocators: Dict[object, CaseNumberAllocator] = {}
+_allocators_lock = threading.Lock()
+
+def get_case_number_allocator(session: Session) -> CaseNumberAllocator:
+    """Get the process-wide allocator for a session's database."""
+    bind = session.get_bind()
+    with _allocators_lock:
+        if bind not in _allocators:
+            _allocators[bind] = CaseNumberAllocator(sessionmaker(bind=bind))
+        return _allocators[bind]
 
 class CaseFilingService:
-    def __init__(self, session):
+    def __init__(self, session, allocator: Optional[CaseNumberAllocator] = None):
         self.session = session
+        self.allocator = allocator or get_case_number_allocator(session)
     
     def generate_case_number(self) -> str:
-        prefix = 'LX'
         year = datetime.datetime.now().year
-        count = self.session.query(Case).count() + 1
-        return f'{prefix}-{year}-{count:04d}'
+        return self.format_case_number(year, self.allocator.allocate(year))
+    
+    def generate_case_numbers(self, count: int) -> List[str]:
+        year = datetime.datetime.now().year
+        return [
+            self.format_case_number(year, number)
+            for number in self.allocator.allocate_many(year, count)
+        ]
+    
+    def format_case_number(self, year: int, number: int) -> str:
+        return f'{CASE_NUMBER_PREFIX}-{year}-{number:04d}'
     
     def create_case_email(self, case_number: str) -> str:
         return f'case-{case_number.lower()}@lexarb.com'
@@ -1,9 +1,17 @@
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.orm import sessionmaker
+from backend.src.pipelines.case_filing.models import Base as CaseFilingBase
 
 @pytest.fixture
 def db_session():
-    engine = create_engine('sqlite:///:memory:')
+    # Share one in-memory database across threads (e.g. sync FastAPI endpoints)
+    engine = create_engine(
+        'sqlite:///:memory:',
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool
+    )
+    CaseFilingBase.metadata.create_all(engine)
     Session = sessionmaker(bind=engine)
     return Session()
\ No newline at end of file
@@ -1,6 +1,11 @@
+import io
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from backend.src.pipelines.case_filing import CaseFilingService
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.src.pipelines.case_filing import CaseFilingService, CaseImportService, CaseNumberAllocator
+from backend.src.pipelines.case_filing.models import Base, Case
 
 def test_case_number_generation(db_session):
     service = CaseFilingService(db_session)
@@ -17,4 +22,120 @@ def test_case_creation(db_session):
     assert case.email is not None
     assert case.status == 'DRAFT'
     assert isinstance(case.created_at, datetime)
-    assert isinstance(case.updated_at, datetime)
\ No newline at end of file
+    assert isinstance(case.updated_at, datetime)
+
+def test_case_numbers_are_sequential(db_session):
+    allocator = CaseNumberAllocator(sessionmaker(bind=db_session.get_bind()), block_size=2)
+    service = CaseFilingService(db_session, allocator)
+    
+    first = service.create_case()
+    second = service.create_case()
+    third = service.create_case()
+    
+    year = datetime.now().year
+    assert [first.case_number, second.case_number, third.case_number] == [
+        f'LX-{year}-0001', f'LX-{year}-0002', f'LX-{year}-0003'
+    ]
+
+def test_allocator_is_unique_under_concurrency(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cases.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    # One allocator per worker, as with separate processes sharing a database
+    allocators = [CaseNumberAllocator(Session, block_size=7) for _ in range(8)]
+    
+    def allocate(allocator):
+        return [allocator.allocate(2024) for _ in range(25)]
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(allocate, allocators))
+    
+    numbers = [number for result in results for number in result]
+    assert len(set(numbers)) == 200
+    assert all(result == sorted(result) for result in results)
+
+def test_allocate_many_spans_blocks(db_session):
+    allocator = CaseNumberAllocator(sessionmaker(bind=db_session.get_bind()), block_size=3)
+    
+    assert allocator.allocate_many(2024, 2) == [1, 2]
+    assert allocator.allocate_many(2024, 5) == [3, 4, 5, 6, 7]
+    assert allocator.allocate(2025) == 1
+
+
+def test_import_csv_reports_row_errors(db_session):
+    allocator = CaseNumberAllocator(sessionmaker(bind=db_session.get_bind()), block_size=2)
+    service = CaseImportService(db_session, allocator, batch_size=2)
+    stream = io.StringIO(
+        "status,created_at\n"
+        "ACTIVE,2019-05-01T10:00:00\n"
+        "PENDING,\n"
+        "closed,\n"
+        ",not-a-date\n"
+        "DRAFT,\n"
+    )
+    
+    result = service.import_file(stream, 'csv')
+    
+    assert result.imported == 3
+    assert [(error.line, error.message) for error in result.errors] == [
+        (3, 'Invalid status: PENDING'),
+        (5, 'Invalid created_at: not-a-date')
+    ]
+    cases = db_session.query(Case).order_by(Case.id).all()
+    assert [case.status for case in cases] == ['ACTIVE', 'CLOSED', 'DRAFT']
+    assert cases[0].created_at == datetime(2019, 5, 1, 10, 0)
+    assert len({case.case_number for case in cases}) == 3
+
+def test_import_jsonl_rejects_fields_of_wrong_type(db_session):
+    allocator = CaseNumberAllocator(sessionmaker(bind=db_session.get_bind()), block_size=10)
+    stream = io.StringIO('{"status": 1}\n{"created_at": 20190501}\n["ACTIVE"]\n{"status": "ACTIVE"}\n')
+    
+    result = CaseImportService(db_session, allocator).import_file(stream, 'jsonl')
+    
+    assert result.imported == 1
+    assert [(error.line, error.message) for error in result.errors] == [
+        (1, 'Invalid status: 1'),
+        (2, 'Invalid created_at: 20190501'),
+        (3, 'Record must be an object')
+    ]
+
+def test_counter_starts_after_existing_case_numbers(db_session):
+    year = datetime.now().year
+    # Cases numbered before the counter existed, including one past 9999
+    for number in ('0007', '10012', '0950'):
+        db_session.add(Case(
+            case_number=f'LX-{year}-{number}',
+            email=f'legacy-{number}@example.com',
+            status='CLOSED',
+            created_at=datetime.now(),
+            updated_at=datetime.now()
+        ))
+    db_session.commit()
+    allocator = CaseNumberAllocator(sessionmaker(bind=db_session.get_bind()), block_size=10)
+    
+    case = CaseFilingService(db_session, allocator).create_case()
+    
+    assert case.case_number == f'LX-{year}-10013'
+    assert allocator.allocate(year - 1) == 1
+
+def test_import_jsonl_isolates_rows_rejected_by_database(db_session):
+    allocator = CaseNumberAllocator(sessionmaker(bind=db_session.get_bind()), block_size=10)
+    existing = CaseFilingService(db_session, allocator).create_case()
+    # A case inserted outside the allocator after its block was reserved
+    # takes a number the block will hand out next
+    year = datetime.now().year
+    db_session.add(Case(
+        case_number=f'LX-{year}-0002',
+        email='manual@example.com',
+        status='CLOSED',
+        created_at=existing.created_at,
+        updated_at=existing.updated_at
+    ))
+    db_session.commit()
+    stream = io.StringIO('{"status": "ACTIVE"}\n{broken\n\n{"status": "DRAFT"}\n')
+    
+    result = CaseImportService(db_session, allocator).import_file(stream, 'jsonl')
+    
+    assert result.imported == 1
+    assert [error.line for error in result.errors] == [2, 1]
+    assert db_session.query(Case).count() == 3
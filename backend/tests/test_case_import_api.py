@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from backend.src.pipelines.case_filing.api import get_current_superuser, get_db, router
+from backend.src.pipelines.case_filing.models import Case
+
+def import_client(db_session, superuser=None):
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = lambda: db_session
+    if superuser is not None:
+        app.dependency_overrides[get_current_superuser] = lambda: superuser
+    return TestClient(app)
+
+def test_import_cases_endpoint(db_session):
+    client = import_client(db_session, SimpleNamespace(id=1, is_superuser=True))
+    
+    response = client.post(
+        "/cases/import",
+        files={"file": ("cases.jsonl", b'{"status": "ACTIVE"}\n{"status": "UNKNOWN"}\n')}
+    )
+    
+    assert response.status_code == 200
+    assert response.json()["imported"] == 1
+    assert response.json()["errors"] == [{"line": 2, "message": "Invalid status: UNKNOWN"}]
+
+def test_import_cases_endpoint_requires_authentication(db_session):
+    client = import_client(db_session)
+    
+    response = client.post(
+        "/cases/import",
+        files={"file": ("cases.jsonl", b'{"status": "ACTIVE"}\n')}
+    )
+    
+    assert response.status_code == 401
+    assert db_session.query(Case).count() == 0
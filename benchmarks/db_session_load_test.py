@@ -0,0 +1,145 @@
+"""Load test comparing sync and async database sessions in async endpoints.
+
+Serves the pending document requests query two ways and drives each with
+concurrent clients through the ASGI transport, so only the database access
+differs:
+
+    before  blocking Session from a sync engine inside an async endpoint
+    after   AsyncSession from an async engine with the tuned pool
+
+Usage (from the repository root):
+    python -m benchmarks.db_session_load_test \\
+        --database-url postgresql://... \\
+        --async-database-url postgresql+asyncpg://...
+
+SQLite files work for a smoke run (sqlite:///load.db and
+sqlite+aiosqlite:///load.db), though SQLite serialises access and will not
+show the pool's effect.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.db.session import create_async_db_engine
+
+PENDING_QUERY = text(
+    "SELECT id, request_id, requested_by, requested_at FROM load_test_documents "
+    "WHERE case_id = :case_id AND request_id IS NOT NULL AND storage_path IS NULL "
+    "ORDER BY id LIMIT :limit"
+)
+
+def setup_database(database_url: str, cases: int, requests_per_case: int) -> None:
+    engine = create_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS load_test_documents"))
+        connection.execute(text(
+            "CREATE TABLE load_test_documents ("
+            "id INTEGER PRIMARY KEY, case_id INTEGER, request_id VARCHAR(36), "
+            "requested_by INTEGER, requested_at TIMESTAMP, storage_path VARCHAR(255))"
+        ))
+        connection.execute(
+            text(
+                "INSERT INTO load_test_documents (id, case_id, request_id, requested_by, requested_at) "
+                "VALUES (:id, :case_id, :request_id, 1, CURRENT_TIMESTAMP)"
+            ),
+            [
+                {"id": i, "case_id": i % cases, "request_id": f"req-{i}"}
+                for i in range(cases * requests_per_case)
+            ]
+        )
+    engine.dispose()
+
+def build_app(database_url: str, async_database_url: str) -> FastAPI:
+    app = FastAPI()
+    engine = create_engine(
+        database_url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT
+    )
+    session_factory = sessionmaker(bind=engine)
+    async_session_factory = async_sessionmaker(
+        create_async_db_engine(async_database_url),
+        expire_on_commit=False
+    )
+
+    async def get_async_db():
+        async with async_session_factory() as db:
+            yield db
+
+    @app.get("/before/{case_id}")
+    async def pending_before(case_id: int):
+        # Checkout, query and close all block the event loop, as with the old
+        # sync sessions. The session is opened here rather than through a sync
+        # dependency, whose threadpool teardown would deadlock against the
+        # blocked loop once the pool is exhausted.
+        with session_factory() as db:
+            rows = db.execute(PENDING_QUERY, {"case_id": case_id, "limit": 50}).all()
+        return {"items": len(rows)}
+
+    @app.get("/after/{case_id}")
+    async def pending_after(case_id: int, db: AsyncSession = Depends(get_async_db)):
+        rows = (await db.execute(PENDING_QUERY, {"case_id": case_id, "limit": 50})).all()
+        return {"items": len(rows)}
+
+    return app
+
+async def run_load(app: FastAPI, path: str, clients: int, requests_per_client: int, cases: int) -> Dict:
+    latencies: List[float] = []
+    errors = 0
+
+    async def client_loop(client_id: int, client: httpx.AsyncClient) -> None:
+        nonlocal errors
+        for i in range(requests_per_client):
+            started = time.perf_counter()
+            response = await client.get(f"/{path}/{(client_id + i) % cases}")
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load-test") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(n, client) for n in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare sync and async sessions under concurrent load.')
+    parser.add_argument('--database-url', required=True, help='Sync URL of the database')
+    parser.add_argument('--async-database-url', required=True, help='Async URL of the same database')
+    parser.add_argument('--clients', type=int, default=200, help='Concurrent clients')
+    parser.add_argument('--requests', type=int, default=20, help='Requests per client')
+    parser.add_argument('--cases', type=int, default=100, help='Cases to spread requests over')
+    args = parser.parse_args()
+
+    setup_database(args.database_url, args.cases, requests_per_case=100)
+    app = build_app(args.database_url, args.async_database_url)
+
+    for path in ('before', 'after'):
+        result = asyncio.run(run_load(app, path, args.clients, args.requests, args.cases))
+        print(
+            f"{path:<6} {result['requests']} requests, {result['errors']} errors, "
+            f"{result['requests_per_second']:.0f} req/s, p50 {result['p50_ms']:.1f} ms, "
+            f"p95 {result['p95_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms"
+        )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""Import-time benchmark for API and worker entry points.
+
+Each module is imported in a fresh interpreter with ``-X importtime`` and
+its cumulative import time recorded, along with any heavy ML packages the
+import pulled in. Those packages should only load on first inference.
+
+Usage (from the repository root):
+    python -m benchmarks.import_time --output import_times.json
+    python -m benchmarks.import_time --baseline import_times.json
+
+With --baseline, exits non-zero if a module got slower than the baseline by
+more than the tolerance, eagerly imports a heavy package, or no longer
+imports at all.
+"""
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+MODULES = [
+    'src.services.llm.service',
+    'src.services.categorization.service',
+    'src.pipelines.ai_etl',
+    'app.api.deps',
+]
+
+HEAVY_PACKAGES = ('torch', 'transformers', 'spacy')
+
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)')
+
+def measure_import(module: str) -> Dict:
+    """Import a module in a fresh interpreter and time it.
+
+    Returns:
+        Dictionary with the cumulative import time in seconds, heavy
+        packages loaded, and the error if the import failed
+    """
+    code = (
+        f'import sys, json, {module}\n'
+        f'print(json.dumps([name for name in {HEAVY_PACKAGES!r} if name in sys.modules]))'
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True,
+        text=True
+    )
+
+    cumulative_us = 0
+    other_output = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match is None:
+            if not line.startswith('import time:'):
+                other_output.append(line)
+        elif match.group(3) == module:
+            cumulative_us = int(match.group(2))
+
+    if result.returncode != 0:
+        error = other_output[-1] if other_output else 'import failed'
+        return {'seconds': None, 'heavy_packages': [], 'error': error}
+    return {
+        'seconds': cumulative_us / 1_000_000,
+        'heavy_packages': json.loads(result.stdout.strip().splitlines()[-1]),
+        'error': None
+    }
+
+def run_benchmark(modules: List[str], repeat: int) -> Dict[str, Dict]:
+    results = {}
+    for module in modules:
+        runs = [measure_import(module) for _ in range(repeat)]
+        timings = [run['seconds'] for run in runs if run['seconds'] is not None]
+        results[module] = {
+            'seconds': statistics.median(timings) if timings else None,
+            'heavy_packages': runs[-1]['heavy_packages'],
+            'error': runs[-1]['error']
+        }
+    return results
+
+def find_regressions(
+    results: Dict[str, Dict],
+    baseline: Dict[str, Dict],
+    tolerance: float,
+    min_slowdown: float
+) -> List[str]:
+    """Compare results against a baseline.
+
+    Args:
+        results: Results of this run
+        baseline: Results of an earlier run
+        tolerance: Allowed relative slowdown, e.g. 0.25 for 25%
+        min_slowdown: Slowdowns below this many seconds are ignored as noise
+
+    Returns:
+        Description of each regression
+    """
+    regressions = []
+    for module, result in results.items():
+        if result['heavy_packages']:
+            regressions.append(f"{module} eagerly imports {', '.join(result['heavy_packages'])}")
+
+        previous: Optional[float] = baseline.get(module, {}).get('seconds')
+        current = result['seconds']
+        if previous is not None and result['error']:
+            regressions.append(f"{module} no longer imports: {result['error']}")
+        if previous is None or current is None:
+            continue
+        if current - previous > max(previous * tolerance, min_slowdown):
+            regressions.append(f'{module} import time rose from {previous:.3f}s to {current:.3f}s')
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure import time of API and worker modules.')
+    parser.add_argument('modules', nargs='*', default=MODULES, help='Modules to import')
+    parser.add_argument('--repeat', type=int, default=3, help='Fresh imports per module')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--baseline', help='JSON results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed relative slowdown against the baseline')
+    parser.add_argument('--min-slowdown', type=float, default=0.05,
+                        help='Slowdowns below this many seconds are ignored')
+    args = parser.parse_args()
+
+    results = run_benchmark(args.modules, args.repeat)
+    for module, result in results.items():
+        if result['error']:
+            print(f'{module:<40} failed: {result["error"]}')
+            continue
+        heavy = f" (loaded {', '.join(result['heavy_packages'])})" if result['heavy_packages'] else ''
+        print(f'{module:<40} {result["seconds"] * 1000:8.1f} ms{heavy}')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.tolerance, args.min_slowdown)
+        for regression in regressions:
+            print(f'REGRESSION: {regression}')
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
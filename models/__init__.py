@@ -0,0 +1,6 @@
+# Import every model so string relationships between them resolve
+from models.base import Base
+from models.award import Award, AwardReview, AwardSection, AwardSectionVersion, SectionReview
+from models.case import Case
+from models.document import Document
+from models.user import User
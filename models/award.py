@@ -1,11 +1,9 @@
 from datetime import datetime
 from typing import List
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Text, Boolean, Table
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Text, Boolean, Table, UniqueConstraint
 from sqlalchemy.orm import relationship
-from sqlalchemy.ext.declarative import declarative_base
 import enum
-
-Base = declarative_base()
+from models.base import Base
 
 class AwardStatus(enum.Enum):
     DRAFT = "draft"
@@ -58,15 +56,36 @@ class AwardSection(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     ai_generated = Column(Boolean, default=True, nullable=False)
+    input_fingerprint = Column(String(64), nullable=True)  # SHA-256 of rendering inputs
     
     # Relationships
     award = relationship("Award", back_populates="sections")
     reviews = relationship("SectionReview", back_populates="section")
+    versions = relationship("AwardSectionVersion", back_populates="section", order_by="AwardSectionVersion.version")
     documents = relationship("Document", secondary="section_documents")
 
     def __repr__(self):
         return f"<AwardSection(id={self.id}, title={self.title}, status={self.status})>"
 
+class AwardSectionVersion(Base):
+    __tablename__ = "award_section_versions"
+    __table_args__ = (UniqueConstraint("section_id", "version"),)
+
+    id = Column(Integer, primary_key=True)
+    section_id = Column(Integer, ForeignKey("award_sections.id"), nullable=False)
+    version = Column(Integer, nullable=False)
+    is_snapshot = Column(Boolean, default=False, nullable=False)
+    data = Column(Text, nullable=False)  # Full content for snapshots, JSON delta otherwise
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_by_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+
+    # Relationships
+    section = relationship("AwardSection", back_populates="versions")
+    created_by = relationship("User")
+
+    def __repr__(self):
+        return f"<AwardSectionVersion(section_id={self.section_id}, version={self.version}, is_snapshot={self.is_snapshot})>"
+
 class AwardReview(Base):
     __tablename__ = "award_reviews"
 
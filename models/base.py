@@ -0,0 +1,4 @@
+from sqlalchemy.orm import declarative_base
+
+# Declarative base shared by the award models and the tables they reference
+Base = declarative_base()
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.orm import relationship
+from models.base import Base
+
+class Case(Base):
+    """The columns of a case that award generation reads."""
+    __tablename__ = "cases"
+
+    id = Column(Integer, primary_key=True)
+    case_number = Column(String, unique=True, nullable=False)
+    filed_date = Column("created_at", DateTime, nullable=False)  # Cases are filed when created
+
+    # Relationships
+    awards = relationship("Award", back_populates="case")
+    documents = relationship("Document", back_populates="case")
+
+    def __repr__(self):
+        return f"<Case(id={self.id}, case_number={self.case_number})>"
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from models.base import Base
+
+class Document(Base):
+    """The columns of a case document that award generation reads."""
+    __tablename__ = "documents"
+
+    id = Column(Integer, primary_key=True)
+    case_id = Column(Integer, ForeignKey("cases.id"), nullable=False)
+    filename = Column(String, nullable=True)
+    category = Column(String, nullable=True)
+    ai_summary = Column(String, nullable=True)
+    submitted_at = Column(DateTime, nullable=True)
+
+    # Relationships
+    case = relationship("Case", back_populates="documents")
+
+    def __repr__(self):
+        return f"<Document(id={self.id}, case_id={self.case_id}, category={self.category})>"
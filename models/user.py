@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String
+from models.base import Base
+
+class User(Base):
+    """The columns of a user that awards and reviews refer to."""
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    email = Column(String, unique=True, nullable=False)
+
+    def __repr__(self):
+        return f"<User(id={self.id}, email={self.email})>"
@@ -1,28 +1,114 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-from sqlalchemy.orm import Session
+import asyncio
+import hashlib
+import json
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from models.award import Award, AwardSection, AwardStatus, SectionStatus, AwardReview, SectionReview
+from models.case import Case
+from models.document import Document
+from services.award_versioning import SectionVersionStore
 from services.template_engine import TemplateEngine
 
+# Award sections in document order, as (title, template) pairs
+SECTION_ORDER = [
+    ("Introduction", "introduction.j2"),
+    ("Procedural History", "procedural_history.j2"),
+    ("Factual Background", "factual_background.j2"),
+    ("Parties' Positions", "parties_positions.j2"),
+    ("Tribunal's Analysis", "tribunal_analysis.j2"),
+    ("Decision", "decision.j2")
+]
+
+# Aggregation bucket for each top-level document category. Documents in any
+# other category contribute to the factual background.
+DOCUMENT_CATEGORY_BUCKETS = {
+    "procedural": "procedural_history",
+    "submissions": "legal_analysis",
+    "evidence": "evidence"
+}
+
+# Number of document rows fetched per round-trip while aggregating
+DOCUMENT_BATCH_SIZE = 500
+
+class DocumentAggregate:
+    """Running aggregate of the documents in one bucket.
+
+    Documents are added one at a time and only counts and dates are kept,
+    so the aggregate has a fixed size however many documents a case has.
+    """
+
+    def __init__(self):
+        self.document_count = 0
+        self.category_counts: Dict[str, int] = {}
+        self.first_submitted_at: Optional[datetime] = None
+        self.last_submitted_at: Optional[datetime] = None
+
+    def add(self, document) -> None:
+        """Fold one document row into the aggregate."""
+        self.document_count += 1
+        category = document.category or "uncategorized"
+        self.category_counts[category] = self.category_counts.get(category, 0) + 1
+        submitted_at = document.submitted_at
+        if submitted_at is not None:
+            if self.first_submitted_at is None or submitted_at < self.first_submitted_at:
+                self.first_submitted_at = submitted_at
+            if self.last_submitted_at is None or submitted_at > self.last_submitted_at:
+                self.last_submitted_at = submitted_at
+
+    def as_dict(self) -> Dict:
+        return {
+            "document_count": self.document_count,
+            "categories": dict(self.category_counts),
+            "first_submitted_at": self.first_submitted_at,
+            "last_submitted_at": self.last_submitted_at
+        }
+
 class AwardPipeline:
-    def __init__(self, db: Session, template_engine: TemplateEngine):
+    def __init__(self, db: AsyncSession, template_engine: TemplateEngine):
         self.db = db
         self.template_engine = template_engine
+        self.version_store = SectionVersionStore(db)
 
     async def aggregate_case_data(self, case_id: int) -> Dict:
         """
         Aggregate all relevant case data for award generation.
         """
-        # Query case details and related documents
-        case = self.db.query(Case).get(case_id)
+        # Load the case together with only the document columns needed for
+        # aggregation, streaming rows instead of materializing every document
+        rows = await self.db.stream(
+            select(
+                Case,
+                Document.id.label("document_id"),
+                Document.filename,
+                Document.category,
+                Document.ai_summary,
+                Document.submitted_at
+            )
+            .outerjoin(Document, Document.case_id == Case.id)
+            .where(Case.id == case_id)
+            .execution_options(yield_per=DOCUMENT_BATCH_SIZE)
+        )
+
+        # Fold each document into its bucket's running aggregate as it
+        # arrives, so memory does not grow with the number of documents
+        case = None
+        buckets = {
+            "procedural_history": DocumentAggregate(),
+            "factual_background": DocumentAggregate(),
+            "legal_analysis": DocumentAggregate(),
+            "evidence": DocumentAggregate()
+        }
+        async for row in rows:
+            case = row.Case
+            if row.document_id is not None:
+                buckets[self._get_document_bucket(row.category)].add(row)
+
         if not case:
             raise ValueError(f"Case {case_id} not found")
 
-        # Aggregate data by document categories
-        documents = self.db.query(Document).filter(
-            Document.case_id == case_id
-        ).order_by(Document.created_at).all()
-
         aggregated_data = {
             "case_info": {
                 "number": case.case_number,
@@ -30,10 +116,7 @@ class AwardPipeline:
                 "parties": self._get_parties(case),
                 "tribunal": self._get_tribunal(case)
             },
-            "procedural_history": self._aggregate_procedural_history(documents),
-            "factual_background": self._aggregate_factual_background(documents),
-            "legal_analysis": self._aggregate_legal_analysis(documents),
-            "evidence": self._aggregate_evidence(documents),
+            **{name: aggregate.as_dict() for name, aggregate in buckets.items()},
             "decisions": self._get_decisions(case)
         }
 
@@ -46,71 +129,156 @@ class AwardPipeline:
         # Aggregate case data
         case_data = await self.aggregate_case_data(case_id)
 
-        # Create new award
+        # Generate sections
+        section_inputs = self._get_section_inputs(case_data)
+
+        # Sections are independent of each other, so render them concurrently
+        contents = await asyncio.to_thread(
+            self.template_engine.render_sections,
+            [(template, section_data) for _, template, section_data in section_inputs],
+            case_data['case_info']
+        )
+
+        sections = [
+            AwardSection(
+                title=title,
+                content=content,
+                order=order,
+                status=SectionStatus.DRAFT,
+                version=1,
+                input_fingerprint=self._fingerprint_section(
+                    template, section_data, case_data['case_info']
+                )
+            )
+            for order, ((title, template, section_data), content)
+            in enumerate(zip(section_inputs, contents))
+        ]
+
+        # Create new award together with its sections
         award = Award(
             case_id=case_id,
             title=f"Award - Case {case_data['case_info']['number']}",
             status=AwardStatus.DRAFT,
-            created_by_id=created_by_id
+            created_by_id=created_by_id,
+            sections=sections
         )
         self.db.add(award)
-        self.db.flush()  # Get award ID
+        for section in sections:
+            await self.version_store.record_version(section, created_by_id=created_by_id)
+        await self.db.commit()
 
-        # Generate sections
-        sections = []
-        section_order = [
-            ("Introduction", "introduction.j2"),
-            ("Procedural History", "procedural_history.j2"),
-            ("Factual Background", "factual_background.j2"),
-            ("Parties' Positions", "parties_positions.j2"),
-            ("Tribunal's Analysis", "tribunal_analysis.j2"),
-            ("Decision", "decision.j2")
-        ]
+        return award
 
-        for order, (title, template) in enumerate(section_order):
-            content = self.template_engine.render_award_section(
-                template,
-                case_data.get(title.lower().replace(" ", "_"), {}),
-                case_data['case_info']
-            )
+    async def regenerate_award(self, award_id: int) -> Award:
+        """
+        Re-render only the award sections whose inputs have changed.
 
-            section = AwardSection(
-                award_id=award.id,
-                title=title,
-                content=content,
-                order=order,
-                status=SectionStatus.DRAFT
-            )
-            sections.append(section)
+        Each section's fingerprint covers its slice of the aggregated case
+        data and its template source. Sections with an unchanged fingerprint
+        keep their content; changed sections are re-rendered, reset to draft
+        and have their version bumped.
 
-        self.db.add_all(sections)
-        self.db.commit()
+        The award row is locked for the rest of the transaction, so
+        concurrent regenerations bump section versions one after the other.
+        """
+        award = await self._get_award(award_id, with_for_update=True)
+
+        if award.status == AwardStatus.FINAL:
+            await self.db.commit()
+            raise ValueError(f"Award {award_id} is final and cannot be regenerated")
+
+        case_data = await self.aggregate_case_data(award.case_id)
+        existing = {section.title: section for section in award.sections}
+
+        stale = []
+        for order, (title, template, section_data) in enumerate(self._get_section_inputs(case_data)):
+            fingerprint = self._fingerprint_section(template, section_data, case_data['case_info'])
+            section = existing.get(title)
+            if section is not None and section.input_fingerprint == fingerprint:
+                continue
+            stale.append((order, title, template, section_data, fingerprint, section))
+
+        if not stale:
+            # Commit to release the row lock
+            await self.db.commit()
+            return award
+
+        contents = await asyncio.to_thread(
+            self.template_engine.render_sections,
+            [(template, section_data) for _, _, template, section_data, _, _ in stale],
+            case_data['case_info']
+        )
+
+        for (order, title, _, _, fingerprint, section), content in zip(stale, contents):
+            previous_content = None
+            if section is None:
+                section = AwardSection(
+                    title=title,
+                    order=order,
+                    status=SectionStatus.DRAFT,
+                    version=1
+                )
+                award.sections.append(section)
+            else:
+                previous_content = section.content
+                section.version += 1
+                section.status = SectionStatus.DRAFT
+            section.content = content
+            section.input_fingerprint = fingerprint
+            await self.version_store.record_version(section, previous_content)
+
+        award.version += 1
+        award.status = AwardStatus.DRAFT
+        await self.db.commit()
 
         return award
 
+    async def revise_section(self, section_id: int, content: str, revised_by_id: int) -> AwardSection:
+        """
+        Replace a section's content with a manual revision.
+
+        The previous content stays recoverable through the section's version
+        history, which stores only the delta for the revision. Sections of a
+        final award cannot be revised.
+        """
+        section = await self.db.get(AwardSection, section_id, with_for_update=True)
+        if not section:
+            raise ValueError(f"Award section {section_id} not found")
+
+        award_status = await self.db.scalar(select(Award.status).where(Award.id == section.award_id))
+        if award_status == AwardStatus.FINAL:
+            # Commit to release the row lock
+            await self.db.commit()
+            raise ValueError(f"Award {section.award_id} is final and its sections cannot be revised")
+
+        previous_content = section.content
+        section.content = content
+        section.version += 1
+        section.ai_generated = False
+        await self.version_store.record_version(section, previous_content, revised_by_id)
+
+        await self.db.commit()
+        return section
+
     async def submit_for_review(self, award_id: int, reviewer_ids: List[int]) -> Award:
         """
         Submit award for review to specified reviewers.
         """
-        award = self.db.query(Award).get(award_id)
-        if not award:
-            raise ValueError(f"Award {award_id} not found")
+        award = await self._get_award(award_id)
 
         # Update award status
         award.status = AwardStatus.UNDER_REVIEW
 
         # Create review requests
-        reviews = [
+        award.reviews.extend(
             AwardReview(
-                award_id=award_id,
                 reviewer_id=reviewer_id,
                 status="pending"
             )
             for reviewer_id in reviewer_ids
-        ]
-        
-        self.db.add_all(reviews)
-        self.db.commit()
+        )
+
+        await self.db.commit()
 
         return award
 
@@ -124,17 +292,23 @@ class AwardPipeline:
     ) -> Award:
         """
         Process a review submission for an award.
+
+        The award row is locked for the rest of the transaction so that
+        concurrent reviewers see each other's submissions before deciding
+        the award's status.
         """
-        award = self.db.query(Award).get(award_id)
+        award = await self.db.get(Award, award_id, with_for_update=True)
         if not award:
             raise ValueError(f"Award {award_id} not found")
 
         # Update award review
-        review = self.db.query(AwardReview).filter(
-            AwardReview.award_id == award_id,
-            AwardReview.reviewer_id == reviewer_id
-        ).first()
-        
+        review = await self.db.scalar(
+            select(AwardReview).where(
+                AwardReview.award_id == award_id,
+                AwardReview.reviewer_id == reviewer_id
+            )
+        )
+
         if not review:
             raise ValueError(f"Review not found for award {award_id} and reviewer {reviewer_id}")
 
@@ -144,37 +318,42 @@ class AwardPipeline:
 
         # Process section-specific reviews if provided
         if section_reviews:
-            for section_id, review_data in section_reviews.items():
-                section_review = SectionReview(
-                    section_id=section_id,
-                    reviewer_id=reviewer_id,
-                    status=review_data.get('status', 'pending'),
-                    comments=review_data.get('comments')
-                )
-                self.db.add(section_review)
+            await self.db.execute(
+                insert(SectionReview),
+                [
+                    {
+                        "section_id": section_id,
+                        "reviewer_id": reviewer_id,
+                        "status": review_data.get('status', 'pending'),
+                        "comments": review_data.get('comments')
+                    }
+                    for section_id, review_data in section_reviews.items()
+                ]
+            )
 
         # Check if all reviews are complete
-        all_reviews = self.db.query(AwardReview).filter(
-            AwardReview.award_id == award_id
-        ).all()
-
-        if all(r.status != 'pending' for r in all_reviews):
+        await self.db.flush()
+        status_counts = dict((await self.db.execute(
+            select(AwardReview.status, func.count())
+            .where(AwardReview.award_id == award_id)
+            .group_by(AwardReview.status)
+        )).all())
+
+        if not status_counts.get('pending'):
             # If any review is rejected, mark for revision
-            if any(r.status == 'rejected' for r in all_reviews):
+            if status_counts.get('rejected'):
                 award.status = AwardStatus.REVISION_REQUESTED
             else:
                 award.status = AwardStatus.APPROVED
 
-        self.db.commit()
+        await self.db.commit()
         return award
 
     async def finalize_award(self, award_id: int, approved_by_id: int) -> Award:
         """
         Finalize an approved award.
         """
-        award = self.db.query(Award).get(award_id)
-        if not award:
-            raise ValueError(f"Award {award_id} not found")
+        award = await self._get_award(award_id)
 
         if award.status != AwardStatus.APPROVED:
             raise ValueError(f"Award {award_id} must be approved before finalization")
@@ -183,32 +362,57 @@ class AwardPipeline:
         award.approved_by_id = approved_by_id
         award.finalized_at = datetime.utcnow()
 
-        self.db.commit()
+        await self.db.commit()
         return award
 
     # Private helper methods
-    def _get_parties(self, case) -> Dict:
-        """Extract party information from case."""
-        pass  # Implementation details
+    async def _get_award(self, award_id: int, with_for_update: bool = False) -> Award:
+        """Load an award with its sections and reviews eagerly loaded."""
+        award = await self.db.get(
+            Award,
+            award_id,
+            options=[selectinload(Award.sections), selectinload(Award.reviews)],
+            with_for_update=with_for_update,
+            # An award already in the identity map is returned as is without
+            # running the loader options, leaving its collections to lazy load,
+            # which fails under asyncio
+            populate_existing=True
+        )
+        if not award:
+            raise ValueError(f"Award {award_id} not found")
+        return award
 
-    def _get_tribunal(self, case) -> Dict:
-        """Extract tribunal information from case."""
-        pass  # Implementation details
+    def _get_section_inputs(self, case_data: Dict) -> List[Tuple[str, str, Dict]]:
+        """Pair each award section with its slice of the aggregated case data."""
+        return [
+            (title, template, case_data.get(title.lower().replace(" ", "_"), {}))
+            for title, template in SECTION_ORDER
+        ]
 
-    def _aggregate_procedural_history(self, documents: List) -> Dict:
-        """Aggregate procedural history from documents."""
-        pass  # Implementation details
+    def _fingerprint_section(self, template: str, section_data: Dict, case_info: Dict) -> str:
+        """Hash a section's rendering inputs to detect when it needs re-rendering."""
+        payload = json.dumps(
+            {
+                "template": self.template_engine.get_template_hash(template),
+                "section": section_data,
+                "case": case_info
+            },
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
 
-    def _aggregate_factual_background(self, documents: List) -> Dict:
-        """Aggregate factual background from documents."""
-        pass  # Implementation details
+    def _get_document_bucket(self, category: Optional[str]) -> str:
+        """Map a document category to the aggregation bucket it feeds."""
+        top_level = (category or "").split(".", 1)[0]
+        return DOCUMENT_CATEGORY_BUCKETS.get(top_level, "factual_background")
 
-    def _aggregate_legal_analysis(self, documents: List) -> Dict:
-        """Aggregate legal analysis from documents."""
+    def _get_parties(self, case) -> Dict:
+        """Extract party information from case."""
         pass  # Implementation details
 
-    def _aggregate_evidence(self, documents: List) -> Dict:
-        """Aggregate evidence from documents."""
+    def _get_tribunal(self, case) -> Dict:
+        """Extract tribunal information from case."""
         pass  # Implementation details
 
     def _get_decisions(self, case) -> Dict:
@@ -0,0 +1,195 @@
+from typing import List, Optional, Tuple, Union
+from difflib import SequenceMatcher, unified_diff
+import json
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.award import AwardSection, AwardSectionVersion
+
+# Store a full snapshot every N versions to bound reconstruction cost
+SNAPSHOT_INTERVAL = 10
+
+# Delta operations: ["=", n] keeps n lines, ["-", n] drops n lines and
+# ["+", text] inserts text, all relative to the previous version
+DeltaOp = Tuple[str, Union[int, str]]
+
+def compute_delta(old: str, new: str) -> List[DeltaOp]:
+    """
+    Compute a line-based delta that turns one text into another.
+
+    Args:
+        old: Previous content
+        new: New content
+
+    Returns:
+        List of delta operations
+    """
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    delta = []
+    matcher = SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            delta.append(("=", i2 - i1))
+            continue
+        if tag in ("delete", "replace"):
+            delta.append(("-", i2 - i1))
+        if tag in ("insert", "replace"):
+            delta.append(("+", "".join(new_lines[j1:j2])))
+    return delta
+
+def apply_delta(old: str, delta: List[DeltaOp]) -> str:
+    """
+    Apply a delta produced by compute_delta.
+
+    Args:
+        old: Content the delta was computed against
+        delta: List of delta operations
+
+    Returns:
+        Reconstructed new content
+    """
+    old_lines = old.splitlines(keepends=True)
+    position = 0
+    parts = []
+    for op, value in delta:
+        if op == "=":
+            parts.extend(old_lines[position:position + value])
+            position += value
+        elif op == "-":
+            position += value
+        elif op == "+":
+            parts.append(value)
+        else:
+            raise ValueError(f"Unknown delta operation: {op}")
+    return "".join(parts)
+
+class SectionVersionStore:
+    """Version history for award sections, stored as deltas with periodic snapshots."""
+
+    def __init__(self, db: AsyncSession, snapshot_interval: int = SNAPSHOT_INTERVAL):
+        self.db = db
+        self.snapshot_interval = snapshot_interval
+
+    async def record_version(
+        self,
+        section: AwardSection,
+        previous_content: Optional[str] = None,
+        created_by_id: Optional[int] = None
+    ) -> AwardSectionVersion:
+        """
+        Record the section's current content as its current version.
+
+        The caller commits the session. A full snapshot is stored for the
+        first version, every ``snapshot_interval`` versions, whenever the
+        previous content is not known, and whenever the previous version has
+        no record (e.g. a section edited before versioning was introduced);
+        otherwise only a delta is stored.
+
+        Args:
+            section: Section whose content and version were just updated
+            previous_content: Content of the section's previous version
+            created_by_id: User who made the change
+
+        Returns:
+            The new version record
+        """
+        is_snapshot = (
+            previous_content is None
+            or (section.version - 1) % self.snapshot_interval == 0
+            or not await self._has_version(section, section.version - 1)
+        )
+        if is_snapshot:
+            data = section.content
+        else:
+            data = json.dumps(compute_delta(previous_content, section.content))
+
+        version = AwardSectionVersion(
+            section=section,
+            version=section.version,
+            is_snapshot=is_snapshot,
+            data=data,
+            created_by_id=created_by_id
+        )
+        self.db.add(version)
+        return version
+
+    async def _has_version(self, section: AwardSection, version: int) -> bool:
+        """Check whether a version record exists for a section, e.g. to base a delta on."""
+        if section.id is None:
+            return False
+        record_id = await self.db.scalar(
+            select(AwardSectionVersion.id)
+            .where(
+                AwardSectionVersion.section_id == section.id,
+                AwardSectionVersion.version == version
+            )
+        )
+        return record_id is not None
+
+    async def get_version_content(self, section_id: int, version: int) -> str:
+        """
+        Reconstruct a section's content at a given version.
+
+        Args:
+            section_id: ID of the award section
+            version: Version number to reconstruct
+
+        Returns:
+            Section content at that version
+        """
+        # Load the nearest snapshot at or before the version plus the deltas after it
+        nearest_snapshot = (
+            select(func.max(AwardSectionVersion.version))
+            .where(
+                AwardSectionVersion.section_id == section_id,
+                AwardSectionVersion.is_snapshot.is_(True),
+                AwardSectionVersion.version <= version
+            )
+            .scalar_subquery()
+        )
+        records = (await self.db.scalars(
+            select(AwardSectionVersion)
+            .where(
+                AwardSectionVersion.section_id == section_id,
+                AwardSectionVersion.version >= nearest_snapshot,
+                AwardSectionVersion.version <= version
+            )
+            .order_by(AwardSectionVersion.version)
+        )).all()
+
+        if not records or records[-1].version != version:
+            raise ValueError(f"Version {version} not found for section {section_id}")
+
+        content = records[0].data
+        for record in records[1:]:
+            content = apply_delta(content, json.loads(record.data))
+        return content
+
+    async def list_versions(self, section_id: int) -> List[AwardSectionVersion]:
+        """List version records for a section, oldest first."""
+        return (await self.db.scalars(
+            select(AwardSectionVersion)
+            .where(AwardSectionVersion.section_id == section_id)
+            .order_by(AwardSectionVersion.version)
+        )).all()
+
+    async def diff_versions(self, section_id: int, from_version: int, to_version: int) -> str:
+        """
+        Produce a unified diff between two versions of a section.
+
+        Args:
+            section_id: ID of the award section
+            from_version: Base version
+            to_version: Target version
+
+        Returns:
+            Unified diff text
+        """
+        old = await self.get_version_content(section_id, from_version)
+        new = await self.get_version_content(section_id, to_version)
+        return "".join(unified_diff(
+            old.splitlines(keepends=True),
+            new.splitlines(keepends=True),
+            fromfile=f"v{from_version}",
+            tofile=f"v{to_version}"
+        ))
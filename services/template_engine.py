@@ -1,24 +1,70 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+import hashlib
 import os
+import threading
 
 class TemplateEngine:
-    def __init__(self, templates_dir: str = "templates/awards"):
+    def __init__(
+        self,
+        templates_dir: str = "templates/awards",
+        bytecode_cache_dir: Optional[str] = None,
+        production: bool = False,
+        precompile: Optional[bool] = None,
+        render_workers: Optional[int] = None
+    ):
         """
         Initialize the template engine with a templates directory.
         
         Args:
             templates_dir: Directory containing award templates
+            bytecode_cache_dir: Optional directory for persisting compiled
+                template bytecode across processes
+            production: Disable auto-reload so templates are never re-checked
+                for changes once loaded
+            precompile: Compile all templates on startup. Defaults to
+                ``production``
+            render_workers: Threads shared by every render_sections call.
+                Defaults to the ThreadPoolExecutor default
+
+        Raises:
+            ValueError: If precompiling and a template fails to compile
         """
         self.templates_dir = templates_dir
+        self.production = production
+        self.render_workers = render_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+        bytecode_cache = None
+        if bytecode_cache_dir:
+            os.makedirs(bytecode_cache_dir, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+
         self.env = Environment(
             loader=FileSystemLoader(templates_dir),
             autoescape=select_autoescape(['html', 'xml']),
             trim_blocks=True,
-            lstrip_blocks=True
+            lstrip_blocks=True,
+            bytecode_cache=bytecode_cache,
+            auto_reload=not production,
+            # Keep every loaded template in memory in production; the award
+            # template set is small and bounded.
+            cache_size=-1 if production else 400
         )
 
+        if precompile is None:
+            precompile = production
+        if precompile:
+            # Fail at startup rather than on the first award that uses a broken template
+            errors = self._compile_errors()
+            if errors:
+                raise ValueError("Award templates failed to compile: " + "; ".join(
+                    f"{template_name}: {error}" for template_name, error in errors.items()
+                ))
+
     def get_template_list(self) -> List[str]:
         """Get a list of available award templates."""
         return self.env.list_templates()
@@ -48,6 +94,48 @@ class TemplateEngine:
         }
         return template.render(**context)
 
+    def render_sections(
+        self,
+        sections: List[Tuple[str, Dict]],
+        case_data: Optional[Dict] = None
+    ) -> List[str]:
+        """
+        Render independent award sections concurrently.
+
+        Sections are rendered on the engine's thread pool, which is created
+        on first use and reused by later calls.
+        
+        Args:
+            sections: List of (template name, section data) pairs
+            case_data: Optional case-wide data shared by all sections
+            
+        Returns:
+            Rendered section contents, in the same order as ``sections``
+        """
+        if not sections:
+            return []
+
+        return list(self._render_executor().map(
+            lambda section: self.render_award_section(section[0], section[1], case_data),
+            sections
+        ))
+
+    def close(self) -> None:
+        """Shut down the section rendering threads."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def _render_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.render_workers,
+                    thread_name_prefix="award-render"
+                )
+            return self._executor
+
     def render_full_award(
         self,
         sections: List[Dict],
@@ -66,16 +154,82 @@ class TemplateEngine:
             Complete rendered award document
         """
         template = self.env.get_template(template_name)
-        context = {
+        return template.render(**self._full_award_context(sections, case_data))
+
+    def render_full_award_stream(
+        self,
+        sections: List[Dict],
+        case_data: Dict,
+        template_name: str = "base_award.j2"
+    ) -> Iterator[str]:
+        """
+        Render a complete award document as a stream of chunks.
+
+        The award is produced incrementally through Jinja's ``generate()``, so
+        it can be written to a response or file without building the whole
+        document in memory.
+        
+        Args:
+            sections: List of section data
+            case_data: Case-wide data
+            template_name: Base template name
+            
+        Returns:
+            Iterator over rendered chunks of the award document
+        """
+        template = self.env.get_template(template_name)
+        return template.generate(**self._full_award_context(sections, case_data))
+
+    def _full_award_context(self, sections: List[Dict], case_data: Dict) -> Dict:
+        """Build the rendering context for a full award document."""
+        return {
             "sections": sections,
             "case": case_data,
             "now": datetime.utcnow()
         }
-        return template.render(**context)
+
+    def get_template_hash(self, template_name: str) -> str:
+        """
+        Get a content hash of a template's source.
+        
+        Args:
+            template_name: Name of the template file
+            
+        Returns:
+            SHA-256 hex digest of the template source
+        """
+        source, _, _ = self.env.loader.get_source(self.env, template_name)
+        return hashlib.sha256(source.encode()).hexdigest()
+
+    def precompile_templates(self) -> List[str]:
+        """
+        Compile all available templates ahead of first use.
+
+        Compiled templates are kept in the environment cache and, when a
+        bytecode cache directory is configured, written to disk so other
+        workers can load them without re-parsing.
+
+        Returns:
+            Names of templates that failed to compile
+        """
+        return list(self._compile_errors())
+
+    def _compile_errors(self) -> Dict[str, str]:
+        """Compile every template, mapping each one that fails to its error."""
+        errors = {}
+        for template_name in self.get_template_list():
+            try:
+                self.env.get_template(template_name)
+            except Exception as e:
+                errors[template_name] = str(e)
+        return errors
 
     def validate_template(self, template_name: str) -> bool:
         """
         Validate that a template exists and is properly formatted.
+
+        Loading the template also populates the bytecode cache, so validating
+        every template in CI prebuilds the cache for deployment.
         
         Args:
             template_name: Name of template to validate
@@ -13,6 +13,15 @@ from src.services.summarization import (
 
 router = APIRouter(prefix="/api/v1/summarization", tags=["summarization"])
 
+async def get_read_session(session: AsyncSession = Depends(get_session)) -> AsyncSession:
+    """Get database session for read-only summary queries.
+
+    Reads use the primary session by default. The application including
+    this router can send them to a read replica by overriding this
+    dependency, e.g. with ``app.api.deps.get_anonymous_read_db``.
+    """
+    return session
+
 @router.post("/documents/{document_id}/summary", response_model=DocumentSummary)
 async def create_document_summary(
     document_id: str,
@@ -53,13 +62,13 @@ async def create_document_summary(
 @router.get("/documents/{document_id}/summary", response_model=DocumentSummary)
 async def get_document_summary(
     document_id: str,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_read_session)
 ):
     """Get existing summary for a document.
     
     Args:
         document_id: Document identifier
-        session: Database session
+        session: Read-only database session, on a replica when available
         
     Returns:
         Document summary if exists
@@ -136,14 +145,14 @@ async def delete_document_summary(
 async def search_summaries(
     document_type: Optional[str] = None,
     language: Optional[str] = None,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_read_session)
 ):
     """Search summaries by metadata.
     
     Args:
         document_type: Optional document type filter
         language: Optional language filter
-        session: Database session
+        session: Read-only database session, on a replica when available
         
     Returns:
         List of matching summaries
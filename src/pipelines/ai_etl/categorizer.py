@@ -1,14 +1,17 @@
 """Document categorizer for the AI ETL pipeline."""
 
 from typing import Dict, Any
-from transformers import pipeline
 
 class DocumentCategorizer:
     """Categorizes documents using LLaMA for content analysis."""
 
     def __init__(self):
-        """Initialize the document categorizer."""
-        self.llm = pipeline('text-classification', model='llama-3.1-8b')
+        """Initialize the document categorizer.
+
+        The model is loaded on first use, so building a pipeline does not
+        import transformers.
+        """
+        self.llm = None
         
         # Define standard award sections/categories
         self.categories = [
@@ -31,6 +34,11 @@ class DocumentCategorizer:
         Returns:
             Categorized document with summary and section assignments
         """
+        if self.llm is None:
+            from transformers import pipeline
+
+            self.llm = pipeline('text-classification', model='llama-3.1-8b')
+
         content = document.get('content', '')
         
         # Generate document summary
@@ -33,27 +33,15 @@ class AIETLPipeline:
             RuntimeError: If processing or categorization fails
         """
         try:
-            # Validate document
-            if not document.get('content'):
-                raise ValueError("Document must contain 'content' field")
+            self._validate(document)
 
             # Process the document content
             processed_doc = await self.processor.process(document)
             
-            # Categorize the document
-            categorized_doc = await self.categorizer.categorize(processed_doc)
-            
-            # Add metadata
-            categorized_doc['processed_at'] = datetime.utcnow()
-            categorized_doc['pipeline_version'] = '1.0.0'
-            
-            return categorized_doc
+            return await self._categorize(processed_doc)
             
         except (ValueError, RuntimeError) as e:
-            # Add error information to document
-            document['error'] = str(e)
-            document['processed_at'] = datetime.utcnow()
-            document['processing_failed'] = True
+            self._mark_failed(document, e)
             raise
         
         finally:
@@ -63,25 +51,47 @@ class AIETLPipeline:
     async def process_batch(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Process a batch of documents through the pipeline.
         
+        All valid documents are embedded together by the processor's batched
+        forward passes; each is then categorized on its own, so a failure
+        only fails that document.
+        
         Args:
             documents: List of raw documents from the database
             
         Returns:
             List of processed and categorized documents
         """
-        processed_docs = []
+        processed_docs = list(documents)  # Failed documents stay in the results as they are
         errors = []
 
-        for doc in documents:
+        def fail(index: int, error: Exception) -> None:
+            self._mark_failed(documents[index], error)
+            errors.append({
+                'document_id': documents[index].get('id'),
+                'error': str(error)
+            })
+
+        valid = []
+        for index, doc in enumerate(documents):
+            doc['processing_attempted'] = True
             try:
-                processed_doc = await self.process_document(doc)
-                processed_docs.append(processed_doc)
+                self._validate(doc)
+                valid.append(index)
+            except ValueError as e:
+                fail(index, e)
+
+        try:
+            embedded_docs = await self.processor.process_batch([documents[index] for index in valid])
+        except Exception as e:
+            for index in valid:
+                fail(index, e)
+            embedded_docs = []
+
+        for index, doc in zip(valid, embedded_docs):
+            try:
+                processed_docs[index] = await self._categorize(doc)
             except Exception as e:
-                errors.append({
-                    'document_id': doc.get('id'),
-                    'error': str(e)
-                })
-                processed_docs.append(doc)  # Include failed document in results
+                fail(index, e)
         
         # If all documents failed, raise exception
         if len(errors) == len(documents):
@@ -89,6 +99,27 @@ class AIETLPipeline:
         
         return processed_docs
 
+    def _validate(self, document: Dict[str, Any]) -> None:
+        """Reject documents without content."""
+        if not document.get('content'):
+            raise ValueError("Document must contain 'content' field")
+
+    async def _categorize(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        """Categorize a processed document and add pipeline metadata."""
+        categorized_doc = await self.categorizer.categorize(document)
+        
+        # Add metadata
+        categorized_doc['processed_at'] = datetime.utcnow()
+        categorized_doc['pipeline_version'] = '1.0.0'
+        
+        return categorized_doc
+
+    def _mark_failed(self, document: Dict[str, Any], error: Exception) -> None:
+        """Add error information to a document."""
+        document['error'] = str(error)
+        document['processed_at'] = datetime.utcnow()
+        document['processing_failed'] = True
+
     def cleanup(self) -> None:
         """Cleanup resources used by the pipeline."""
         self.processor.cleanup()
@@ -1,15 +1,36 @@
 """Document processor for the AI ETL pipeline."""
 
-from typing import Dict, Any
-from transformers import RobertaTokenizer, RobertaModel
+from typing import Dict, Any, List, Optional
+import numpy as np
+from src.services.llm import LLMService
+from src.services.llm.embedding import Embedding
 
 class DocumentProcessor:
-    """Processes raw documents using RoBERTa for text analysis."""
+    """Processes raw documents using the LLM service's embedding model."""
 
-    def __init__(self):
-        """Initialize the document processor."""
-        self.tokenizer = RobertaTokenizer.from_pretrained('roberta-base')
-        self.model = RobertaModel.from_pretrained('roberta-base')
+    def __init__(self, llm_service: Optional[LLMService] = None, batch_size: int = 32):
+        """Initialize the document processor.
+
+        The model is loaded by the LLM service on first use, so building a
+        pipeline does not import transformers.
+
+        Args:
+            llm_service: Optional LLM service instance shared with the pipeline
+            batch_size: Documents per forward pass when embedding a batch
+        """
+        self.llm = llm_service or LLMService()
+        self.batch_size = batch_size
+
+    def embed(self, contents: List[str]) -> np.ndarray:
+        """Embed several texts, ``batch_size`` texts per forward pass.
+        
+        Args:
+            contents: Texts to embed
+            
+        Returns:
+            Read-only float32 matrix of shape (len(contents), dim)
+        """
+        return self.llm.get_embeddings_batch(contents, batch_size=self.batch_size)
 
     async def process(self, document: Dict[str, Any]) -> Dict[str, Any]:
         """Process a document using RoBERTa for text analysis.
@@ -20,15 +41,23 @@ class DocumentProcessor:
         Returns:
             Processed document with embeddings and analysis
         """
-        # Extract text content
-        content = document.get('content', '')
+        return (await self.process_batch([document]))[0]
+
+    async def process_batch(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Process several documents with a single batched model call.
         
+        Args:
+            documents: Raw document data
+            
+        Returns:
+            Processed documents, each with its row of the batch as an Embedding
+        """
         # Tokenize and get embeddings
-        inputs = self.tokenizer(content, return_tensors='pt', truncation=True, max_length=512)
-        outputs = self.model(**inputs)
+        matrix = self.embed([document.get('content', '') for document in documents])
         
-        # Add processed data to document
-        document['embeddings'] = outputs.last_hidden_state.mean(dim=1).detach().numpy().tolist()
-        document['processed'] = True
+        # Add processed data to documents
+        for document, row in zip(documents, matrix):
+            document['embeddings'] = Embedding(row)
+            document['processed'] = True
         
-        return document
\ No newline at end of file
+        return documents
\ No newline at end of file
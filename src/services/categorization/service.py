@@ -2,16 +2,32 @@
 
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import spacy
-from transformers import pipeline
 from .models import Category, Classification, CategoryHierarchy
 from .constants import DEFAULT_CATEGORIES, CONFIDENCE_THRESHOLDS
 
 class CategorizationService:
-    """Service for document categorization using AI and rule-based approaches."""
+    """Service for document categorization using AI and rule-based approaches.
+
+    spaCy and transformers are imported, and their models loaded, when the
+    first document is categorized.
+    """
 
     def __init__(self):
         """Initialize the categorization service."""
+        self.nlp = None
+        self.classifier = None
+        
+        # Initialize category hierarchy
+        self.categories = self._build_category_hierarchy(DEFAULT_CATEGORIES)
+
+    def _ensure_models(self) -> None:
+        """Load the spaCy and zero-shot classification models on first use."""
+        if self.nlp is not None:
+            return
+
+        import spacy
+        from transformers import pipeline
+
         # Load spaCy model for text processing
         self.nlp = spacy.load('en_core_web_sm')
         
@@ -20,9 +36,6 @@ class CategorizationService:
             'zero-shot-classification',
             model='facebook/bart-large-mnli'
         )
-        
-        # Initialize category hierarchy
-        self.categories = self._build_category_hierarchy(DEFAULT_CATEGORIES)
 
     def _build_category_hierarchy(self, categories_dict: Dict) -> List[CategoryHierarchy]:
         """Build category hierarchy from dictionary configuration.
@@ -61,6 +74,8 @@ class CategorizationService:
         Returns:
             Classification result
         """
+        self._ensure_models()
+
         # Extract text content
         content = document.get('content', '')
         title = document.get('title', '')
@@ -0,0 +1,120 @@
+"""Compact float32 embedding representation."""
+
+import io
+from typing import Any, Iterable, List, Union
+import numpy as np
+
+# Serialized embeddings are little-endian float32, independent of the host
+EMBEDDING_DTYPE = np.dtype('<f4')
+
+def as_embedding_matrix(vectors: Union[np.ndarray, Iterable[Iterable[float]]]) -> np.ndarray:
+    """Convert vectors to a read-only, contiguous ``(n, dim)`` float32 matrix.
+
+    Args:
+        vectors: Array or nested sequence of embedding vectors
+
+    Returns:
+        Matrix with one embedding per row
+    """
+    matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+    if matrix.ndim != 2:
+        raise ValueError(f'Expected an (n, dim) matrix, got shape {matrix.shape}')
+    matrix.setflags(write=False)
+    return matrix
+
+def mean_pool(hidden_state, attention_mask):
+    """Average token embeddings over each sequence, ignoring padding.
+
+    Args:
+        hidden_state: Model output tensor of shape (n, tokens, dim)
+        attention_mask: Tokenizer mask of shape (n, tokens)
+
+    Returns:
+        Tensor of shape (n, dim)
+    """
+    mask = attention_mask.unsqueeze(-1).to(hidden_state.dtype)
+    return (hidden_state * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+
+class Embedding:
+    """A single embedding vector stored in a contiguous float32 buffer.
+
+    A 768-dimension embedding takes 3 KB here instead of 768 boxed Python
+    floats. Internal callers get the NumPy array through ``array`` or
+    ``np.asarray``. For storage, ``to_bytes`` gives the raw buffer for
+    ``bytea`` columns, ``to_bson`` a Mongo BinData value and ``to_npy`` an
+    ``.npy`` file. ``tolist`` is only for JSON API responses.
+    """
+
+    __slots__ = ('_array',)
+
+    def __init__(self, values: Union[np.ndarray, Iterable[float]]):
+        """Initialize the embedding.
+
+        Args:
+            values: 1-D array or sequence of embedding values; a ``(1, dim)``
+                array is flattened
+        """
+        array = np.ascontiguousarray(values, dtype=np.float32)
+        if array.ndim == 2 and array.shape[0] == 1:
+            array = array[0]
+        if array.ndim != 1:
+            raise ValueError(f'Expected a 1-D embedding, got shape {array.shape}')
+        # Embeddings are shared between caches and documents, so they are immutable
+        array.setflags(write=False)
+        self._array = array
+
+    @property
+    def array(self) -> np.ndarray:
+        """Read-only float32 view of the embedding."""
+        return self._array
+
+    @property
+    def dim(self) -> int:
+        return self._array.shape[0]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        if dtype is not None and np.dtype(dtype) != self._array.dtype:
+            return self._array.astype(dtype)
+        return self._array.copy() if copy else self._array
+
+    def __len__(self) -> int:
+        return self.dim
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Embedding):
+            return NotImplemented
+        return np.array_equal(self._array, other._array)
+
+    def __repr__(self) -> str:
+        return f'Embedding(dim={self.dim})'
+
+    def to_bytes(self) -> bytes:
+        """Serialize to raw little-endian float32 bytes, e.g. for a ``bytea`` column."""
+        return self._array.astype(EMBEDDING_DTYPE, copy=False).tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Embedding':
+        """Load an embedding serialized by ``to_bytes`` without copying the buffer."""
+        if len(data) % EMBEDDING_DTYPE.itemsize:
+            raise ValueError(f'Embedding buffer of {len(data)} bytes is not a whole number of float32 values')
+        return cls(np.frombuffer(data, dtype=EMBEDDING_DTYPE))
+
+    def to_bson(self):
+        """Serialize to a Mongo BinData value."""
+        from bson import Binary
+
+        return Binary(self.to_bytes())
+
+    def to_npy(self) -> bytes:
+        """Serialize to the contents of an ``.npy`` file."""
+        buffer = io.BytesIO()
+        np.save(buffer, self._array, allow_pickle=False)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_npy(cls, data: bytes) -> 'Embedding':
+        return cls(np.load(io.BytesIO(data), allow_pickle=False))
+
+    def tolist(self) -> List[float]:
+        """Convert to Python floats for JSON responses."""
+        return self._array.tolist()
@@ -1,6 +1,8 @@
 """Mock LLM service for testing."""
 
 from typing import List, Dict, Any, Optional
+import numpy as np
+from .embedding import as_embedding_matrix
 from .service import LLMService
 
 class MockLLMService(LLMService):
@@ -10,16 +12,28 @@ class MockLLMService(LLMService):
         """Initialize mock service without loading models."""
         pass
 
-    def get_embeddings(self, text: str) -> List[float]:
+    def get_embeddings(self, text: str) -> np.ndarray:
         """Return mock embeddings.
         
         Args:
             text: Input text
             
         Returns:
-            Mock embedding values
+            Mock float32 embedding of shape (768,)
         """
-        return [0.1] * 768  # Standard embedding dimension
+        return self.get_embeddings_batch([text])[0]
+
+    def get_embeddings_batch(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """Return mock embeddings for several texts.
+        
+        Args:
+            texts: Input texts
+            batch_size: Ignored
+            
+        Returns:
+            Mock float32 matrix of shape (len(texts), 768)
+        """
+        return as_embedding_matrix(np.full((len(texts), 768), 0.1))  # Standard embedding dimension
 
     async def classify_text(self, text: str, labels: List[str]) -> Dict[str, Any]:
         """Return mock classification.
@@ -1,13 +1,17 @@
 """LLM service implementation."""
 
 from typing import List, Dict, Any, Optional
-from transformers import pipeline, AutoTokenizer, AutoModel
-import torch
 from functools import lru_cache
+import numpy as np
 from .config import LLMConfig, ModelType
+from .embedding import as_embedding_matrix, mean_pool
 
 class LLMService:
-    """Service for handling LLM operations with environment-specific configurations."""
+    """Service for handling LLM operations with environment-specific configurations.
+
+    torch and transformers are imported, and models loaded, on first
+    inference, so importing or constructing the service stays cheap.
+    """
 
     def __init__(self, config: Optional[LLMConfig] = None):
         """Initialize the LLM service.
@@ -16,10 +20,20 @@ class LLMService:
             config: Optional configuration settings. If not provided, default config will be used.
         """
         self.config = config or LLMConfig()
-        self._init_models()
+        self.classifier = None
+        self.tokenizer = None
+        self.model = None
+
+    def _ensure_models(self) -> None:
+        """Load models on first use."""
+        if self.model is None:
+            self._init_models()
 
     def _init_models(self) -> None:
         """Initialize models based on environment configuration."""
+        import torch
+        from transformers import pipeline, AutoTokenizer, AutoModel
+
         # Set device configuration
         device = 0 if torch.cuda.is_available() and not self.config.is_local else -1
 
@@ -45,32 +59,58 @@ class LLMService:
         self.model.eval()
 
     @lru_cache(maxsize=1000)
-    def get_embeddings(self, text: str) -> List[float]:
+    def get_embeddings(self, text: str) -> np.ndarray:
         """Generate embeddings for input text.
         
         Args:
             text: Input text to embed
             
         Returns:
-            List of embedding values
+            Read-only float32 array of shape (dim,)
+        """
+        return self.get_embeddings_batch([text])[0]
+
+    def get_embeddings_batch(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """Generate embeddings for several texts in batched forward passes.
+        
+        Padding is excluded from the mean pooling, so each row equals
+        get_embeddings for the same text.
+        
+        Args:
+            texts: Input texts to embed
+            batch_size: Texts per forward pass
+            
+        Returns:
+            Read-only float32 matrix of shape (len(texts), dim)
         """
-        # Tokenize input
-        inputs = self.tokenizer(text,
-                              return_tensors='pt',
-                              max_length=self.config.MAX_LENGTH,
-                              truncation=True,
-                              padding=True)
+        self._ensure_models()
+        import torch
+
+        if not texts:
+            return as_embedding_matrix(np.empty((0, self.model.config.hidden_size)))
+
+        use_gpu = torch.cuda.is_available() and not self.config.is_local
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            # Tokenize input
+            inputs = self.tokenizer(texts[start:start + batch_size],
+                                  return_tensors='pt',
+                                  max_length=self.config.MAX_LENGTH,
+                                  truncation=True,
+                                  padding=True)
 
-        # Move to appropriate device if using GPU
-        if torch.cuda.is_available() and not self.config.is_local:
-            inputs = {k: v.cuda() for k, v in inputs.items()}
+            # Move to appropriate device if using GPU
+            if use_gpu:
+                inputs = {k: v.cuda() for k, v in inputs.items()}
 
-        # Generate embeddings
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            embeddings = outputs.last_hidden_state.mean(dim=1)
+            # Generate embeddings; TorchScript models return a tuple
+            with torch.no_grad():
+                outputs = self.model(**inputs)
+                embeddings = mean_pool(outputs[0], inputs['attention_mask'])
 
-        return embeddings[0].cpu().numpy().tolist()
+            batches.append(embeddings.cpu().numpy())
+
+        return as_embedding_matrix(np.concatenate(batches))
 
     async def classify_text(self, text: str, labels: List[str]) -> Dict[str, Any]:
         """Classify text into provided categories.
@@ -82,6 +122,7 @@ class LLMService:
         Returns:
             Dictionary containing classification results
         """
+        self._ensure_models()
         results = self.classifier(text, candidate_labels=labels)
         return {
             'labels': results['labels'],
@@ -98,6 +139,8 @@ class LLMService:
         Returns:
             Summarized text
         """
+        from transformers import pipeline
+
         summarizer = pipeline(
             'summarization',
             model=self.config.CLASSIFICATION_MODEL,
@@ -112,6 +155,12 @@ class LLMService:
         # Clear cache
         self.get_embeddings.cache_clear()
         
+        # Nothing is on the GPU if the models were never loaded
+        if self.model is None:
+            return
+
+        import torch
+
         # Free up GPU memory if applicable
         if torch.cuda.is_available():
             torch.cuda.empty_cache()
\ No newline at end of file
@@ -1,46 +1,57 @@
 """Utility functions for summarization service."""
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from bisect import bisect_right
 import re
 
-def extract_sections(text: str) -> List[Dict[str, str]]:
+def extract_sections(text: str, page_offsets: Optional[List[int]] = None) -> List[Dict[str, Any]]:
     """Extract sections from document text.
     
     Args:
         text: Document text
+        page_offsets: Character offset where each page starts, if known
         
     Returns:
-        List of sections with titles and content
+        List of sections with titles and content, plus the 1-based page each
+        section starts on when page_offsets is given
     """
     sections = []
     current_section = None
     current_content = []
+    current_page = None
+    offset = 0
     
     # Pattern for section headers (e.g., "1. BACKGROUND", "I. Introduction")
     section_pattern = re.compile(r'^\s*(?:[0-9]+\.|[A-Z]+\.|[IVXLC]+\.)?\s*([A-Z][A-Z\s]+)\s*$', re.MULTILINE)
     
+    def build_section() -> Dict[str, Any]:
+        section = {
+            'title': current_section,
+            'content': '\n'.join(current_content).strip()
+        }
+        if page_offsets is not None:
+            section['page'] = current_page
+        return section
+    
     lines = text.split('\n')
     for line in lines:
         match = section_pattern.match(line)
         if match:
             # Save previous section if exists
             if current_section:
-                sections.append({
-                    'title': current_section,
-                    'content': '\n'.join(current_content).strip()
-                })
+                sections.append(build_section())
             
             current_section = match.group(1).strip()
             current_content = []
+            if page_offsets is not None:
+                current_page = max(bisect_right(page_offsets, offset), 1)
         elif current_section:
             current_content.append(line)
+        offset += len(line) + 1
     
     # Add last section
     if current_section:
-        sections.append({
-            'title': current_section,
-            'content': '\n'.join(current_content).strip()
-        })
+        sections.append(build_section())
     
     return sections
 
@@ -0,0 +1,66 @@
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, Mock, patch
+from app.main import app
+from app.api import deps
+from app.models.user import User
+
+@pytest.fixture
+def mock_db():
+    db = Mock()
+    db.scalar = AsyncMock()
+    return db
+
+@pytest.fixture
+def client(mock_db):
+    def override_get_current_user():
+        return User(id=1, email="test@example.com")
+
+    async def override_get_async_db():
+        return mock_db
+
+    app.dependency_overrides[deps.get_current_user] = override_get_current_user
+    app.dependency_overrides[deps.get_async_db] = override_get_async_db
+
+    return TestClient(app)
+
+def test_list_section_versions(client, mock_db):
+    # Setup
+    mock_db.scalar.return_value = 7
+
+    # Execute
+    with patch('app.api.v1.endpoints.award_versions.user_can_access_case', AsyncMock(return_value=True)), \
+            patch('services.award_versioning.SectionVersionStore.list_versions', AsyncMock(return_value=[])):
+        response = client.get("/api/v1/award-sections/1/versions")
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json() == []
+
+@pytest.mark.parametrize("path", [
+    "/api/v1/award-sections/1/versions",
+    "/api/v1/award-sections/1/versions/2",
+    "/api/v1/award-sections/1/diff?from_version=1&to_version=2"
+])
+def test_section_of_other_case_not_found(client, mock_db, path):
+    # Setup
+    mock_db.scalar.return_value = 7
+
+    # Execute
+    with patch('app.api.v1.endpoints.award_versions.user_can_access_case', AsyncMock(return_value=False)), \
+            patch('services.award_versioning.SectionVersionStore.get_version_content') as mock_content:
+        response = client.get(path)
+
+    # Assert: the section is not revealed and its content is never loaded
+    assert response.status_code == 404
+    mock_content.assert_not_called()
+
+def test_unknown_section_not_found(client, mock_db):
+    # Setup
+    mock_db.scalar.return_value = None
+
+    # Execute
+    response = client.get("/api/v1/award-sections/99/versions")
+
+    # Assert
+    assert response.status_code == 404
@@ -1,6 +1,7 @@
+import hashlib
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from app.main import app
 from app.api import deps
 from app.models.document import Document
@@ -12,7 +13,12 @@ def mock_current_user():
 
 @pytest.fixture
 def mock_db():
-    return Mock()
+    db = Mock()
+    db.get = AsyncMock()
+    db.execute = AsyncMock(return_value=Mock())
+    db.scalar = AsyncMock()
+    db.commit = AsyncMock()
+    return db
 
 @pytest.fixture
 def mock_email_service():
@@ -23,14 +29,15 @@ def client(mock_current_user, mock_db, mock_email_service):
     def override_get_current_user():
         return mock_current_user
     
-    def override_get_db():
+    async def override_get_async_db():
         return mock_db
     
     def override_get_email_service():
         return mock_email_service
     
     app.dependency_overrides[deps.get_current_user] = override_get_current_user
-    app.dependency_overrides[deps.get_db] = override_get_db
+    app.dependency_overrides[deps.get_write_db] = override_get_async_db
+    app.dependency_overrides[deps.get_read_db] = override_get_async_db
     app.dependency_overrides[deps.get_email_service] = override_get_email_service
     
     return TestClient(app)
@@ -47,27 +54,45 @@ def test_create_document_request(client, mock_db, mock_email_service):
     assert response.status_code == 200
     assert "request_id" in response.json()
     mock_db.add.assert_called_once()
-    mock_db.commit.assert_called_once()
-    mock_email_service.send_document_request.assert_called_once()
+    mock_db.commit.assert_awaited_once()
+    mock_email_service.queue_document_request.assert_called_once()
+
+def test_create_document_requests_bulk(client, mock_db, mock_email_service):
+    # Setup
+    case_id = 1
+    request_data = {"requests": [
+        {"description": "Share purchase agreement"},
+        {"description": "Board minutes 2023"}
+    ]}
+    
+    # Execute
+    response = client.post(f"/api/v1/cases/{case_id}/document-requests/bulk", json=request_data)
+    
+    # Assert
+    assert response.status_code == 200
+    assert len(response.json()["request_ids"]) == 2
+    mock_db.execute.assert_awaited_once()
+    mock_db.commit.assert_awaited_once()
+    mock_email_service.queue_document_requests.assert_called_once()
 
 def test_get_pending_requests(client, mock_db):
     # Setup
     case_id = 1
     mock_documents = [
         Document(
+            id=1,
             case_id=case_id,
             request_id="req1",
-            requested_by=1,
-            filename="doc1.pdf"
+            requested_by=1
         ),
         Document(
+            id=2,
             case_id=case_id,
             request_id="req2",
-            requested_by=1,
-            filename="doc2.pdf"
+            requested_by=1
         )
     ]
-    mock_db.query.return_value.filter.return_value.all.return_value = mock_documents
+    mock_db.execute.return_value.all.return_value = mock_documents
     
     # Execute
     response = client.get(f"/api/v1/cases/{case_id}/document-requests")
@@ -75,9 +100,10 @@ def test_get_pending_requests(client, mock_db):
     # Assert
     assert response.status_code == 200
     data = response.json()
-    assert len(data) == 2
-    assert data[0]["request_id"] == "req1"
-    assert data[1]["request_id"] == "req2"
+    assert len(data["items"]) == 2
+    assert data["items"][0]["request_id"] == "req1"
+    assert data["items"][1]["request_id"] == "req2"
+    assert data["next_cursor"] is None
 
 def test_submit_document(client, mock_db):
     # Setup
@@ -89,11 +115,17 @@ def test_submit_document(client, mock_db):
         request_id=request_id,
         requested_by=1
     )
-    mock_db.query.return_value.filter.return_value.first.return_value = mock_document
+    processed_document = Document(
+        case_id=1,
+        filename="test.pdf",
+        storage_path="blobs/ab/cd/abcd",
+        metadata={"hash": "abcd"}
+    )
+    mock_db.scalar.return_value = mock_document
     
     # Execute
     with patch('app.services.document_processor.DocumentProcessor.process_document') as mock_process:
-        mock_process.return_value = mock_document
+        mock_process.return_value = processed_document
         response = client.post(
             f"/api/v1/document-requests/{request_id}/submit",
             files={"file": mock_file}
@@ -102,12 +134,64 @@ def test_submit_document(client, mock_db):
     # Assert
     assert response.status_code == 200
     assert response.json()["message"] == "Document submitted successfully"
+    assert response.json()["hash"] == "abcd"
+    # Unlocked lookup before the upload, locked update after it
+    assert mock_db.scalar.await_count == 2
+
+def test_submit_document_already_fulfilled(client, mock_db):
+    # Setup: a retry of the recorded file after a lost response
+    request_id = "fulfilled-request-id"
+    mock_file = ("test.pdf", b"test content", "application/pdf")
+    file_hash = hashlib.sha256(b"test content").hexdigest()
+    mock_db.scalar.return_value = Document(
+        case_id=1,
+        request_id=request_id,
+        requested_by=1,
+        storage_path=f"blobs/{file_hash[:2]}/{file_hash[2:4]}/{file_hash}",
+        metadata={"hash": file_hash}
+    )
+    
+    # Execute
+    with patch('app.services.document_processor.DocumentProcessor.process_document') as mock_process:
+        response = client.post(
+            f"/api/v1/document-requests/{request_id}/submit",
+            files={"file": mock_file}
+        )
+    
+    # Assert: the recorded result is returned and nothing is stored again
+    assert response.status_code == 200
+    assert response.json()["hash"] == file_hash
+    mock_process.assert_not_called()
+
+def test_submit_different_document_to_fulfilled_request(client, mock_db):
+    # Setup
+    request_id = "fulfilled-request-id"
+    mock_file = ("test.pdf", b"other content", "application/pdf")
+    mock_db.scalar.return_value = Document(
+        case_id=1,
+        request_id=request_id,
+        requested_by=1,
+        storage_path="blobs/ab/cd/abcd",
+        metadata={"hash": "abcd"}
+    )
+    
+    # Execute
+    with patch('app.services.document_processor.DocumentProcessor.process_document') as mock_process:
+        response = client.post(
+            f"/api/v1/document-requests/{request_id}/submit",
+            files={"file": mock_file}
+        )
+    
+    # Assert
+    assert response.status_code == 409
+    assert "abcd" in response.json()["detail"]
+    mock_process.assert_not_called()
 
 def test_submit_document_not_found(client, mock_db):
     # Setup
     request_id = "non-existent-id"
     mock_file = ("test.pdf", b"test content", "application/pdf")
-    mock_db.query.return_value.filter.return_value.first.return_value = None
+    mock_db.scalar.return_value = None
     
     # Execute
     response = client.post(
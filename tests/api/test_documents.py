@@ -0,0 +1,54 @@
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, Mock, patch
+from app.main import app
+from app.api import deps
+from app.models.document import Document
+from app.services.storage import LocalStorageBackend
+
+CONTENT = bytes(range(256)) * 4
+
+@pytest.fixture
+def client(tmp_path):
+    (tmp_path / "blobs").mkdir()
+    (tmp_path / "blobs" / "exhibit").write_bytes(CONTENT)
+    db = Mock()
+    db.get = AsyncMock(return_value=Document(
+        id=1,
+        case_id=1,
+        filename="exhibit.pdf",
+        file_type="application/pdf",
+        file_size=len(CONTENT),
+        storage_path="blobs/exhibit"
+    ))
+
+    async def override_get_async_db():
+        return db
+
+    app.dependency_overrides[deps.get_current_user] = lambda: Mock(id=1, is_superuser=True)
+    app.dependency_overrides[deps.get_async_db] = override_get_async_db
+    app.dependency_overrides[deps.get_storage] = lambda: LocalStorageBackend(str(tmp_path))
+
+    with patch('app.api.v1.endpoints.documents.user_can_access_case', AsyncMock(return_value=True)):
+        yield TestClient(app)
+
+def test_download_document(client):
+    response = client.get("/api/v1/documents/1/download")
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["accept-ranges"] == "bytes"
+
+def test_download_document_range(client):
+    response = client.get("/api/v1/documents/1/download", headers={"Range": "bytes=100-199"})
+
+    assert response.status_code == 206
+    assert response.content == CONTENT[100:200]
+    assert response.headers["content-range"] == f"bytes 100-199/{len(CONTENT)}"
+    assert response.headers["content-length"] == "100"
+
+def test_download_document_unsatisfiable_range(client):
+    response = client.get("/api/v1/documents/1/download", headers={"Range": f"bytes={len(CONTENT)}-"})
+
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
@@ -0,0 +1,35 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+from app.api import deps
+from app.api.v1.endpoints import metrics
+from app.db.metrics import session_metrics
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(metrics.router)
+    app.dependency_overrides[deps.get_current_user] = lambda: SimpleNamespace(id=1, email="test@example.com")
+    return TestClient(app)
+
+def test_get_db_session_metrics(client):
+    # Setup: one session outlives every bucket bound
+    session_metrics.reset()
+    session_metrics.session_opened()
+    session_metrics.session_closed(60.0)
+    pool = Mock()
+    pool.size.return_value = 20
+    pool.checkedout.return_value = 3
+    pool.overflow.return_value = 0
+    
+    # Execute
+    with patch.object(metrics, "async_engine", Mock(pool=pool)):
+        response = client.get("/metrics/db-sessions")
+    
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["buckets"][-1] == {"le": "+Inf", "count": 1}
+    assert response.json()["pool"]["checked_out"] == 3
+    session_metrics.reset()
@@ -0,0 +1,151 @@
+import fnmatch
+import time
+import pytest
+from datetime import datetime
+from sqlalchemy import Boolean, Column, DateTime, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+from app.core.principal_cache import PrincipalCache
+
+Base = declarative_base()
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    email = Column(String)
+    is_active = Column(Boolean)
+    hashed_password = Column(String)
+    created_at = Column(DateTime)
+
+FIELDS = ["id", "email", "is_active", "created_at"]
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis client calls the cache makes."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode()
+
+    def scan_iter(self, match):
+        return [key for key in self.data if fnmatch.fnmatch(key, match)]
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+@pytest.fixture
+def user():
+    return User(
+        id=1,
+        email="arbitrator@example.com",
+        is_active=True,
+        hashed_password="secret-hash",
+        created_at=datetime(2024, 1, 1)
+    )
+
+def test_get_returns_cached_principal(user):
+    # Setup
+    cache = PrincipalCache(fields=FIELDS, ttl=60, max_size=10, redis_url=None)
+    cache.set(1, "token-a", user)
+
+    # Execute
+    cached = cache.get(User, 1, "token-a")
+
+    # Assert
+    assert cached is not user
+    assert (cached.id, cached.email, cached.is_active) == (1, "arbitrator@example.com", True)
+    assert cached.hashed_password is None
+    assert cache.get(User, 1, "token-b") is None
+
+def test_entries_expire_and_evict(user):
+    # Setup
+    cache = PrincipalCache(fields=FIELDS, ttl=0.01, max_size=1, redis_url=None)
+    cache.set(1, "token-a", user)
+
+    # Execute
+    time.sleep(0.02)
+
+    # Assert
+    assert cache.get(User, 1, "token-a") is None
+    cache.ttl = 60
+    cache.set(1, "token-a", user)
+    cache.set(2, "token-b", User(id=2))
+    assert cache.get(User, 1, "token-a") is None
+    assert cache.get(User, 2, "token-b").id == 2
+
+def test_redis_tier_shared_between_processes(user):
+    # Setup
+    redis = FakeRedis()
+    writer = PrincipalCache(fields=FIELDS, ttl=60, max_size=10, redis_client=redis)
+    reader = PrincipalCache(fields=FIELDS, ttl=60, max_size=10, redis_client=redis)
+    writer.set(1, "token-a", user)
+
+    # Execute
+    cached = reader.get(User, 1, "token-a")
+
+    # Assert
+    assert cached.email == "arbitrator@example.com"
+    assert cached.created_at == datetime(2024, 1, 1)
+    assert b"secret-hash" not in redis.data["principal:1:token-a"]
+
+def test_invalidate_user_clears_both_tiers(user):
+    # Setup
+    redis = FakeRedis()
+    cache = PrincipalCache(fields=FIELDS, ttl=60, max_size=10, redis_client=redis)
+    cache.set(1, "token-a", user)
+    cache.set(1, "token-b", user)
+    cache.set(2, "token-c", User(id=2))
+
+    # Execute
+    cache.invalidate_user(1)
+
+    # Assert
+    assert cache.get(User, 1, "token-a") is None
+    assert cache.get(User, 1, "token-b") is None
+    assert cache.get(User, 2, "token-c") is not None
+    assert list(redis.data) == ["principal:2:token-c"]
+
+def test_invalidate_user_survives_redis_outage(user):
+    # Setup
+    class BrokenRedis(FakeRedis):
+        def scan_iter(self, match):
+            raise ConnectionError("redis is down")
+
+    cache = PrincipalCache(fields=FIELDS, ttl=60, max_size=10, redis_client=BrokenRedis())
+    cache.set(1, "token-a", user)
+
+    # Execute
+    cache.invalidate_user(1)
+
+    # Assert
+    assert cache._entries == {}
+
+def test_changes_invalidate_after_commit(user):
+    # Setup
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    cache = PrincipalCache(fields=FIELDS, ttl=60, max_size=10, redis_url=None)
+    cache.invalidate_on_change(User)
+    with Session(engine) as session:
+        session.add(user)
+        session.commit()
+        cache.set(1, "token-a", user)
+
+        # Execute
+        user.is_active = False
+        session.flush()
+        cached_before_commit = cache.get(User, 1, "token-a")
+        session.rollback()
+        cached_after_rollback = cache.get(User, 1, "token-a")
+        user.is_active = False
+        session.commit()
+
+    # Assert
+    assert cached_before_commit is not None
+    assert cached_after_rollback is not None
+    assert cache.get(User, 1, "token-a") is None
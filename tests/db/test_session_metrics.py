@@ -0,0 +1,43 @@
+import json
+from starlette.responses import JSONResponse
+from app.db.metrics import SessionLifetimeMetrics
+
+def test_snapshot_reports_lifetimes():
+    # Setup
+    metrics = SessionLifetimeMetrics(buckets=(0.01, 0.1, 1.0))
+    
+    # Execute
+    for lifetime in (0.005, 0.005, 0.05, 0.5):
+        metrics.session_opened()
+        metrics.session_closed(lifetime)
+    metrics.session_opened()
+    snapshot = metrics.snapshot()
+    
+    # Assert
+    assert snapshot["open_sessions"] == 1
+    assert snapshot["sessions"] == 4
+    assert snapshot["max_seconds"] == 0.5
+    assert snapshot["p50_seconds"] == 0.01
+    assert snapshot["p99_seconds"] == 0.5
+    assert [bucket["count"] for bucket in snapshot["buckets"]] == [2, 3, 4, 4]
+
+def test_empty_snapshot():
+    snapshot = SessionLifetimeMetrics().snapshot()
+    
+    assert snapshot["sessions"] == 0
+    assert snapshot["mean_seconds"] == 0.0
+    assert snapshot["p95_seconds"] == 0.0
+
+def test_snapshot_serializes_as_json():
+    # Setup: a lifetime beyond the last bound lands in the overflow bucket
+    metrics = SessionLifetimeMetrics(buckets=(0.01, 0.1))
+    metrics.session_opened()
+    metrics.session_closed(5.0)
+    
+    # Execute: FastAPI serializes with JSONResponse, which rejects infinity
+    response = JSONResponse(metrics.snapshot())
+    body = json.loads(response.body)
+    
+    # Assert
+    assert body["buckets"][-1] == {"le": "+Inf", "count": 1}
+    assert body["p99_seconds"] == 5.0
@@ -0,0 +1,145 @@
+import asyncio
+import time
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.db.routing import SessionRouter
+
+async def make_database(path, name):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as connection:
+        await connection.execute(text("CREATE TABLE origin (name VARCHAR(20))"))
+        await connection.execute(text("INSERT INTO origin VALUES (:name)"), {"name": name})
+    return engine
+
+async def origin(session):
+    async with session:
+        return await session.scalar(text("SELECT name FROM origin"))
+
+@pytest_asyncio.fixture
+async def engines(tmp_path):
+    primary = await make_database(tmp_path / "primary.db", "primary")
+    replica = await make_database(tmp_path / "replica.db", "replica")
+    yield primary, replica
+    await primary.dispose()
+    await replica.dispose()
+
+@pytest.fixture
+def router(engines):
+    primary, replica = engines
+    return SessionRouter(
+        async_sessionmaker(primary),
+        [async_sessionmaker(replica)],
+        read_your_writes_window=0.05,
+        replica_retry_interval=60
+    )
+
+@pytest.mark.asyncio
+async def test_reads_use_replica(router):
+    assert await origin(await router.read_session(user_id=1)) == "replica"
+    assert await origin(await router.read_session()) == "replica"
+    assert await origin(router.write_session(user_id=1)) == "primary"
+
+@pytest.mark.asyncio
+async def test_reads_follow_own_writes(router):
+    # Setup
+    session = router.write_session(user_id=1)
+
+    # Execute
+    async with session:
+        await session.execute(text("INSERT INTO origin VALUES ('written')"))
+        await session.commit()
+
+    # Assert
+    assert await origin(await router.read_session(user_id=1)) == "primary"
+    assert await origin(await router.read_session(user_id=2)) == "replica"
+    await asyncio.sleep(0.06)
+    assert await origin(await router.read_session(user_id=1)) == "replica"
+
+@pytest.mark.asyncio
+async def test_rolled_back_writes_do_not_pin_reads(router):
+    session = router.write_session(user_id=1)
+    async with session:
+        await session.execute(text("INSERT INTO origin VALUES ('written')"))
+        await session.rollback()
+        await session.commit()
+
+    assert await origin(await router.read_session(user_id=1)) == "replica"
+
+@pytest.mark.asyncio
+async def test_unreachable_replica_falls_back_to_primary(engines, tmp_path):
+    # Setup
+    primary, replica = engines
+    unreachable = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    router = SessionRouter(
+        async_sessionmaker(primary),
+        [async_sessionmaker(unreachable), async_sessionmaker(replica)],
+        replica_retry_interval=60
+    )
+
+    # Execute
+    names = [await origin(await router.read_session()) for _ in range(4)]
+
+    # Assert
+    assert names == ["replica"] * 4
+    assert list(router._unavailable_until) == [0]
+    only_unreachable = SessionRouter(async_sessionmaker(primary), [async_sessionmaker(unreachable)])
+    assert await origin(await only_unreachable.read_session()) == "primary"
+    await unreachable.dispose()
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis client calls the router makes."""
+
+    def __init__(self):
+        self.expires_at = {}
+
+    def set(self, key, value, px=None):
+        self.expires_at[key] = time.monotonic() + px / 1000
+
+    def exists(self, key):
+        return int(self.expires_at.get(key, 0) > time.monotonic())
+
+class UnreachableRedis:
+    def set(self, key, value, px=None):
+        raise ConnectionError("redis is down")
+
+    def exists(self, key):
+        raise ConnectionError("redis is down")
+
+@pytest.mark.asyncio
+async def test_recent_writes_shared_between_workers(engines):
+    # Setup
+    primary, replica = engines
+    redis = FakeRedis()
+    writer, reader = (
+        SessionRouter(
+            async_sessionmaker(primary),
+            [async_sessionmaker(replica)],
+            read_your_writes_window=0.05,
+            redis_client=redis
+        )
+        for _ in range(2)
+    )
+
+    # Execute
+    writer.record_write(1)
+
+    # Assert
+    assert await origin(await reader.read_session(user_id=1)) == "primary"
+    assert await origin(await reader.read_session(user_id=2)) == "replica"
+    await asyncio.sleep(0.06)
+    assert await origin(await reader.read_session(user_id=1)) == "replica"
+
+@pytest.mark.asyncio
+async def test_unreachable_redis_reads_from_primary(engines):
+    primary, replica = engines
+    router = SessionRouter(
+        async_sessionmaker(primary),
+        [async_sessionmaker(replica)],
+        redis_client=UnreachableRedis()
+    )
+
+    router.record_write(1)
+
+    assert await origin(await router.read_session(user_id=2)) == "primary"
@@ -1,9 +1,13 @@
 """Tests for the AI ETL pipeline."""
 
+import subprocess
+import sys
 import pytest
 from datetime import datetime
-from src.pipelines.ai_etl import AIETLPipeline
+from unittest.mock import patch
+from src.pipelines.ai_etl import AIETLPipeline, DocumentProcessor
 from src.services.llm import MockLLMService
+from src.services.llm.embedding import Embedding
 
 @pytest.fixture
 def mock_llm():
@@ -40,7 +44,7 @@ async def test_process_document(pipeline, sample_document):
     
     assert processed_doc['processed'] is True
     assert processed_doc['categorized'] is True
-    assert 'embeddings' in processed_doc
+    assert isinstance(processed_doc['embeddings'], Embedding)
     assert 'categories' in processed_doc
     assert 'summary' in processed_doc
     assert 'processed_at' in processed_doc
@@ -87,6 +91,30 @@ async def test_process_batch_with_failures(pipeline):
     assert processed_docs[1]['processing_failed'] is True
     assert processed_docs[2]['processed'] is True
 
+@pytest.mark.asyncio
+async def test_process_batch_embeds_valid_documents_together(pipeline):
+    """Test that a batch makes one processor call for all valid documents."""
+    documents = [
+        {'id': 'test1', 'content': 'Test document 1'},
+        {'id': 'test2'},  # Invalid document
+        {'id': 'test3', 'content': 'Test document 3'}
+    ]
+    
+    with patch.object(pipeline.processor, 'process_batch', wraps=pipeline.processor.process_batch) as process_batch:
+        await pipeline.process_batch(documents)
+    
+    process_batch.assert_awaited_once_with([documents[0], documents[2]])
+
+def test_processor_embeds_in_chunks(mock_llm):
+    """Test that embedding delegates to the LLM service in batch_size chunks."""
+    processor = DocumentProcessor(mock_llm, batch_size=2)
+    
+    with patch.object(mock_llm, 'get_embeddings_batch', wraps=mock_llm.get_embeddings_batch) as get_embeddings_batch:
+        matrix = processor.embed(['a', 'b', 'c'])
+    
+    assert matrix.shape == (3, 768)
+    get_embeddings_batch.assert_called_once_with(['a', 'b', 'c'], batch_size=2)
+
 @pytest.mark.asyncio
 async def test_cleanup(pipeline):
     """Test pipeline cleanup."""
@@ -94,4 +122,16 @@ async def test_cleanup(pipeline):
         await p.process_document({'id': 'test', 'content': 'Test document'})
     
     # Pipeline should be cleaned up after context manager exit
-    # No assertions needed as we're just ensuring no exceptions are raised
\ No newline at end of file
+    # No assertions needed as we're just ensuring no exceptions are raised
+
+def test_import_is_lazy():
+    """Test that importing the pipeline package defers loading ML libraries."""
+    # Run in a fresh interpreter; this process may already have them loaded
+    code = (
+        'import sys\n'
+        'import src.pipelines.ai_etl\n'
+        'print(sorted({"torch", "transformers", "spacy"} & set(sys.modules)))'
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    
+    assert result.stdout.strip() == '[]'
\ No newline at end of file
@@ -1,5 +1,7 @@
 """Tests for document categorization service."""
 
+import subprocess
+import sys
 import pytest
 from datetime import datetime
 from src.services.categorization.service import CategorizationService
@@ -64,4 +66,17 @@ async def test_error_handling(service):
     
     assert result.requires_review
     assert result.review_reason is not None
-    assert len(result.categories) == 0
\ No newline at end of file
+    assert len(result.categories) == 0
+
+def test_import_is_lazy():
+    """Test that importing and constructing the service defers loading spaCy and transformers."""
+    # Run in a fresh interpreter; this process may already have them loaded
+    code = (
+        'import sys\n'
+        'from src.services.categorization.service import CategorizationService\n'
+        'CategorizationService()\n'
+        'print(sorted({"spacy", "transformers"} & set(sys.modules)))'
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    
+    assert result.stdout.strip() == '[]'
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""Tests for the float32 embedding representation."""
+
+import numpy as np
+import pytest
+from src.services.llm.embedding import Embedding, as_embedding_matrix
+
+def test_embedding_is_contiguous_float32():
+    """Test that values are stored in a read-only float32 buffer."""
+    embedding = Embedding([0.25, -1.5, 3.0])
+
+    assert embedding.array.dtype == np.float32
+    assert embedding.array.flags['C_CONTIGUOUS']
+    assert not embedding.array.flags['WRITEABLE']
+    assert np.asarray(embedding) is embedding.array
+    assert len(embedding) == 3
+
+def test_embedding_flattens_single_row():
+    """Test that a (1, dim) model output becomes a 1-D embedding."""
+    embedding = Embedding(np.ones((1, 4), dtype=np.float64))
+
+    assert embedding.array.shape == (4,)
+    with pytest.raises(ValueError):
+        Embedding(np.ones((2, 4)))
+
+def test_bytes_round_trip():
+    """Test raw float32 serialization for bytea columns."""
+    embedding = Embedding(np.linspace(-1, 1, 768))
+
+    data = embedding.to_bytes()
+
+    assert len(data) == 768 * 4
+    assert Embedding.from_bytes(data) == embedding
+    with pytest.raises(ValueError):
+        Embedding.from_bytes(data[:-1])
+
+def test_npy_round_trip():
+    """Test serialization to .npy file contents."""
+    embedding = Embedding([0.1, 0.2, 0.3])
+
+    assert Embedding.from_npy(embedding.to_npy()) == embedding
+
+def test_bson_binary():
+    """Test serialization to Mongo BinData."""
+    bson = pytest.importorskip('bson')
+    embedding = Embedding([0.1, 0.2, 0.3])
+
+    value = embedding.to_bson()
+
+    assert isinstance(value, bson.Binary)
+    assert Embedding.from_bytes(bytes(value)) == embedding
+
+def test_embedding_matrix():
+    """Test that batch results are one read-only (n, dim) float32 matrix."""
+    matrix = as_embedding_matrix([[1, 2], [3, 4], [5, 6]])
+
+    assert matrix.shape == (3, 2)
+    assert matrix.dtype == np.float32
+    assert not matrix.flags['WRITEABLE']
+    assert Embedding(matrix[1]).tolist() == [3.0, 4.0]
+    with pytest.raises(ValueError):
+        as_embedding_matrix([1.0, 2.0])
@@ -1,5 +1,8 @@
 """Tests for LLM service."""
 
+import subprocess
+import sys
+import numpy as np
 import pytest
 from src.services.llm import LLMService, LLMConfig, ModelType
 from src.services.llm.mock import MockLLMService
@@ -28,8 +31,16 @@ def test_embeddings_mock(mock_service):
     text = "Test document"
     embeddings = mock_service.get_embeddings(text)
     
-    assert len(embeddings) == 768
-    assert all(isinstance(x, float) for x in embeddings)
+    assert embeddings.shape == (768,)
+    assert embeddings.dtype == np.float32
+
+def test_batch_embeddings_mock(mock_service):
+    """Test mock batch embedding generation."""
+    matrix = mock_service.get_embeddings_batch(["First document", "Second document"])
+    
+    assert matrix.shape == (2, 768)
+    assert matrix.dtype == np.float32
+    assert matrix.flags['C_CONTIGUOUS']
 
 @pytest.mark.asyncio
 async def test_classification_mock(mock_service):
@@ -61,8 +72,18 @@ def test_embeddings_real(real_service):
     text = "Test document"
     embeddings = real_service.get_embeddings(text)
     
-    assert len(embeddings) > 0
-    assert all(isinstance(x, float) for x in embeddings)
+    assert embeddings.ndim == 1 and len(embeddings) > 0
+    assert embeddings.dtype == np.float32
+
+@pytest.mark.integration
+def test_batch_embeddings_match_single(real_service):
+    """Test that batched embeddings ignore padding and match single-text embeddings."""
+    texts = ["Short", "A considerably longer test document that needs padding in a batch"]
+    matrix = real_service.get_embeddings_batch(texts)
+    
+    assert matrix.shape[0] == 2
+    for text, row in zip(texts, matrix):
+        np.testing.assert_allclose(row, real_service.get_embeddings(text), rtol=1e-4, atol=1e-5)
 
 @pytest.mark.integration
 @pytest.mark.asyncio
@@ -76,4 +97,17 @@ async def test_classification_real(real_service):
     assert 'labels' in result
     assert 'scores' in result
     assert len(result['labels']) == len(labels)
-    assert all(isinstance(x, float) for x in result['scores'])
\ No newline at end of file
+    assert all(isinstance(x, float) for x in result['scores'])
+
+def test_import_is_lazy():
+    """Test that importing and constructing the service defers loading torch and transformers."""
+    # Run in a fresh interpreter; this process may already have them loaded
+    code = (
+        'import sys\n'
+        'from src.services.llm import LLMService, LLMConfig\n'
+        'LLMService(LLMConfig())\n'
+        'print(sorted({"torch", "transformers"} & set(sys.modules)))'
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    
+    assert result.stdout.strip() == '[]'
\ No newline at end of file
@@ -1,7 +1,35 @@
+import asyncio
 import pytest
+import pytest_asyncio
 from datetime import datetime
-from services.award_pipeline import AwardPipeline
-from models.award import Award, AwardStatus, AwardSection
+from sqlalchemy import event, func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from services.award_pipeline import SECTION_ORDER, AwardPipeline
+from services.template_engine import TemplateEngine
+from models.award import Award, AwardStatus, AwardSection, AwardReview, Base
+from models.case import Case
+from models.document import Document
+
+@pytest_asyncio.fixture
+async def db_session(tmp_path):
+    # A database file rather than :memory:, so concurrent sessions get their own connections
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'awards.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+    await engine.dispose()
+
+@pytest.fixture
+def template_engine(tmp_path):
+    directory = tmp_path / "awards"
+    directory.mkdir()
+    for title, template in SECTION_ORDER:
+        (directory / template).write_text(
+            f"{title} for {{{{ case.number }}}}: {{{{ section }}}}"
+        )
+    return TemplateEngine(str(directory))
 
 @pytest.fixture
 def award_pipeline(db_session, template_engine):
@@ -24,6 +52,7 @@ def sample_case_data():
         }
     }
 
+@pytest.mark.asyncio
 async def test_generate_draft_award(award_pipeline, sample_case_data, mocker):
     # Mock data aggregation
     mocker.patch.object(
@@ -42,11 +71,12 @@ async def test_generate_draft_award(award_pipeline, sample_case_data, mocker):
     assert award.status == AwardStatus.DRAFT
     assert len(award.sections) > 0
 
+@pytest.mark.asyncio
 async def test_submit_for_review(award_pipeline, db_session):
     # Create test award
     award = Award(case_id=1, created_by_id=1, title="Test Award")
     db_session.add(award)
-    db_session.commit()
+    await db_session.commit()
 
     # Submit for review
     updated_award = await award_pipeline.submit_for_review(
@@ -57,11 +87,32 @@ async def test_submit_for_review(award_pipeline, db_session):
     assert updated_award.status == AwardStatus.UNDER_REVIEW
     assert len(updated_award.reviews) == 2
 
+@pytest.mark.asyncio
+async def test_submit_draft_for_review(award_pipeline, sample_case_data, mocker):
+    mocker.patch.object(
+        award_pipeline,
+        'aggregate_case_data',
+        return_value=sample_case_data
+    )
+    # The draft stays in the session's identity map, so submitting must
+    # still eager load its reviews rather than lazy load them
+    award = await award_pipeline.generate_draft_award(case_id=1, created_by_id=1)
+
+    updated_award = await award_pipeline.submit_for_review(
+        award_id=award.id,
+        reviewer_ids=[1, 2]
+    )
+
+    assert updated_award.status == AwardStatus.UNDER_REVIEW
+    assert len(updated_award.reviews) == 2
+
+@pytest.mark.asyncio
 async def test_process_review(award_pipeline, db_session):
     # Create test award and review
     award = Award(case_id=1, created_by_id=1, title="Test Award")
+    award.reviews.append(AwardReview(reviewer_id=1, status="pending"))
     db_session.add(award)
-    db_session.commit()
+    await db_session.commit()
 
     # Submit review
     updated_award = await award_pipeline.process_review(
@@ -71,5 +122,208 @@ async def test_process_review(award_pipeline, db_session):
         comments="Looks good"
     )
 
-    assert updated_award.reviews[0].status == "approved"
-    assert updated_award.reviews[0].comments == "Looks good"
\ No newline at end of file
+    review = await db_session.scalar(
+        select(AwardReview).where(AwardReview.award_id == award.id)
+    )
+    assert review.status == "approved"
+    assert review.comments == "Looks good"
+    assert updated_award.status == AwardStatus.APPROVED
+
+@pytest.mark.asyncio
+async def test_process_review_with_concurrent_reviewers(db_session, template_engine):
+    reviewer_ids = list(range(1, 26))
+    award = Award(case_id=1, created_by_id=1, title="Test Award", status=AwardStatus.UNDER_REVIEW)
+    award.reviews.extend(
+        AwardReview(reviewer_id=reviewer_id, status="pending")
+        for reviewer_id in reviewer_ids
+    )
+    db_session.add(award)
+    await db_session.commit()
+
+    # Every reviewer submits at once, each through its own session
+    session_factory = async_sessionmaker(db_session.bind, expire_on_commit=False)
+    award_queries = []
+    review_queries = []
+
+    def capture_award_query(orm_execute_state):
+        mapper = orm_execute_state.bind_mapper
+        if orm_execute_state.is_select and mapper is not None and mapper.class_ is Award:
+            award_queries.append(orm_execute_state.statement)
+        if orm_execute_state.is_select and mapper is not None and mapper.class_ is AwardReview:
+            review_queries.append(str(orm_execute_state.statement))
+
+    async def submit(reviewer_id):
+        async with session_factory() as session:
+            event.listen(session.sync_session, "do_orm_execute", capture_award_query)
+            pipeline = AwardPipeline(session, template_engine)
+            await pipeline.process_review(
+                award_id=award.id,
+                reviewer_id=reviewer_id,
+                status="rejected" if reviewer_id == reviewer_ids[-1] else "approved"
+            )
+
+    await asyncio.gather(*(submit(reviewer_id) for reviewer_id in reviewer_ids))
+
+    # Exactly one transaction saw the last pending review complete
+    await db_session.refresh(award)
+    assert award.status == AwardStatus.REVISION_REQUESTED
+
+    # SQLite ignores row locks, so check the award is loaded FOR UPDATE as PostgreSQL would see it
+    award_sql = [str(query.compile(dialect=postgresql.dialect())) for query in award_queries]
+    assert len(award_sql) == len(reviewer_ids)
+    assert all(sql.startswith("SELECT awards.") and sql.endswith("FOR UPDATE") for sql in award_sql)
+
+    # Each transaction loads its own review and decides completion from one
+    # aggregate, never from the full list of reviews
+    assert len(review_queries) == 2 * len(reviewer_ids)
+    assert sum("GROUP BY award_reviews.status" in sql for sql in review_queries) == len(reviewer_ids)
+    pending = await db_session.scalar(
+        select(func.count()).select_from(AwardReview).where(AwardReview.status == "pending")
+    )
+    assert pending == 0
+
+@pytest.mark.asyncio
+async def test_regenerate_award_only_renders_changed_sections(award_pipeline, sample_case_data, mocker):
+    mocker.patch.object(
+        award_pipeline,
+        'aggregate_case_data',
+        return_value=sample_case_data
+    )
+    award = await award_pipeline.generate_draft_award(case_id=1, created_by_id=1)
+    sections = {section.title: section for section in award.sections}
+    assert all(section.input_fingerprint for section in award.sections)
+
+    # A new procedural event only affects the procedural history section
+    updated_case_data = dict(
+        sample_case_data,
+        procedural_history={"events": [{"date": datetime.utcnow(), "description": "Hearing held"}]}
+    )
+    mocker.patch.object(
+        award_pipeline,
+        'aggregate_case_data',
+        return_value=updated_case_data
+    )
+    render = mocker.spy(award_pipeline.template_engine, 'render_sections')
+
+    award = await award_pipeline.regenerate_award(award.id)
+
+    rendered_templates = [template for template, _ in render.call_args[0][0]]
+    assert rendered_templates == ["procedural_history.j2"]
+    assert sections["Procedural History"].version == 2
+    assert sections["Introduction"].version == 1
+    assert award.version == 2
+
+@pytest.mark.asyncio
+async def test_regenerate_award_without_changes(award_pipeline, sample_case_data, mocker):
+    mocker.patch.object(
+        award_pipeline,
+        'aggregate_case_data',
+        return_value=sample_case_data
+    )
+    award = await award_pipeline.generate_draft_award(case_id=1, created_by_id=1)
+    render = mocker.spy(award_pipeline.template_engine, 'render_sections')
+
+    award = await award_pipeline.regenerate_award(award.id)
+
+    render.assert_not_called()
+    assert award.version == 1
+
+@pytest.mark.asyncio
+async def test_regenerate_award_locks_award(award_pipeline, db_session, sample_case_data, mocker):
+    mocker.patch.object(
+        award_pipeline,
+        'aggregate_case_data',
+        return_value=sample_case_data
+    )
+    award = await award_pipeline.generate_draft_award(case_id=1, created_by_id=1)
+    award_queries = []
+
+    def capture_award_query(orm_execute_state):
+        mapper = orm_execute_state.bind_mapper
+        if orm_execute_state.is_select and mapper is not None and mapper.class_ is Award:
+            award_queries.append(orm_execute_state.statement)
+
+    event.listen(db_session.sync_session, "do_orm_execute", capture_award_query)
+    await award_pipeline.regenerate_award(award.id)
+    event.remove(db_session.sync_session, "do_orm_execute", capture_award_query)
+
+    # SQLite ignores row locks, so check the award is loaded FOR UPDATE as PostgreSQL would see it
+    award_sql = str(award_queries[0].compile(dialect=postgresql.dialect()))
+    assert award_sql.startswith("SELECT awards.") and award_sql.endswith("FOR UPDATE")
+    assert not db_session.in_transaction()
+
+@pytest.mark.asyncio
+async def test_revise_section(award_pipeline, sample_case_data, mocker):
+    mocker.patch.object(
+        award_pipeline,
+        'aggregate_case_data',
+        return_value=sample_case_data
+    )
+    award = await award_pipeline.generate_draft_award(case_id=1, created_by_id=1)
+    section = award.sections[0]
+    original = section.content
+
+    revised = await award_pipeline.revise_section(section.id, "Revised introduction", revised_by_id=2)
+
+    assert revised.version == 2
+    assert revised.ai_generated is False
+    assert await award_pipeline.version_store.get_version_content(section.id, 1) == original
+
+@pytest.mark.asyncio
+async def test_revise_section_of_final_award(award_pipeline, sample_case_data, mocker):
+    mocker.patch.object(
+        award_pipeline,
+        'aggregate_case_data',
+        return_value=sample_case_data
+    )
+    award = await award_pipeline.generate_draft_award(case_id=1, created_by_id=1)
+    award.status = AwardStatus.APPROVED
+    award = await award_pipeline.finalize_award(award.id, approved_by_id=1)
+    section = award.sections[0]
+    original = section.content
+
+    with pytest.raises(ValueError, match="is final"):
+        await award_pipeline.revise_section(section.id, "Revised introduction", revised_by_id=2)
+
+    assert section.content == original
+    assert section.version == 1
+    assert [version.version for version in await award_pipeline.version_store.list_versions(section.id)] == [1]
+
+@pytest.mark.asyncio
+async def test_aggregate_case_data(award_pipeline, db_session):
+    # Setup
+    db_session.add(Case(id=1, case_number="ARB-2024-001", filed_date=datetime(2024, 1, 10)))
+    db_session.add_all([
+        Document(case_id=1, category="procedural.order", submitted_at=datetime(2024, 2, 1)),
+        Document(case_id=1, category="procedural.hearing", submitted_at=datetime(2024, 3, 1)),
+        Document(case_id=1, category="evidence.witness", submitted_at=datetime(2024, 2, 15)),
+        Document(case_id=1, category=None)
+    ])
+    await db_session.commit()
+
+    # Execute
+    case_data = await award_pipeline.aggregate_case_data(1)
+
+    # Assert
+    assert case_data["case_info"]["number"] == "ARB-2024-001"
+    assert case_data["procedural_history"] == {
+        "document_count": 2,
+        "categories": {"procedural.order": 1, "procedural.hearing": 1},
+        "first_submitted_at": datetime(2024, 2, 1),
+        "last_submitted_at": datetime(2024, 3, 1)
+    }
+    assert case_data["evidence"]["document_count"] == 1
+    assert case_data["factual_background"]["categories"] == {"uncategorized": 1}
+    assert case_data["legal_analysis"]["document_count"] == 0
+
+@pytest.mark.asyncio
+async def test_aggregate_case_data_case_not_found(award_pipeline):
+    with pytest.raises(ValueError, match="Case 99 not found"):
+        await award_pipeline.aggregate_case_data(99)
+
+def test_get_document_bucket(award_pipeline):
+    assert award_pipeline._get_document_bucket("procedural") == "procedural_history"
+    assert award_pipeline._get_document_bucket("evidence.witness") == "evidence"
+    assert award_pipeline._get_document_bucket("submissions") == "legal_analysis"
+    assert award_pipeline._get_document_bucket("administrative") == "factual_background"
+    assert award_pipeline._get_document_bucket(None) == "factual_background"
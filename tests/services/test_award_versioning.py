@@ -0,0 +1,69 @@
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+from services.award_versioning import SectionVersionStore, apply_delta, compute_delta
+
+OLD_CONTENT = (
+    "The Tribunal was constituted on 2024-01-10.\n"
+    "The Claimant filed its Statement of Claim on 2024-02-01.\n"
+    "The Respondent filed its Statement of Defence on 2024-03-01.\n"
+)
+
+@pytest.mark.parametrize("new_content", [
+    OLD_CONTENT,
+    OLD_CONTENT + "A hearing was held on 2024-05-20.\n",
+    OLD_CONTENT.replace("2024-03-01", "2024-03-04"),
+    "The Tribunal was constituted on 2024-01-10.\n",
+    "",
+    "No trailing newline"
+])
+def test_apply_delta_round_trip(new_content):
+    delta = compute_delta(OLD_CONTENT, new_content)
+
+    assert apply_delta(OLD_CONTENT, delta) == new_content
+    # Deltas survive JSON storage
+    assert apply_delta(OLD_CONTENT, json.loads(json.dumps(delta))) == new_content
+
+def test_delta_only_stores_changed_lines():
+    new_content = OLD_CONTENT + "A hearing was held on 2024-05-20.\n"
+
+    delta = compute_delta(OLD_CONTENT, new_content)
+
+    assert delta == [("=", 3), ("+", "A hearing was held on 2024-05-20.\n")]
+
+def test_apply_delta_rejects_unknown_operation():
+    with pytest.raises(ValueError, match="Unknown delta operation"):
+        apply_delta(OLD_CONTENT, [("?", 1)])
+
+@pytest.mark.parametrize("version,previous_content,previous_recorded,is_snapshot", [
+    (1, None, False, True),
+    (2, OLD_CONTENT, True, False),
+    (11, OLD_CONTENT, True, True),
+    (12, None, True, True),
+    # Edited before versioning was introduced: no record to apply a delta to
+    (5, OLD_CONTENT, False, True)
+])
+@pytest.mark.asyncio
+async def test_record_version_snapshot_policy(version, previous_content, previous_recorded, is_snapshot):
+    store = SectionVersionStore(Mock(), snapshot_interval=10)
+    store._has_version = AsyncMock(return_value=previous_recorded)
+    section = Mock(version=version, content=OLD_CONTENT + "Updated.\n")
+
+    with patch('services.award_versioning.AwardSectionVersion', side_effect=lambda **kwargs: SimpleNamespace(**kwargs)):
+        record = await store.record_version(section, previous_content)
+
+    assert record.is_snapshot is is_snapshot
+    if is_snapshot:
+        assert record.data == section.content
+    else:
+        assert apply_delta(previous_content, json.loads(record.data)) == section.content
+
+@pytest.mark.asyncio
+async def test_unflushed_section_has_no_versions():
+    db = Mock()
+    db.scalar = AsyncMock()
+    store = SectionVersionStore(db)
+
+    assert await store._has_version(Mock(id=None), 1) is False
+    db.scalar.assert_not_awaited()
@@ -0,0 +1,123 @@
+import os
+import time
+import pytest
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock
+from app.services.blob_store import BlobStore, collect_garbage
+from app.services.storage import LocalStorageBackend
+
+@pytest.fixture
+def blob_store(tmp_path):
+    return BlobStore(LocalStorageBackend(str(tmp_path)))
+
+async def stage(blob_store, content):
+    async def chunks():
+        yield content
+
+    temp_key = blob_store.new_temp_key()
+    await blob_store.backend.write_stream(temp_key, chunks())
+    return temp_key
+
+def mock_db(referenced, referenced_later=None):
+    db = Mock()
+    db.scalars = AsyncMock(return_value=referenced)
+    db.scalar = AsyncMock(return_value=referenced_later)
+    return db
+
+def test_key_for(blob_store):
+    file_hash = "abcdef1234567890" * 4
+
+    key = blob_store.key_for(file_hash)
+
+    assert key == f"blobs/ab/cd/{file_hash}"
+
+@pytest.mark.asyncio
+async def test_commit_deduplicates(blob_store, tmp_path):
+    file_hash = "ab" * 32
+
+    first_key, first_created = await blob_store.commit(await stage(blob_store, b"exhibit"), file_hash)
+    second_key, second_created = await blob_store.commit(await stage(blob_store, b"exhibit"), file_hash)
+
+    assert first_created is True
+    assert second_created is False
+    assert first_key == second_key
+    assert [blob.key async for blob in blob_store.backend.list_objects("blobs/")] == [first_key]
+    assert os.listdir(tmp_path / "tmp") == []
+
+@pytest.mark.asyncio
+async def test_collect_garbage(blob_store):
+    referenced, _ = await blob_store.commit(await stage(blob_store, b"a"), "aa" * 32)
+    unreferenced, _ = await blob_store.commit(await stage(blob_store, b"b"), "bb" * 32)
+    recent, _ = await blob_store.commit(await stage(blob_store, b"c"), "cc" * 32)
+    old = time.time() - 2 * 24 * 3600
+    for key in (referenced, unreferenced):
+        os.utime(blob_store.backend.local_path(key), (old, old))
+
+    deleted = await collect_garbage(mock_db([referenced]), blob_store, grace_period=timedelta(hours=24))
+
+    assert deleted == [unreferenced]
+    remaining = [blob async for blob in blob_store.backend.list_objects("blobs/")]
+    assert sorted(blob.key for blob in remaining) == sorted([referenced, recent])
+
+@pytest.mark.asyncio
+async def test_collect_garbage_keeps_blob_reused_after_listing(blob_store):
+    # Setup
+    key, _ = await blob_store.commit(await stage(blob_store, b"a"), "aa" * 32)
+    old = time.time() - 2 * 24 * 3600
+    os.utime(blob_store.backend.local_path(key), (old, old))
+    list_objects = blob_store.backend.list_objects
+
+    async def list_then_reuse(prefix):
+        async for stored in list_objects(prefix):
+            # An upload reuses the blob after the collector listed it
+            await blob_store.commit(await stage(blob_store, b"a"), "aa" * 32)
+            yield stored
+
+    blob_store.backend.list_objects = list_then_reuse
+
+    # Execute
+    deleted = await collect_garbage(mock_db([]), blob_store, grace_period=timedelta(hours=24))
+
+    # Assert
+    assert deleted == []
+    assert await blob_store.backend.exists(key)
+
+@pytest.mark.asyncio
+async def test_collect_garbage_keeps_blob_referenced_after_listing(blob_store):
+    key, _ = await blob_store.commit(await stage(blob_store, b"a"), "aa" * 32)
+    old = time.time() - 2 * 24 * 3600
+    os.utime(blob_store.backend.local_path(key), (old, old))
+
+    deleted = await collect_garbage(mock_db([], referenced_later=1), blob_store, grace_period=timedelta(hours=24))
+
+    assert deleted == []
+    assert await blob_store.backend.exists(key)
+
+@pytest.mark.asyncio
+async def test_collect_garbage_in_batches(blob_store, monkeypatch):
+    # Setup
+    monkeypatch.setattr("app.services.blob_store.GC_BATCH_SIZE", 2)
+    keys = []
+    for content, file_hash in ((b"a", "aa"), (b"b", "bb"), (b"c", "cc")):
+        key, _ = await blob_store.commit(await stage(blob_store, content), file_hash * 32)
+        keys.append(key)
+    old = time.time() - 2 * 24 * 3600
+    for key in keys:
+        os.utime(blob_store.backend.local_path(key), (old, old))
+    db = mock_db([])
+
+    # Execute
+    deleted = await collect_garbage(db, blob_store, grace_period=timedelta(hours=24))
+
+    # Assert
+    assert sorted(deleted) == sorted(keys)
+    assert db.scalars.await_count == 2
+
+@pytest.mark.asyncio
+async def test_collect_garbage_dry_run(blob_store):
+    key, _ = await blob_store.commit(await stage(blob_store, b"a"), "aa" * 32)
+
+    deleted = await collect_garbage(mock_db([]), blob_store, grace_period=timedelta(0), dry_run=True)
+
+    assert deleted == [key]
+    assert await blob_store.backend.exists(key)
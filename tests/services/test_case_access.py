@@ -0,0 +1,41 @@
+import pytest
+from unittest.mock import AsyncMock, Mock
+from app.services.case_access import user_can_access_case
+
+def mock_db(participation):
+    db = Mock()
+    db.scalar = AsyncMock(return_value=participation)
+    return db
+
+@pytest.mark.asyncio
+async def test_participant_can_access_case():
+    # Setup
+    db = mock_db(participation=7)
+    user = Mock(id=1, is_superuser=False)
+
+    # Execute
+    allowed = await user_can_access_case(db, user, case_id=3)
+
+    # Assert
+    assert allowed is True
+    statement = str(db.scalar.await_args.args[0])
+    assert "documents.case_id" in statement
+    assert "documents.requested_by" in statement
+    assert "documents.submitted_by" in statement
+
+@pytest.mark.asyncio
+async def test_other_user_cannot_access_case():
+    db = mock_db(participation=None)
+
+    allowed = await user_can_access_case(db, Mock(id=2, is_superuser=False), case_id=3)
+
+    assert allowed is False
+
+@pytest.mark.asyncio
+async def test_superuser_can_access_every_case():
+    db = mock_db(participation=None)
+
+    allowed = await user_can_access_case(db, Mock(id=2, is_superuser=True), case_id=3)
+
+    assert allowed is True
+    db.scalar.assert_not_awaited()
@@ -1,10 +1,19 @@
+import hashlib
+import os
+import zipfile
+import boto3
 import pytest
-from datetime import datetime
-from pathlib import Path
-from unittest.mock import Mock, patch, mock_open
+from moto import mock_aws
+from unittest.mock import Mock, patch
 from fastapi import UploadFile
-from app.services.document_processor import DocumentProcessor
+from app.services.document_processor import (
+    MIME_SNIFF_SIZE,
+    DocumentProcessor,
+    FileTooLargeError,
+    UnsupportedFileTypeError
+)
 from app.models.document import Document
+from app.services.storage import S3StorageBackend
 
 @pytest.fixture
 def document_processor():
@@ -17,16 +26,16 @@ def mock_upload_file():
     return file
 
 @pytest.mark.asyncio
-async def test_process_document(document_processor, mock_upload_file):
+async def test_process_document(tmp_path, mock_upload_file):
     # Setup
     case_id = 1
     user_id = 2
-    file_content = b"test content"
-    mock_upload_file.read.return_value = file_content
+    chunks = [b"test ", b"content"]
+    file_content = b"".join(chunks)
+    mock_upload_file.read.side_effect = chunks + [b""]
+    document_processor = DocumentProcessor(storage_path=str(tmp_path), chunk_size=5)
     
-    with patch('magic.from_buffer', return_value='application/pdf'), \
-         patch('os.makedirs'), \
-         patch('builtins.open', mock_open()):
+    with patch('magic.from_buffer', return_value='application/pdf') as mock_from_buffer:
         
         # Execute
         document = await document_processor.process_document(
@@ -42,60 +51,206 @@ async def test_process_document(document_processor, mock_upload_file):
         assert document.file_type == "application/pdf"
         assert document.file_size == len(file_content)
         assert document.metadata['original_name'] == "test_document.pdf"
-        assert 'hash' in document.metadata
+        assert document.metadata['hash'] == hashlib.sha256(file_content).hexdigest()
         assert 'upload_timestamp' in document.metadata
 
+        # MIME type is sniffed from the first chunk only
+        mock_from_buffer.assert_called_once_with(b"test ", mime=True)
+        mock_upload_file.read.assert_called_with(5)
+
+        # File is stored under its full hash with no temporary files left behind
+        assert (tmp_path / document.storage_path).read_bytes() == file_content
+        assert os.path.basename(document.storage_path) == document.metadata['hash']
+        assert os.listdir(tmp_path / "tmp") == []
+
 @pytest.mark.asyncio
-async def test_extract_metadata(document_processor):
+async def test_process_duplicate_document(tmp_path):
     # Setup
-    document = Document(
+    document_processor = DocumentProcessor(storage_path=str(tmp_path))
+    uploads = []
+    for filename in ("exhibit_a.pdf", "exhibit_a_copy.pdf"):
+        upload = Mock(spec=UploadFile)
+        upload.filename = filename
+        upload.read.side_effect = [b"same exhibit", b""]
+        uploads.append(upload)
+
+    # Execute
+    with patch('magic.from_buffer', return_value='application/pdf'):
+        first = await document_processor.process_document(uploads[0], 1, 2)
+        second = await document_processor.process_document(uploads[1], 2, 2)
+
+    # Assert: both documents share a single stored blob
+    assert first.storage_path == second.storage_path
+    assert second.filename == "exhibit_a_copy.pdf"
+    stored = [blob async for blob in document_processor.storage.list_objects("blobs/")]
+    assert [blob.key for blob in stored] == [first.storage_path]
+    assert os.listdir(tmp_path / "tmp") == []
+
+@pytest.mark.asyncio
+async def test_process_document_with_unsupported_type(tmp_path, mock_upload_file):
+    # Setup
+    mock_upload_file.read.side_effect = [b"MZ\x90\x00", b"rest of file", b""]
+    document_processor = DocumentProcessor(storage_path=str(tmp_path))
+    
+    # Execute and Assert
+    with patch('magic.from_buffer', return_value='application/x-dosexec'), \
+         pytest.raises(UnsupportedFileTypeError, match="not allowed"):
+        await document_processor.process_document(mock_upload_file, 1, 2)
+
+    # Upload is rejected after the first chunk
+    assert mock_upload_file.read.call_count == 1
+    assert os.listdir(tmp_path / "tmp") == []
+
+@pytest.mark.asyncio
+async def test_process_document_too_large(tmp_path, mock_upload_file):
+    # Setup
+    mock_upload_file.read.side_effect = [b"x" * 4, b"x" * 4, b"x" * 4, b""]
+    document_processor = DocumentProcessor(
+        storage_path=str(tmp_path),
+        chunk_size=4,
+        max_upload_size=6
+    )
+    
+    # Execute and Assert
+    with patch('magic.from_buffer', return_value='text/plain'), \
+         pytest.raises(FileTooLargeError, match="exceeds maximum limit"):
+        await document_processor.process_document(mock_upload_file, 1, 2)
+
+    # Upload is aborted as soon as the limit is crossed
+    assert mock_upload_file.read.call_count == 2
+    assert os.listdir(tmp_path / "tmp") == []
+
+@pytest.mark.asyncio
+async def test_hash_upload(tmp_path, mock_upload_file):
+    # Setup
+    mock_upload_file.read.side_effect = [b"test ", b"content", b""]
+    document_processor = DocumentProcessor(storage_path=str(tmp_path), chunk_size=7)
+    
+    # Execute
+    file_hash = await document_processor.hash_upload(mock_upload_file)
+    
+    # Assert: hashed without writing anything to storage
+    assert file_hash == hashlib.sha256(b"test content").hexdigest()
+    assert os.listdir(tmp_path) == []
+
+@pytest.mark.asyncio
+async def test_hash_upload_too_large(tmp_path, mock_upload_file):
+    # Setup
+    mock_upload_file.read.side_effect = [b"x" * 4, b"x" * 4, b"x" * 4, b""]
+    document_processor = DocumentProcessor(
+        storage_path=str(tmp_path),
+        chunk_size=4,
+        max_upload_size=6
+    )
+    
+    # Execute and Assert
+    with pytest.raises(FileTooLargeError):
+        await document_processor.hash_upload(mock_upload_file)
+    assert mock_upload_file.read.call_count == 2
+
+@pytest.fixture
+def stored_document(tmp_path):
+    (tmp_path / "blobs").mkdir()
+    (tmp_path / "blobs" / "test.pdf").write_bytes(b"%PDF-1.7" + b"x" * 20000)
+    return Document(
         case_id=1,
         filename="test.pdf",
         file_type="application/pdf",
         file_size=1024,
-        storage_path="/test/storage/1/test.pdf"
+        storage_path="blobs/test.pdf"
     )
+
+@pytest.mark.asyncio
+async def test_extract_metadata(tmp_path, stored_document):
+    # Setup
+    file_content = (tmp_path / "blobs" / "test.pdf").read_bytes()
+    document_processor = DocumentProcessor(storage_path=str(tmp_path))
     
-    file_content = b"test content"
-    mock_stat = Mock()
-    mock_stat.st_mtime = datetime.now().timestamp()
-    
-    with patch('builtins.open', mock_open(read_data=file_content)), \
-         patch('os.path.getmtime', return_value=mock_stat.st_mtime), \
-         patch('magic.from_buffer', return_value='application/pdf'):
+    with patch('magic.from_buffer', return_value='application/pdf') as mock_from_buffer:
         
         # Execute
-        metadata = await document_processor.extract_metadata(document)
+        metadata = await document_processor.extract_metadata(stored_document)
         
         # Assert
         assert metadata['file_size'] == len(file_content)
         assert metadata['mime_type'] == 'application/pdf'
-        assert 'hash' in metadata
+        assert metadata['hash'] == hashlib.sha256(file_content).hexdigest()
         assert 'last_modified' in metadata
 
-def test_generate_storage_path(document_processor):
+        # MIME type is sniffed from a small prefix only
+        mock_from_buffer.assert_called_once_with(file_content[:MIME_SNIFF_SIZE], mime=True)
+
+@pytest.mark.asyncio
+async def test_extract_metadata_reuses_stored_hash(tmp_path, stored_document):
     # Setup
-    case_id = 1
-    file_hash = "abcdef1234567890"
-    filename = "test_document.pdf"
-    
-    # Execute
-    storage_path = document_processor._generate_storage_path(
-        case_id,
-        file_hash,
-        filename
-    )
-    
+    file_content = (tmp_path / "blobs" / "test.pdf").read_bytes()
+    stored_document.metadata = {'hash': 'recorded-at-upload'}
+    document_processor = DocumentProcessor(storage_path=str(tmp_path))
+
+    with patch('magic.from_buffer', return_value='application/pdf'), \
+         patch.object(document_processor.storage, 'sha256', wraps=document_processor.storage.sha256) as mock_sha256:
+
+        # Execute
+        metadata = await document_processor.extract_metadata(stored_document)
+        verified = await document_processor.extract_metadata(stored_document, verify=True)
+
     # Assert
-    expected_path = f"/test/storage/1/{file_hash[:8]}.pdf"
-    assert storage_path == expected_path
+    assert metadata['hash'] == 'recorded-at-upload'
+    assert verified['hash'] == hashlib.sha256(file_content).hexdigest()
+    mock_sha256.assert_called_once_with("blobs/test.pdf")
 
 @pytest.mark.asyncio
-async def test_process_document_with_invalid_file(document_processor, mock_upload_file):
+async def test_extract_metadata_of_empty_s3_object():
+    # Setup
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="test-documents")
+        client.put_object(Bucket="test-documents", Key="blobs/empty.txt", Body=b"")
+        document = Document(case_id=1, file_type="text/plain", storage_path="blobs/empty.txt")
+        document_processor = DocumentProcessor(storage=S3StorageBackend("test-documents", client=client))
+
+        with patch('magic.from_buffer', return_value='application/x-empty') as mock_from_buffer:
+
+            # Execute
+            metadata = await document_processor.extract_metadata(document)
+
+    # Assert
+    assert metadata['file_size'] == 0
+    assert metadata['hash'] == hashlib.sha256(b"").hexdigest()
+    mock_from_buffer.assert_called_once_with(b"", mime=True)
+
+@pytest.mark.asyncio
+async def test_extract_metadata_counts_pages(tmp_path):
+    # Setup
+    docx_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    (tmp_path / "blobs").mkdir()
+    with zipfile.ZipFile(tmp_path / "blobs" / "claim.docx", "w") as archive:
+        archive.writestr("word/document.xml", (
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+            '<w:p><w:r><w:t>Statement of Claim</w:t></w:r></w:p>'
+            '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+            '<w:p><w:r><w:t>Relief sought</w:t></w:r></w:p>'
+            '</w:body></w:document>'
+        ))
+    document = Document(case_id=1, file_type=docx_type, storage_path="blobs/claim.docx", metadata={'hash': 'abc'})
+    document_processor = DocumentProcessor(storage_path=str(tmp_path))
+
+    with patch('magic.from_buffer', return_value=docx_type):
+
+        # Execute
+        metadata = await document_processor.extract_metadata(document)
+
+    # Assert
+    assert metadata['page_count'] == 2
+    assert (tmp_path / "text" / "abc.json").exists()
+
+@pytest.mark.asyncio
+async def test_process_document_with_invalid_file(tmp_path, mock_upload_file):
     # Setup
     case_id = 1
     user_id = 2
     mock_upload_file.read.side_effect = Exception("Failed to read file")
+    document_processor = DocumentProcessor(storage_path=str(tmp_path))
     
     # Execute and Assert
     with pytest.raises(Exception):
@@ -105,6 +260,9 @@ async def test_process_document_with_invalid_file(document_processor, mock_uploa
             user_id
         )
 
+    # Partial upload is cleaned up
+    assert os.listdir(tmp_path / "tmp") == []
+
 @pytest.mark.asyncio
 async def test_extract_metadata_with_missing_file(document_processor):
     # Setup
@@ -1,13 +1,22 @@
 import pytest
 from datetime import datetime
-from unittest.mock import Mock, patch
-from app.services.document_request import DocumentRequestService
+from unittest.mock import AsyncMock, Mock, patch
+from app.services.document_request import (
+    DocumentAlreadySubmittedError,
+    DocumentRequestNotFoundError,
+    DocumentRequestService
+)
 from app.models.document import Document
 from app.models.case import Case
 
 @pytest.fixture
 def mock_db():
-    return Mock()
+    db = Mock()
+    db.get = AsyncMock()
+    db.execute = AsyncMock(return_value=Mock())
+    db.scalar = AsyncMock()
+    db.commit = AsyncMock()
+    return db
 
 @pytest.fixture
 def mock_email_service():
@@ -17,17 +26,18 @@ def mock_email_service():
 def document_request_service(mock_db, mock_email_service):
     return DocumentRequestService(mock_db, mock_email_service)
 
-def test_create_document_request(document_request_service, mock_db, mock_email_service):
+@pytest.mark.asyncio
+async def test_create_document_request(document_request_service, mock_db, mock_email_service):
     # Setup
     case_id = 1
     requester_id = 2
     description = "Please provide contract document"
     
     mock_case = Case(id=case_id, email="case@example.com")
-    mock_db.query.return_value.filter.return_value.first.return_value = mock_case
+    mock_db.get.return_value = mock_case
     
     # Execute
-    request_id = document_request_service.create_document_request(
+    request_id = await document_request_service.create_document_request(
         case_id=case_id,
         requester_id=requester_id,
         description=description
@@ -35,15 +45,18 @@ def test_create_document_request(document_request_service, mock_db, mock_email_s
     
     # Assert
     assert request_id is not None
+    mock_db.get.assert_awaited_once_with(Case, case_id)
     mock_db.add.assert_called_once()
-    mock_db.commit.assert_called_once()
-    mock_email_service.send_document_request.assert_called_once_with(
+    mock_db.commit.assert_awaited_once()
+    mock_email_service.queue_document_request.assert_called_once_with(
+        mock_db,
         case_email="case@example.com",
         request_id=request_id,
         description=description
     )
 
-def test_process_document_submission(document_request_service, mock_db):
+@pytest.mark.asyncio
+async def test_process_document_submission(document_request_service, mock_db):
     # Setup
     request_id = "test-request-id"
     mock_existing_doc = Document(
@@ -52,38 +65,191 @@ def test_process_document_submission(document_request_service, mock_db):
         requested_by=2,
         requested_at=datetime.utcnow()
     )
-    mock_db.query.return_value.filter.return_value.first.return_value = mock_existing_doc
     
     new_document = Document(
         filename="test.pdf",
         file_type="application/pdf",
         file_size=1024,
         storage_path="/path/to/file",
-        metadata={"key": "value"}
+        metadata={"hash": "abc123"}
     )
     
     # Execute
-    document_request_service.process_document_submission(request_id, new_document)
+    recorded = await document_request_service.process_document_submission(mock_existing_doc, new_document)
     
     # Assert
+    assert recorded is True
     assert mock_existing_doc.filename == "test.pdf"
     assert mock_existing_doc.file_type == "application/pdf"
     assert mock_existing_doc.storage_path == "/path/to/file"
-    assert mock_existing_doc.metadata == {"key": "value"}
-    mock_db.commit.assert_called_once()
+    assert mock_existing_doc.metadata == {"hash": "abc123"}
+    mock_db.execute.assert_not_called()
+    mock_db.commit.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_process_document_submission_is_idempotent(document_request_service, mock_db):
+    # Setup
+    mock_existing_doc = Document(
+        case_id=1,
+        request_id="test-request-id",
+        storage_path="/path/to/file",
+        metadata={"hash": "abc123"}
+    )
+    mock_existing_doc.submitted_at = submitted_at = datetime(2024, 1, 1)
+    retry = Document(filename="retry.pdf", storage_path="/path/to/file", metadata={"hash": "abc123"})
+    
+    # Execute
+    recorded = await document_request_service.process_document_submission(mock_existing_doc, retry)
+    
+    # Assert
+    assert recorded is False
+    assert mock_existing_doc.submitted_at == submitted_at
+    assert mock_existing_doc.filename != "retry.pdf"
+    mock_db.commit.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_process_document_submission_rejects_different_content(document_request_service):
+    mock_existing_doc = Document(
+        case_id=1,
+        request_id="test-request-id",
+        storage_path="/path/to/file",
+        metadata={"hash": "abc123"}
+    )
+    
+    with pytest.raises(DocumentAlreadySubmittedError):
+        await document_request_service.process_document_submission(
+            mock_existing_doc,
+            Document(storage_path="/path/to/other", metadata={"hash": "def456"})
+        )
+
+@pytest.mark.asyncio
+async def test_get_request_without_lock(document_request_service, mock_db):
+    # Setup
+    fulfilled_request = Document(
+        case_id=1,
+        request_id="test-request-id",
+        storage_path="/path/to/file",
+        metadata={"hash": "abc123"}
+    )
+    mock_db.scalar.return_value = fulfilled_request
+    
+    # Execute
+    request = await document_request_service.get_request("test-request-id")
+    
+    # Assert
+    assert request is fulfilled_request
+    statement = mock_db.scalar.await_args.args[0]
+    assert statement._for_update_arg is None
+    mock_db.commit.assert_awaited_once()
+
+def test_check_resubmission(document_request_service):
+    request = Document(
+        case_id=1,
+        request_id="test-request-id",
+        storage_path="/path/to/file",
+        metadata={"hash": "abc123"}
+    )
+    
+    document_request_service.check_resubmission(request, "abc123")
+    with pytest.raises(DocumentAlreadySubmittedError, match="abc123"):
+        document_request_service.check_resubmission(request, "def456")
+
+@pytest.mark.asyncio
+async def test_record_submission_locks_request(document_request_service, mock_db):
+    # Setup
+    mock_existing_doc = Document(case_id=1, request_id="test-request-id")
+    mock_db.scalar.return_value = mock_existing_doc
+    document = Document(
+        filename="test.pdf",
+        storage_path="/path/to/file",
+        metadata={"hash": "abc123"}
+    )
+    
+    # Execute
+    recorded = await document_request_service.record_submission("test-request-id", document)
+    
+    # Assert
+    assert recorded is True
+    assert mock_existing_doc.storage_path == "/path/to/file"
+    statement = mock_db.scalar.await_args.args[0]
+    assert statement._for_update_arg is not None
+
+@pytest.mark.asyncio
+async def test_record_submission_request_deleted(document_request_service, mock_db):
+    mock_db.scalar.return_value = None
+    
+    with pytest.raises(DocumentRequestNotFoundError):
+        await document_request_service.record_submission("test-request-id", Document())
+    mock_db.commit.assert_awaited_once()
 
-def test_get_pending_requests(document_request_service, mock_db):
+@pytest.mark.asyncio
+async def test_get_pending_requests(document_request_service, mock_db):
     # Setup
     case_id = 1
     mock_documents = [
-        Document(case_id=case_id, request_id="req1"),
-        Document(case_id=case_id, request_id="req2")
+        Document(id=1, case_id=case_id, request_id="req1"),
+        Document(id=2, case_id=case_id, request_id="req2")
     ]
-    mock_db.query.return_value.filter.return_value.all.return_value = mock_documents
+    mock_db.execute.return_value.all.return_value = mock_documents
     
     # Execute
-    result = document_request_service.get_pending_requests(case_id)
+    result, next_cursor = await document_request_service.get_pending_requests(case_id)
     
     # Assert
     assert len(result) == 2
-    assert all(doc.case_id == case_id for doc in result)
\ No newline at end of file
+    assert next_cursor is None
+    query = mock_db.execute.call_args.args[0]
+    assert query.compile().params["param_1"] == 51
+
+@pytest.mark.asyncio
+async def test_get_pending_requests_paginates(document_request_service, mock_db):
+    # Setup
+    mock_documents = [Document(id=i, case_id=1, request_id=f"req{i}") for i in (11, 12, 13)]
+    mock_db.execute.return_value.all.return_value = mock_documents
+    
+    # Execute
+    result, next_cursor = await document_request_service.get_pending_requests(1, cursor=10, limit=2)
+    
+    # Assert
+    assert [doc.request_id for doc in result] == ["req11", "req12"]
+    assert next_cursor == 12
+
+@pytest.mark.asyncio
+async def test_create_document_requests(document_request_service, mock_db, mock_email_service):
+    # Setup
+    descriptions = ["Share purchase agreement", "Board minutes 2023", "Escrow statements"]
+    mock_db.get.return_value = Case(id=1, email="case@example.com")
+    
+    # Execute
+    request_ids = await document_request_service.create_document_requests(
+        case_id=1,
+        requester_id=2,
+        descriptions=descriptions
+    )
+    
+    # Assert
+    assert len(set(request_ids)) == 3
+    mock_db.get.assert_awaited_once()
+    mock_db.execute.assert_awaited_once()
+    rows = mock_db.execute.call_args.args[1]
+    assert [row["request_id"] for row in rows] == request_ids
+    for row in rows:
+        assert row["metadata"] == {}
+        assert row["compliance_status"] == {}
+        assert row["deepfake_detection_result"] == {}
+    mock_db.commit.assert_awaited_once()
+    mock_email_service.queue_document_requests.assert_called_once_with(
+        mock_db,
+        case_email="case@example.com",
+        requests=list(zip(request_ids, descriptions))
+    )
+
+@pytest.mark.asyncio
+async def test_create_document_requests_case_not_found(document_request_service, mock_db):
+    mock_db.get.return_value = None
+    
+    with pytest.raises(ValueError):
+        await document_request_service.create_document_requests(1, 2, ["Contract"])
+    
+    mock_db.execute.assert_not_called()
+    mock_db.commit.assert_not_called()
@@ -0,0 +1,135 @@
+import socket
+import pytest
+import pytest_asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock
+import aiosmtplib
+from aiosmtpd.controller import Controller
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.core.email import EmailService
+from app.models.email_outbox import EmailOutbox
+from app.services.email_outbox import OutboxSender, SMTPConnection
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+        self.sessions = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.sessions += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 OK"
+
+@pytest.fixture
+def smtp_server():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield handler, {
+        "host": "127.0.0.1",
+        "port": port,
+        "use_tls": False,
+        "username": "notifications@lexarb.com",
+        "password": ""
+    }
+    controller.stop()
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'outbox.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(EmailOutbox.__table__.create)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+async def queue(session_factory, count):
+    async with session_factory() as db:
+        for i in range(count):
+            db.add(EmailOutbox(
+                to_email=f"party{i}@example.com",
+                subject=f"Document Request - req{i}",
+                body="Please provide the contract."
+            ))
+        await db.commit()
+
+async def load_messages(session_factory):
+    async with session_factory() as db:
+        return (await db.scalars(select(EmailOutbox).order_by(EmailOutbox.id))).all()
+
+@pytest.mark.asyncio
+async def test_send_pending_reuses_one_connection(smtp_server, session_factory):
+    # Setup
+    handler, smtp_settings = smtp_server
+    await queue(session_factory, 5)
+    sender = OutboxSender(
+        session_factory,
+        email_service=EmailService(smtp_settings),
+        batch_size=3
+    )
+
+    # Execute
+    first = await sender.send_pending()
+    second = await sender.send_pending()
+    await sender.connection.close()
+
+    # Assert
+    assert (first, second) == (3, 2)
+    assert len(handler.messages) == 5
+    assert handler.sessions == 1
+    messages = await load_messages(session_factory)
+    assert all(message.status == EmailOutbox.SENT for message in messages)
+    assert handler.messages[0].rcpt_tos == ["party0@example.com"]
+
+@pytest.mark.asyncio
+async def test_send_pending_backs_off_then_fails(session_factory):
+    # Setup
+    await queue(session_factory, 1)
+    connection = SMTPConnection({})
+    connection.send = AsyncMock(side_effect=aiosmtplib.SMTPConnectError("refused"))
+    sender = OutboxSender(
+        session_factory,
+        connection=connection,
+        email_service=EmailService({"username": "notifications@lexarb.com"}),
+        max_attempts=2,
+        retry_backoff=60
+    )
+
+    # Execute
+    await sender.send_pending()
+    [retrying] = await load_messages(session_factory)
+    attempted_again = await sender.send_pending()
+
+    # Assert
+    assert retrying.status == EmailOutbox.PENDING
+    assert retrying.attempts == 1
+    assert retrying.next_attempt_at > datetime.utcnow()
+    assert "refused" in retrying.last_error
+    assert attempted_again == 0
+
+@pytest.mark.asyncio
+async def test_send_pending_marks_failed_after_max_attempts(session_factory):
+    # Setup
+    await queue(session_factory, 1)
+    connection = SMTPConnection({})
+    connection.send = AsyncMock(side_effect=aiosmtplib.SMTPConnectError("refused"))
+    sender = OutboxSender(
+        session_factory,
+        connection=connection,
+        email_service=EmailService({"username": "notifications@lexarb.com"}),
+        max_attempts=1
+    )
+
+    # Execute
+    await sender.send_pending()
+
+    # Assert
+    [message] = await load_messages(session_factory)
+    assert message.status == EmailOutbox.FAILED
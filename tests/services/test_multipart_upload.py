@@ -0,0 +1,88 @@
+import httpx
+import pytest
+from app.services.document_processor import FileTooLargeError
+from app.services.multipart_upload import MultipartUpload, MultipartUploadError
+
+CONTENT = bytes(range(256)) * 1000
+
+def encode(files, data=None):
+    request = httpx.Request("POST", "http://testserver/submit", files=files, data=data)
+    return request.headers["content-type"], request.read()
+
+async def body(raw, chunk_size=1000):
+    for start in range(0, len(raw), chunk_size):
+        yield raw[start:start + chunk_size]
+
+async def read_all(upload, size=4096):
+    content = b""
+    while chunk := await upload.read(size):
+        assert len(chunk) <= size
+        content += chunk
+    return content
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+async def test_read_file_field(chunk_size):
+    content_type, raw = encode(
+        {"file": ("exhibit.pdf", CONTENT, "application/pdf")},
+        {"note": "x" * 5000}
+    )
+
+    upload = await MultipartUpload.open(content_type, body(raw, chunk_size))
+
+    assert upload.filename == "exhibit.pdf"
+    assert await read_all(upload) == CONTENT
+
+@pytest.mark.asyncio
+async def test_body_is_read_only_as_needed():
+    content_type, raw = encode({"file": ("exhibit.pdf", CONTENT, "application/pdf")})
+    received = 0
+
+    async def counted_body():
+        nonlocal received
+        async for chunk in body(raw):
+            received += len(chunk)
+            yield chunk
+
+    upload = await MultipartUpload.open(content_type, counted_body())
+    await upload.read(4096)
+
+    # A consumer that stops here has not received the rest of the body
+    assert received < len(raw) // 10
+
+@pytest.mark.asyncio
+async def test_empty_file():
+    content_type, raw = encode({"file": ("empty.txt", b"", "text/plain")})
+
+    upload = await MultipartUpload.open(content_type, body(raw, 3))
+
+    assert await upload.read(4096) == b""
+
+@pytest.mark.asyncio
+async def test_missing_file_field():
+    content_type, raw = encode({"other": ("exhibit.pdf", b"x", "application/pdf")})
+
+    with pytest.raises(MultipartUploadError, match="No file"):
+        await MultipartUpload.open(content_type, body(raw))
+
+def test_not_multipart():
+    with pytest.raises(MultipartUploadError):
+        MultipartUpload("application/json", body(b"{}"))
+
+@pytest.mark.asyncio
+async def test_truncated_body():
+    content_type, raw = encode({"file": ("exhibit.pdf", CONTENT, "application/pdf")})
+
+    upload = await MultipartUpload.open(content_type, body(raw[:len(raw) // 2]))
+
+    with pytest.raises(MultipartUploadError, match="ended"):
+        await read_all(upload)
+
+@pytest.mark.asyncio
+async def test_body_too_large():
+    content_type, raw = encode({"file": ("exhibit.pdf", CONTENT, "application/pdf")})
+
+    upload = await MultipartUpload.open(content_type, body(raw), max_body_size=10000)
+
+    with pytest.raises(FileTooLargeError):
+        await read_all(upload)
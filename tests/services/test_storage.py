@@ -0,0 +1,141 @@
+import hashlib
+import boto3
+import pytest
+from moto import mock_aws
+from app.services.storage import (
+    LocalStorageBackend,
+    RangeNotSatisfiableError,
+    S3StorageBackend,
+    parse_byte_range
+)
+
+# Large enough to be uploaded to S3 in several multipart parts
+CONTENT = bytes(range(256)) * (12 * 4096)
+
+async def chunks(content, size=1024 * 1024):
+    for start in range(0, len(content), size):
+        yield content[start:start + size]
+
+async def read_all(backend, key, start=0, end=None):
+    return b"".join([chunk async for chunk in backend.read_range(key, start, end, chunk_size=64 * 1024)])
+
+@pytest.fixture
+def local_backend(tmp_path):
+    return LocalStorageBackend(str(tmp_path))
+
+@pytest.fixture
+def s3_backend():
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="test-documents")
+        yield S3StorageBackend("test-documents", client=client, part_size=5 * 1024 * 1024)
+
+@pytest.fixture(params=["local", "s3"])
+def backend(request):
+    return request.getfixturevalue(f"{request.param}_backend")
+
+@pytest.mark.asyncio
+async def test_write_and_read(backend):
+    size = await backend.write_stream("blobs/doc", chunks(CONTENT))
+
+    assert size == len(CONTENT)
+    assert await backend.exists("blobs/doc")
+    assert (await backend.stat("blobs/doc")).size == len(CONTENT)
+    assert await read_all(backend, "blobs/doc") == CONTENT
+
+@pytest.mark.asyncio
+async def test_ranged_read(backend):
+    await backend.write_stream("blobs/doc", chunks(CONTENT))
+
+    assert await read_all(backend, "blobs/doc", 1000, 5000) == CONTENT[1000:5000]
+    assert await read_all(backend, "blobs/doc", len(CONTENT) - 100) == CONTENT[-100:]
+
+@pytest.mark.asyncio
+async def test_sha256(backend):
+    await backend.write_stream("blobs/doc", chunks(CONTENT))
+    await backend.write_stream("blobs/empty", chunks(b""))
+
+    assert await backend.sha256("blobs/doc") == hashlib.sha256(CONTENT).hexdigest()
+    assert await backend.sha256("blobs/empty") == hashlib.sha256(b"").hexdigest()
+
+@pytest.mark.asyncio
+async def test_move_and_delete(backend):
+    await backend.write_stream("tmp/upload", chunks(b"exhibit"))
+
+    await backend.move("tmp/upload", "blobs/exhibit")
+
+    assert not await backend.exists("tmp/upload")
+    assert [stored.key async for stored in backend.list_objects("blobs/")] == ["blobs/exhibit"]
+
+    await backend.delete("blobs/exhibit")
+
+    assert not await backend.exists("blobs/exhibit")
+
+@pytest.mark.asyncio
+async def test_list_objects(backend):
+    keys = ["blobs/aa/aa/aaaa", "blobs/aa/bb/aabb", "blobs/cc/dd/ccdd"]
+    for key in keys + ["tmp/upload"]:
+        await backend.write_stream(key, chunks(b"exhibit"))
+
+    listed = [stored async for stored in backend.list_objects("blobs/")]
+
+    assert sorted(stored.key for stored in listed) == keys
+    assert {stored.size for stored in listed} == {len(b"exhibit")}
+
+@pytest.mark.asyncio
+async def test_failed_write_leaves_nothing_behind(backend):
+    async def failing_chunks():
+        yield CONTENT
+        raise IOError("client disconnected")
+
+    with pytest.raises(IOError):
+        await backend.write_stream("tmp/upload", failing_chunks())
+
+    assert not await backend.exists("tmp/upload")
+
+@pytest.mark.asyncio
+async def test_presigned_url(local_backend, s3_backend):
+    await s3_backend.write_stream("blobs/doc", chunks(b"exhibit"))
+
+    url = await s3_backend.presigned_url("blobs/doc", filename="exhibit.pdf")
+
+    assert "test-documents" in url
+    assert "blobs/doc" in url
+    assert await local_backend.presigned_url("blobs/doc") is None
+
+@pytest.mark.asyncio
+async def test_local_absolute_path_under_root(tmp_path, local_backend):
+    # Documents stored before storage keys hold an absolute path such as
+    # /data/documents/1/abcd1234.pdf
+    legacy_path = tmp_path / "1" / "abcd1234.pdf"
+    legacy_path.parent.mkdir()
+    legacy_path.write_bytes(b"exhibit")
+
+    assert local_backend.local_path(str(legacy_path)) == str(legacy_path)
+    assert await local_backend.exists(str(legacy_path))
+    assert await read_all(local_backend, str(legacy_path)) == b"exhibit"
+    assert await local_backend.sha256(str(legacy_path)) == hashlib.sha256(b"exhibit").hexdigest()
+
+def test_local_absolute_path_outside_root(local_backend):
+    with pytest.raises(ValueError):
+        local_backend.local_path("/etc/passwd")
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-99", (0, 100)),
+    ("bytes=100-", (100, 1000)),
+    ("bytes=-100", (900, 1000)),
+    ("bytes=900-5000", (900, 1000)),
+    ("bytes=-5000", (0, 1000)),
+    (None, None),
+    ("bytes=0-9,20-29", None),
+    ("items=0-9", None),
+    ("bytes=9-0", None),
+    ("bytes=abc", None)
+])
+def test_parse_byte_range(header, expected):
+    assert parse_byte_range(header, 1000) == expected
+
+@pytest.mark.parametrize("header, size", [("bytes=1000-", 1000), ("bytes=-0", 1000), ("bytes=-10", 0)])
+def test_parse_unsatisfiable_byte_range(header, size):
+    with pytest.raises(RangeNotSatisfiableError):
+        parse_byte_range(header, size)
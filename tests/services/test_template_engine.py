@@ -0,0 +1,100 @@
+import os
+import pytest
+from services.template_engine import TemplateEngine
+
+@pytest.fixture
+def templates_dir(tmp_path):
+    directory = tmp_path / "awards"
+    (directory / "sections").mkdir(parents=True)
+    (directory / "base_award.j2").write_text(
+        "Case Number: {{ case.number }}\n"
+        "{% for section in sections %}{{ section.title }}\n{% endfor %}"
+    )
+    (directory / "sections" / "introduction.j2").write_text(
+        "Introduction for {{ case.number }}"
+    )
+    return directory
+
+def test_bytecode_cache_is_populated(templates_dir, tmp_path):
+    cache_dir = tmp_path / "bytecode"
+
+    engine = TemplateEngine(str(templates_dir), bytecode_cache_dir=str(cache_dir))
+    assert engine.validate_template("base_award.j2")
+
+    assert len(os.listdir(cache_dir)) == 1
+
+def test_production_mode_precompiles_templates(templates_dir, tmp_path):
+    cache_dir = tmp_path / "bytecode"
+
+    engine = TemplateEngine(
+        str(templates_dir),
+        bytecode_cache_dir=str(cache_dir),
+        production=True
+    )
+
+    assert engine.env.auto_reload is False
+    assert len(os.listdir(cache_dir)) == 2
+
+def test_precompile_templates_reports_failures(templates_dir):
+    (templates_dir / "broken.j2").write_text("{% if %}")
+    engine = TemplateEngine(str(templates_dir))
+
+    assert engine.precompile_templates() == ["broken.j2"]
+
+def test_production_mode_rejects_broken_templates(templates_dir):
+    (templates_dir / "broken.j2").write_text("{% if %}")
+
+    with pytest.raises(ValueError, match="broken.j2"):
+        TemplateEngine(str(templates_dir), production=True)
+
+def test_render_with_production_engine(templates_dir):
+    engine = TemplateEngine(str(templates_dir), production=True)
+
+    content = engine.render_full_award(
+        [{"title": "Introduction"}],
+        {"number": "ARB-2024-001"}
+    )
+
+    assert "Case Number: ARB-2024-001" in content
+    assert "Introduction" in content
+
+def test_render_sections_preserves_order(templates_dir):
+    (templates_dir / "sections" / "decision.j2").write_text(
+        "Decision: {{ section.outcome }}"
+    )
+    engine = TemplateEngine(str(templates_dir))
+
+    contents = engine.render_sections(
+        [
+            ("sections/introduction.j2", {}),
+            ("sections/decision.j2", {"outcome": "Claim upheld"})
+        ],
+        {"number": "ARB-2024-001"}
+    )
+
+    assert contents == [
+        "Introduction for ARB-2024-001",
+        "Decision: Claim upheld"
+    ]
+
+def test_render_sections_reuses_thread_pool(templates_dir):
+    engine = TemplateEngine(str(templates_dir), render_workers=2)
+    sections = [("sections/introduction.j2", {})] * 3
+
+    engine.render_sections(sections, {"number": "ARB-2024-001"})
+    executor = engine._executor
+    engine.render_sections(sections, {"number": "ARB-2024-002"})
+
+    assert engine._executor is executor
+    engine.close()
+    assert engine._executor is None
+
+def test_render_full_award_stream_matches_full_render(templates_dir):
+    engine = TemplateEngine(str(templates_dir))
+    sections = [{"title": "Introduction"}, {"title": "Decision"}]
+    case_data = {"number": "ARB-2024-001"}
+
+    chunks = engine.render_full_award_stream(sections, case_data)
+
+    assert not isinstance(chunks, str)
+    assert "".join(chunks) == engine.render_full_award(sections, case_data)
@@ -0,0 +1,159 @@
+import zipfile
+import pytest
+from types import SimpleNamespace
+from app.services.storage import LocalStorageBackend
+from app.services.text_extraction import (
+    DOCX_MIME_TYPE,
+    PDF_MIME_TYPE,
+    TEXT_CACHE_PREFIX,
+    TextExtractor,
+    extract_text_from_file,
+    iter_docx_pages
+)
+
+def build_pdf(pages):
+    """Build a minimal PDF with one line of Helvetica text per page."""
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % i for i in page_ids)
+        + b"] /Count %d >>" % len(pages),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+    for page_id, text in zip(page_ids, pages):
+        stream = b"BT /F1 12 Tf 72 720 Td (" + text.encode() + b") Tj ET"
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (page_id + 1)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref_offset
+    )
+    return bytes(output)
+
+def build_docx(path, pages, rendered_breaks=False):
+    """Build a minimal DOCX with an explicit page break between pages.
+
+    With ``rendered_breaks``, each page after the first also starts with the
+    lastRenderedPageBreak Word writes after an explicit break.
+    """
+    body = []
+    for index, paragraphs in enumerate(pages):
+        if index:
+            body.append('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+        for number, paragraph in enumerate(paragraphs):
+            marker = "<w:lastRenderedPageBreak/>" if index and rendered_breaks and not number else ""
+            body.append(f"<w:p><w:r>{marker}<w:t>{paragraph}</w:t></w:r></w:p>")
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{"".join(body)}</w:body></w:document>'
+    )
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/document.xml", document)
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalStorageBackend(str(tmp_path / "storage"))
+
+async def store(storage, key, data):
+    async def chunks():
+        yield data
+
+    await storage.write_stream(key, chunks())
+
+def test_extract_pdf_builds_page_offsets(tmp_path):
+    # Setup
+    path = tmp_path / "award.pdf"
+    path.write_bytes(build_pdf(["Statement of Claim", "Final Award"]))
+
+    # Execute
+    extracted = extract_text_from_file(str(path), PDF_MIME_TYPE)
+
+    # Assert
+    assert extracted.page_count == 2
+    assert "Statement of Claim" in extracted.page_text(1)
+    assert "Final Award" in extracted.page_text(2)
+    assert extracted.page_for_offset(extracted.text.index("Final Award")) == 2
+
+def test_iter_docx_pages_splits_on_page_breaks(tmp_path):
+    # Setup
+    path = tmp_path / "submission.docx"
+    build_docx(path, [["1. BACKGROUND", "The parties agreed."], ["2. CLAIMS"]])
+
+    # Execute
+    pages = list(iter_docx_pages(str(path)))
+
+    # Assert
+    assert len(pages) == 2
+    assert "The parties agreed." in pages[0]
+    assert "2. CLAIMS" in pages[1]
+
+def test_iter_docx_pages_ignores_rendered_break_after_explicit_break(tmp_path):
+    # Setup
+    path = tmp_path / "submission.docx"
+    build_docx(path, [["Page one"], ["Page two"], ["Page three"]], rendered_breaks=True)
+
+    # Execute
+    pages = list(iter_docx_pages(str(path)))
+
+    # Assert
+    assert [page.strip() for page in pages] == ["Page one", "Page two", "Page three"]
+
+@pytest.mark.asyncio
+async def test_extract_caches_by_content_hash(storage):
+    # Setup
+    await store(storage, "blobs/award.pdf", build_pdf(["Page one", "Page two"]))
+    document = SimpleNamespace(
+        file_type=PDF_MIME_TYPE,
+        storage_path="blobs/award.pdf",
+        metadata={"hash": "abc123"}
+    )
+    extractor = TextExtractor(storage)
+
+    # Execute
+    extracted = await extractor.extract(document)
+    cached = await extractor.extract(document)
+
+    # Assert
+    assert await storage.exists(f"{TEXT_CACHE_PREFIX}abc123.json")
+    assert cached == extracted
+    assert cached.page_count == 2
+
+@pytest.mark.asyncio
+async def test_extract_large_file_uses_process_pool(storage, tmp_path):
+    # Setup
+    path = tmp_path / "submission.docx"
+    build_docx(path, [["First page"], ["Second page"]])
+    await store(storage, "blobs/submission.docx", path.read_bytes())
+    document = SimpleNamespace(
+        file_type=DOCX_MIME_TYPE,
+        storage_path="blobs/submission.docx",
+        metadata={}
+    )
+    extractor = TextExtractor(storage, process_pool_threshold=0, max_workers=1)
+
+    # Execute
+    extracted = await extractor.extract(document)
+
+    # Assert
+    assert extracted.page_count == 2
+    assert extracted.page_text(2).strip() == "Second page"
+
+@pytest.mark.asyncio
+async def test_extract_rejects_unsupported_type(storage):
+    document = SimpleNamespace(file_type="image/png", storage_path="blobs/x", metadata={})
+
+    with pytest.raises(ValueError):
+        await TextExtractor(storage).extract(document)